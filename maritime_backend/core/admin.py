@@ -115,12 +115,12 @@ class VesselAdmin(admin.ModelAdmin):
 class PortAdmin(admin.ModelAdmin):
     list_display = ('name', 'country', 'congestion_display', 'wait_time_display', 'traffic_display', 'last_updated')
     list_filter = ('country', 'last_updated')
-    search_fields = ('name', 'location', 'country')
+    search_fields = ('name', 'location', 'country', 'unlocode')
     readonly_fields = ('last_updated', 'congestion_status', 'traffic_summary')
     
     fieldsets = (
         ('Basic Information', {
-            'fields': ('name', 'location', 'country')
+            'fields': ('name', 'location', 'country', 'unlocode', 'latitude', 'longitude')
         }),
         ('Congestion Analytics', {
             'fields': ('congestion_score', 'avg_wait_time', 'arrivals_count', 'departures_count', 'congestion_status')
@@ -194,6 +194,9 @@ class VoyageAdmin(admin.ModelAdmin):
         }),
     )
     
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('vessel', 'port_from', 'port_to')
+    
     def vessel_name(self, obj):
         return obj.vessel.name
     vessel_name.short_description = 'Vessel'
@@ -240,6 +243,9 @@ class EventAdmin(admin.ModelAdmin):
         }),
     )
     
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('vessel')
+    
     def vessel_name(self, obj):
         return obj.vessel.name
     vessel_name.short_description = 'Vessel'
@@ -249,7 +255,7 @@ class EventAdmin(admin.ModelAdmin):
     notification_count.short_description = 'Notifications'
     
     def related_notifications(self, obj):
-        notifications = obj.notifications.all()[:5]
+        notifications = obj.notifications.select_related('user')[:5]
         if notifications:
             notif_list = []
             for notif in notifications:
@@ -278,6 +284,9 @@ class NotificationAdmin(admin.ModelAdmin):
         }),
     )
     
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('user', 'vessel')
+    
     def vessel_name(self, obj):
         return obj.vessel.name
     vessel_name.short_description = 'Vessel'
@@ -356,6 +365,9 @@ class VesselPositionAdmin(admin.ModelAdmin):
         }),
     )
     
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('vessel', 'voyage')
+    
     def vessel_name(self, obj):
         return obj.vessel.name
     vessel_name.short_description = 'Vessel'
@@ -370,8 +382,8 @@ class VesselPositionAdmin(admin.ModelAdmin):
     map_link.short_description = 'Map Link'
     
     def voyage_link(self, obj):
-        if obj.voyage:
-            voyage_url = reverse('admin:core_voyage_change', args=[obj.voyage.id])
+        if obj.voyage_id:
+            voyage_url = reverse('admin:core_voyage_change', args=[obj.voyage_id])
             return format_html('<a href="{}">{}</a>', voyage_url, str(obj.voyage))
         return "No voyage"
     voyage_link.short_description = 'Voyage'
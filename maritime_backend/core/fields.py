@@ -0,0 +1,71 @@
+"""
+Custom model fields for the core app.
+"""
+
+from django.core import exceptions
+from django.db import models
+from django.utils.functional import cached_property
+
+
+class SmallIntegerChoiceField(models.PositiveSmallIntegerField):
+    """
+    Stores a fixed set of string codes as small integers.
+
+    The column is a 2-byte integer, but Python code, querysets, admin and
+    serializers keep working with the string codes (``'ADMIN'``,
+    ``'STORM_ENTRY'``...). The mapping comes from an ``IntegerChoices`` enum
+    whose member names are the codes and whose values are what gets stored,
+    so existing rows keep their meaning as long as values are never reused.
+
+    Migrations get the mapping as a literal ``codes`` dict (code -> stored
+    value) instead of a reference to the enum, so later changes to the enum
+    never break migrating a fresh database.
+    """
+
+    def __init__(self, *args, enum=None, codes=None, **kwargs):
+        if enum is not None:
+            codes = {member.name: member.value for member in enum}
+            kwargs['choices'] = [(member.name, member.label) for member in enum]
+        self.codes = dict(codes or {})
+        self._codes_by_value = {value: code for code, value in self.codes.items()}
+        super().__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        kwargs['codes'] = self.codes
+        return name, path, args, kwargs
+
+    @cached_property
+    def validators(self):
+        # The integer range validators would compare against string codes.
+        return [*self.default_validators, *self._validators]
+
+    def to_python(self, value):
+        if value is None or isinstance(value, str):
+            return value
+        try:
+            return self._codes_by_value[int(value)]
+        except (KeyError, TypeError, ValueError):
+            raise exceptions.ValidationError(
+                self.error_messages['invalid_choice'],
+                code='invalid_choice',
+                params={'value': value},
+            )
+
+    def from_db_value(self, value, expression, connection):
+        if value is None:
+            return value
+        return self._codes_by_value[value]
+
+    def get_prep_value(self, value):
+        value = models.Field.get_prep_value(self, value)
+        if value is None or hasattr(value, 'resolve_expression'):
+            return value
+        if isinstance(value, str):
+            try:
+                return self.codes[value]
+            except KeyError:
+                raise ValueError(
+                    f"Field '{self.name}' got unknown choice {value!r}"
+                ) from None
+        return int(value)
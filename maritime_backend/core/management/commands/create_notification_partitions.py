@@ -0,0 +1,76 @@
+"""
+Management command to create upcoming monthly partitions of the notification table.
+"""
+
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+
+def _add_months(month_start: date, months: int) -> date:
+    month_index = month_start.month - 1 + months
+    return date(month_start.year + month_index // 12, month_index % 12 + 1, 1)
+
+
+class Command(BaseCommand):
+    help = 'Create monthly partitions of core_notification (PostgreSQL only)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--months',
+            type=int,
+            default=3,
+            help='Number of months to create, starting with the current one (default: 3)',
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            self.stdout.write(
+                self.style.WARNING('Notification partitioning is only used on PostgreSQL; nothing to do.')
+            )
+            return
+
+        months = options['months']
+        if months < 1:
+            raise CommandError('--months must be at least 1')
+
+        current_month = date.today().replace(day=1)
+        for offset in range(months):
+            start = _add_months(current_month, offset)
+            end = _add_months(start, 1)
+            partition = f"core_notification_y{start.year}m{start.month:02d}"
+            if self._create_partition(partition, start, end):
+                self.stdout.write(self.style.SUCCESS(f'Created partition {partition} [{start}, {end})'))
+            else:
+                self.stdout.write(f'Partition {partition} already exists')
+
+    @staticmethod
+    def _create_partition(partition: str, start: date, end: date) -> bool:
+        """
+        Create and attach one monthly partition.
+
+        Rows for the month that already landed in the DEFAULT partition are
+        moved into the new partition before it is attached, which PostgreSQL
+        requires.
+        """
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute('SELECT to_regclass(%s)', [partition])
+            if cursor.fetchone()[0] is not None:
+                return False
+
+            table = connection.ops.quote_name(partition)
+            cursor.execute(f'CREATE TABLE {table} (LIKE core_notification INCLUDING DEFAULTS INCLUDING CONSTRAINTS)')
+            cursor.execute(
+                f'WITH moved AS ('
+                f'  DELETE FROM core_notification_default'
+                f'  WHERE "timestamp" >= %s AND "timestamp" < %s RETURNING *'
+                f') INSERT INTO {table} SELECT * FROM moved',
+                [start, end],
+            )
+            # Partition bounds must be literals, not bound parameters
+            cursor.execute(
+                f"ALTER TABLE core_notification ATTACH PARTITION {table} "
+                f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+            )
+        return True
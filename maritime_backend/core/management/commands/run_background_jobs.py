@@ -14,7 +14,7 @@ class Command(BaseCommand):
         parser.add_argument(
             '--job',
             type=str,
-            choices=['all', 'ports', 'safety', 'vessels'],
+            choices=['all', 'ports', 'safety', 'vessels', 'ais_cache'],
             default='all',
             help='Specify which job to run (default: all)',
         )
@@ -48,6 +48,10 @@ class Command(BaseCommand):
             elif job_type == 'vessels':
                 summary = BackgroundJobService.update_vessel_positions()
                 self._display_single_job_summary('Vessel Positions Update', summary, verbose)
+                
+            elif job_type == 'ais_cache':
+                summary = BackgroundJobService.refresh_ais_positions_cache()
+                self._display_single_job_summary('AIS Positions Cache Refresh', summary, verbose)
             
         except Exception as e:
             self.stdout.write(
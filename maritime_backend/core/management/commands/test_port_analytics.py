@@ -259,6 +259,7 @@ class Command(BaseCommand):
         self.stdout.write(f'  📊 UNCTAD records fetched: {summary.get("unctad_records_fetched", 0)}')
         self.stdout.write(f'  ✅ Ports updated: {summary.get("ports_updated", 0)}')
         self.stdout.write(f'  ❓ Ports not found: {summary.get("ports_not_found", 0)}')
+        self.stdout.write(f'  🔒 Ports skipped (locked): {summary.get("ports_locked", 0)}')
         self.stdout.write(f'  🚨 Events created: {summary.get("events_created", 0)}')
         
         if summary.get('errors'):
@@ -112,7 +112,7 @@ class Command(BaseCommand):
         """Test API connection and display results."""
         self.stdout.write('Testing API connection...')
         
-        status = ais_service.validate_api_connection()
+        status = ais_service.validate_api_connection(force_refresh=True)
         
         if status['connection_status'] == 'connected':
             self.stdout.write(
@@ -0,0 +1,45 @@
+# Move timestamp stamping from Python (auto_now/auto_now_add) to the database.
+# UPDATE-time stamping is installed by core.signals.ensure_touch_triggers.
+
+from django.db import migrations, models
+import django.db.models.functions.datetime
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_fix_voyage_and_port_fields'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='vessel',
+            name='last_update',
+            field=models.DateTimeField(db_default=django.db.models.functions.datetime.Now(), editable=False, help_text='Stamped by the database on insert and update', verbose_name='Last Update'),
+        ),
+        migrations.AlterField(
+            model_name='port',
+            name='last_updated',
+            field=models.DateTimeField(db_default=django.db.models.functions.datetime.Now(), editable=False, help_text='Stamped by the database on insert and update', verbose_name='Last Updated'),
+        ),
+        migrations.AlterField(
+            model_name='voyage',
+            name='created_at',
+            field=models.DateTimeField(db_default=django.db.models.functions.datetime.Now(), editable=False, verbose_name='Created At'),
+        ),
+        migrations.AlterField(
+            model_name='voyage',
+            name='updated_at',
+            field=models.DateTimeField(db_default=django.db.models.functions.datetime.Now(), editable=False, verbose_name='Updated At'),
+        ),
+        migrations.AlterField(
+            model_name='event',
+            name='timestamp',
+            field=models.DateTimeField(db_default=django.db.models.functions.datetime.Now(), editable=False, verbose_name='Timestamp'),
+        ),
+        migrations.AlterField(
+            model_name='notification',
+            name='timestamp',
+            field=models.DateTimeField(db_default=django.db.models.functions.datetime.Now(), editable=False, verbose_name='Timestamp'),
+        ),
+    ]
@@ -0,0 +1,96 @@
+# Store status/type/role choice columns as small integers instead of varchar.
+# Existing string codes are rewritten to their integer values before the
+# column type changes. The columns used to be free-form, so values that are
+# not a known code are first replaced with the column's fallback code;
+# otherwise the integer cast (PostgreSQL) or every later read (SQLite) fails.
+
+from django.db import migrations, models
+import core.fields
+
+
+# Frozen copies of the enum values at the time of this migration; the fields
+# below take them as literals so the migration never depends on core.models.
+CHOICE_COLUMN_VALUES = {
+    ('core', 'User', 'role'): {
+        'ADMIN': 1, 'OPERATOR': 2, 'ANALYST': 3,
+    },
+    ('core', 'Voyage', 'status'): {
+        'PLANNED': 1, 'IN_PROGRESS': 2, 'COMPLETED': 3, 'CANCELLED': 4,
+    },
+    ('core', 'Event', 'event_type'): {
+        'ARRIVAL': 1, 'DEPARTURE': 2, 'ANCHORAGE': 3, 'BERTHING': 4,
+        'CARGO_OPERATION': 5, 'INCIDENT': 6, 'WEATHER_ALERT': 7,
+        'HIGH_CONGESTION': 8, 'STORM_ENTRY': 9, 'PIRACY_RISK': 10, 'OTHER': 11,
+    },
+    ('core', 'Notification', 'notification_type'): {
+        'VOYAGE_UPDATE': 1, 'EVENT_ALERT': 2, 'POSITION_UPDATE': 3,
+        'SYSTEM_ALERT': 4, 'OTHER': 5,
+    },
+    ('core', 'VesselSubscription', 'subscription_type'): {
+        'ALL_EVENTS': 1, 'SAFETY_ONLY': 2, 'POSITION_UPDATES': 3, 'CUSTOM': 4,
+    },
+}
+
+
+# Code stored in place of values that are not in CHOICE_COLUMN_VALUES.
+UNKNOWN_CHOICE_FALLBACKS = {
+    ('core', 'User', 'role'): 'OPERATOR',
+    ('core', 'Voyage', 'status'): 'PLANNED',
+    ('core', 'Event', 'event_type'): 'OTHER',
+    ('core', 'Notification', 'notification_type'): 'OTHER',
+    ('core', 'VesselSubscription', 'subscription_type'): 'ALL_EVENTS',
+}
+
+
+def encode_choice_columns(apps, schema_editor):
+    for column, values in CHOICE_COLUMN_VALUES.items():
+        app_label, model_name, field_name = column
+        model = apps.get_model(app_label, model_name)
+        model.objects.exclude(**{f'{field_name}__in': list(values)}).update(
+            **{field_name: UNKNOWN_CHOICE_FALLBACKS[column]}
+        )
+        for code, number in values.items():
+            model.objects.filter(**{field_name: code}).update(**{field_name: str(number)})
+
+
+def decode_choice_columns(apps, schema_editor):
+    for (app_label, model_name, field_name), values in CHOICE_COLUMN_VALUES.items():
+        model = apps.get_model(app_label, model_name)
+        for code, number in values.items():
+            model.objects.filter(**{field_name: str(number)}).update(**{field_name: code})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_db_side_timestamps'),
+    ]
+
+    operations = [
+        migrations.RunPython(encode_choice_columns, decode_choice_columns),
+        migrations.AlterField(
+            model_name='user',
+            name='role',
+            field=core.fields.SmallIntegerChoiceField(choices=[('ADMIN', 'Admin'), ('OPERATOR', 'Operator'), ('ANALYST', 'Analyst')], codes=CHOICE_COLUMN_VALUES[('core', 'User', 'role')], default='OPERATOR', help_text='User role in the system', verbose_name='Role'),
+        ),
+        migrations.AlterField(
+            model_name='voyage',
+            name='status',
+            field=core.fields.SmallIntegerChoiceField(choices=[('PLANNED', 'Planned'), ('IN_PROGRESS', 'In Progress'), ('COMPLETED', 'Completed'), ('CANCELLED', 'Cancelled')], codes=CHOICE_COLUMN_VALUES[('core', 'Voyage', 'status')], default='PLANNED', verbose_name='Status'),
+        ),
+        migrations.AlterField(
+            model_name='event',
+            name='event_type',
+            field=core.fields.SmallIntegerChoiceField(choices=[('ARRIVAL', 'Arrival'), ('DEPARTURE', 'Departure'), ('ANCHORAGE', 'Anchorage'), ('BERTHING', 'Berthing'), ('CARGO_OPERATION', 'Cargo Operation'), ('INCIDENT', 'Incident'), ('WEATHER_ALERT', 'Weather Alert'), ('HIGH_CONGESTION', 'High Port Congestion'), ('STORM_ENTRY', 'Storm Zone Entry'), ('PIRACY_RISK', 'Piracy Risk Zone Entry'), ('OTHER', 'Other')], codes=CHOICE_COLUMN_VALUES[('core', 'Event', 'event_type')], verbose_name='Event Type'),
+        ),
+        migrations.AlterField(
+            model_name='notification',
+            name='notification_type',
+            field=core.fields.SmallIntegerChoiceField(choices=[('VOYAGE_UPDATE', 'Voyage Update'), ('EVENT_ALERT', 'Event Alert'), ('POSITION_UPDATE', 'Position Update'), ('SYSTEM_ALERT', 'System Alert'), ('OTHER', 'Other')], codes=CHOICE_COLUMN_VALUES[('core', 'Notification', 'notification_type')], verbose_name='Notification Type'),
+        ),
+        migrations.AlterField(
+            model_name='vesselsubscription',
+            name='subscription_type',
+            field=core.fields.SmallIntegerChoiceField(choices=[('ALL_EVENTS', 'All Events'), ('SAFETY_ONLY', 'Safety Events Only'), ('POSITION_UPDATES', 'Position Updates Only'), ('CUSTOM', 'Custom Events')], codes=CHOICE_COLUMN_VALUES[('core', 'VesselSubscription', 'subscription_type')], default='ALL_EVENTS', verbose_name='Subscription Type'),
+        ),
+    ]
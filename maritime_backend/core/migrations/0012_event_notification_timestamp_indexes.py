@@ -0,0 +1,42 @@
+# Time-series indexes for the append-only Event and Notification tables.
+# BRIN indexes only exist on PostgreSQL and are created outside the migration
+# state: other backends cannot build them, and indexes in the state are
+# recreated whenever SQLite rebuilds a table.
+
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+
+
+BRIN_INDEXES = (
+    ('event', django.contrib.postgres.indexes.BrinIndex(fields=['timestamp'], name='event_timestamp_brin', pages_per_range=32)),
+    ('notification', django.contrib.postgres.indexes.BrinIndex(fields=['timestamp'], name='notification_timestamp_brin', pages_per_range=32)),
+)
+
+
+def add_brin_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for model_name, index in BRIN_INDEXES:
+        schema_editor.add_index(apps.get_model('core', model_name), index)
+
+
+def remove_brin_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for model_name, index in BRIN_INDEXES:
+        schema_editor.remove_index(apps.get_model('core', model_name), index)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0011_small_integer_choice_columns'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['vessel', '-timestamp'], name='event_vessel_ts_idx'),
+        ),
+        migrations.RunPython(add_brin_indexes, remove_brin_indexes),
+    ]
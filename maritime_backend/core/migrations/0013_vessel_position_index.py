@@ -0,0 +1,17 @@
+# Composite index for the bounding-box vessel lookups done by the event checks.
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0012_event_notification_timestamp_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='vessel',
+            index=models.Index(fields=['last_position_lat', 'last_position_lon'], name='vessel_pos_idx'),
+        ),
+    ]
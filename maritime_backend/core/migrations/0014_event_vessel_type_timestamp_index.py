@@ -0,0 +1,17 @@
+# Composite index for the per-type recent-event lookups done by the event checks.
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0013_vessel_position_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['vessel', 'event_type', '-timestamp'], name='event_vessel_type_ts_idx'),
+        ),
+    ]
@@ -0,0 +1,79 @@
+# Turns core_notification into a table range-partitioned on "timestamp" so
+# inserts only maintain the current month's indexes and old months can be
+# detached or dropped in one statement. PostgreSQL only; other backends keep
+# the plain table.
+#
+# Rows go to the DEFAULT partition until monthly partitions are created with
+# ``manage.py create_notification_partitions`` (run it from cron ahead of each
+# month). The primary key becomes (id, timestamp), as PostgreSQL requires the
+# partition key in every unique constraint; ids still come from one sequence.
+# Reversing the migration copies the rows back into a plain table.
+
+from django.db import migrations
+
+
+FOREIGN_KEYS = (
+    ('user_id', 'core_user'),
+    ('vessel_id', 'core_vessel'),
+    ('event_id', 'core_event'),
+)
+
+
+def _copy_table_sql(partitioned):
+    """Recreate core_notification from core_notification_old and move its rows."""
+    partition_clause = ' PARTITION BY RANGE ("timestamp")' if partitioned else ''
+    primary_key = '(id, "timestamp")' if partitioned else '(id)'
+    statements = [
+        'ALTER TABLE core_notification RENAME TO core_notification_old',
+        'CREATE TABLE core_notification (LIKE core_notification_old '
+        'INCLUDING DEFAULTS INCLUDING CONSTRAINTS)' + partition_clause,
+        f'ALTER TABLE core_notification ADD PRIMARY KEY {primary_key}',
+    ]
+    if partitioned:
+        statements.append('CREATE TABLE core_notification_default PARTITION OF core_notification DEFAULT')
+    statements += [
+        'INSERT INTO core_notification SELECT * FROM core_notification_old',
+        'DROP TABLE core_notification_old CASCADE',
+        # Identity columns are not supported on partitioned tables before
+        # PostgreSQL 17, so ids come from an owned sequence instead.
+        'CREATE SEQUENCE core_notification_id_seq OWNED BY core_notification.id',
+        "ALTER TABLE core_notification ALTER COLUMN id SET DEFAULT nextval('core_notification_id_seq')",
+        "SELECT setval('core_notification_id_seq', "
+        'COALESCE((SELECT MAX(id) FROM core_notification), 0) + 1, false)',
+    ]
+    for column, target in FOREIGN_KEYS:
+        statements += [
+            f'ALTER TABLE core_notification ADD CONSTRAINT core_notification_{column}_fk '
+            f'FOREIGN KEY ({column}) REFERENCES {target} (id) DEFERRABLE INITIALLY DEFERRED',
+            f'CREATE INDEX core_notification_{column}_idx ON core_notification ({column})',
+        ]
+    statements.append(
+        'CREATE INDEX notification_timestamp_brin ON core_notification '
+        'USING brin ("timestamp") WITH (pages_per_range = 32)'
+    )
+    return statements
+
+
+def partition_notifications(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for statement in _copy_table_sql(partitioned=True):
+        schema_editor.execute(statement)
+
+
+def unpartition_notifications(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for statement in _copy_table_sql(partitioned=False):
+        schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0014_event_vessel_type_timestamp_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(partition_notifications, unpartition_notifications),
+    ]
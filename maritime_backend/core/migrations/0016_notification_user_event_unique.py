@@ -0,0 +1,60 @@
+# One notification per (user, event). Existing duplicates are removed first,
+# keeping the oldest row. On PostgreSQL the constraint is only recorded in the
+# migration state: core_notification is partitioned by timestamp there, and
+# unique constraints on partitioned tables must include the partition key.
+
+from django.db import migrations, models
+from django.db.models import Count, Min
+
+
+UNIQUE_USER_EVENT = models.UniqueConstraint(fields=['user', 'event'], name='notification_user_event_uniq')
+
+
+def remove_duplicate_notifications(apps, schema_editor):
+    Notification = apps.get_model('core', 'Notification')
+    duplicates = (
+        Notification.objects.filter(event__isnull=False)
+        .values('user_id', 'event_id')
+        .annotate(keep_id=Min('id'), copies=Count('id'))
+        .filter(copies__gt=1)
+    )
+    for duplicate in duplicates:
+        Notification.objects.filter(
+            user_id=duplicate['user_id'],
+            event_id=duplicate['event_id'],
+        ).exclude(id=duplicate['keep_id']).delete()
+
+
+def add_unique_constraint(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        return
+    # Emit the constraint SQL directly: on SQLite, add_constraint() rebuilds
+    # the table from the historical model, which does not have it yet.
+    model = apps.get_model('core', 'Notification')
+    schema_editor.execute(UNIQUE_USER_EVENT.create_sql(model, schema_editor))
+
+
+def remove_unique_constraint(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        return
+    model = apps.get_model('core', 'Notification')
+    schema_editor.execute(UNIQUE_USER_EVENT.remove_sql(model, schema_editor))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0015_partition_notifications'),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_notifications, migrations.RunPython.noop),
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.RunPython(add_unique_constraint, remove_unique_constraint),
+            ],
+            state_operations=[
+                migrations.AddConstraint(model_name='notification', constraint=UNIQUE_USER_EVENT),
+            ],
+        ),
+    ]
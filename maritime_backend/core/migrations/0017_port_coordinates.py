@@ -0,0 +1,25 @@
+# Port coordinates for the approaching-vessel search run on congestion alerts.
+# Vessels are matched with a bounding box on vessel_pos_idx plus a
+# great-circle distance filter, so no additional index is needed here.
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0016_notification_user_event_unique'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='port',
+            name='latitude',
+            field=models.FloatField(blank=True, help_text='Port latitude, used to find approaching vessels', null=True, verbose_name='Latitude'),
+        ),
+        migrations.AddField(
+            model_name='port',
+            name='longitude',
+            field=models.FloatField(blank=True, help_text='Port longitude, used to find approaching vessels', null=True, verbose_name='Longitude'),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# UN/LOCODE column on ports, unique so analytics records can be matched on it
+# with a single in_bulk() lookup, plus a (name, country) index for records
+# that carry no code. Existing ports get their code on the next refresh.
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0017_port_coordinates'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='port',
+            name='unlocode',
+            field=models.CharField(blank=True, help_text='UN/LOCODE port code, e.g. NLRTM', max_length=5, null=True, unique=True, verbose_name='UN/LOCODE'),
+        ),
+        migrations.AddIndex(
+            model_name='port',
+            index=models.Index(fields=['name', 'country'], name='port_name_country_idx'),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Links events to the port they refer to, so the "recent congestion event for
+# this vessel at this port" checks become an index seek on
+# (vessel, event_type, port, timestamp) instead of a substring scan of
+# Event.location. Existing congestion events are matched to their port by
+# the "<port name>, <country>" location they were created with.
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def link_congestion_events(apps, schema_editor):
+    Event = apps.get_model('core', 'Event')
+    Port = apps.get_model('core', 'Port')
+    for port_id, name, country in Port.objects.values_list('id', 'name', 'country').iterator():
+        Event.objects.filter(
+            event_type='HIGH_CONGESTION',
+            port__isnull=True,
+            location=f"{name}, {country}",
+        ).update(port_id=port_id)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0018_port_unlocode_name_country_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='port',
+            field=models.ForeignKey(blank=True, help_text='Port the event refers to, for port congestion events', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='events', to='core.port', verbose_name='Port'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['vessel', 'event_type', 'port', '-timestamp'], name='event_vessel_type_port_ts_idx'),
+        ),
+        migrations.RunPython(link_congestion_events, migrations.RunPython.noop),
+    ]
@@ -1,17 +1,21 @@
 from django.db import models
+from django.db.models import Value
+from django.db.models.functions import Concat, Now
 
 from django.contrib.auth.models import AbstractUser
 
+from .fields import SmallIntegerChoiceField
+
 class User(AbstractUser):
-    ROLE_CHOICES = (
-        ('ADMIN', 'Admin'),
-        ('OPERATOR', 'Operator'),
-        ('ANALYST', 'Analyst'),
-    )
+    class Role(models.IntegerChoices):
+        ADMIN = 1, 'Admin'
+        OPERATOR = 2, 'Operator'
+        ANALYST = 3, 'Analyst'
 
-    role = models.CharField(
-        max_length=20,
-        choices=ROLE_CHOICES,
+    ROLE_CHOICES = tuple((member.name, member.label) for member in Role)
+
+    role = SmallIntegerChoiceField(
+        enum=Role,
         default='OPERATOR',
         verbose_name='Role',
         help_text='User role in the system'
@@ -69,14 +73,20 @@ class Vessel(models.Model):
         help_text='Heading in degrees (0-359)'
     )
     last_update = models.DateTimeField(
-        auto_now=True,
-        verbose_name='Last Update'
+        db_default=Now(),
+        editable=False,
+        verbose_name='Last Update',
+        help_text='Stamped by the database on insert and update'
     )
 
     class Meta:
         verbose_name = 'Vessel'
         verbose_name_plural = 'Vessels'
         ordering = ['name']
+        indexes = [
+            # Serves the lat/lon bounding-box filters used by the zone checks.
+            models.Index(fields=['last_position_lat', 'last_position_lon'], name='vessel_pos_idx'),
+        ]
 
     def __str__(self):
         return f"{self.name} ({self.imo_number})"
@@ -86,6 +96,26 @@ class Port(models.Model):
     name = models.CharField(max_length=255, verbose_name='Port Name')
     location = models.CharField(max_length=255, verbose_name='Location')
     country = models.CharField(max_length=100, verbose_name='Country')
+    unlocode = models.CharField(
+        max_length=5,
+        unique=True,
+        null=True,
+        blank=True,
+        verbose_name='UN/LOCODE',
+        help_text='UN/LOCODE port code, e.g. NLRTM'
+    )
+    latitude = models.FloatField(
+        null=True,
+        blank=True,
+        verbose_name='Latitude',
+        help_text='Port latitude, used to find approaching vessels'
+    )
+    longitude = models.FloatField(
+        null=True,
+        blank=True,
+        verbose_name='Longitude',
+        help_text='Port longitude, used to find approaching vessels'
+    )
     congestion_score = models.FloatField(
         verbose_name='Congestion Score',
         help_text='Port congestion score (0-10)'
@@ -105,26 +135,33 @@ class Port(models.Model):
         help_text='Number of vessel departures'
     )
     last_updated = models.DateTimeField(
-        auto_now=True,
-        verbose_name='Last Updated'
+        db_default=Now(),
+        editable=False,
+        verbose_name='Last Updated',
+        help_text='Stamped by the database on insert and update'
     )
 
     class Meta:
         verbose_name = 'Port'
         verbose_name_plural = 'Ports'
         ordering = ['name']
+        indexes = [
+            # Serves the (name, country) lookups of the UNCTAD analytics refresh.
+            models.Index(fields=['name', 'country'], name='port_name_country_idx'),
+        ]
 
     def __str__(self):
         return f"{self.name}, {self.country}"
 
 
 class Voyage(models.Model):
-    STATUS_CHOICES = (
-        ('PLANNED', 'Planned'),
-        ('IN_PROGRESS', 'In Progress'),
-        ('COMPLETED', 'Completed'),
-        ('CANCELLED', 'Cancelled'),
-    )
+    class Status(models.IntegerChoices):
+        PLANNED = 1, 'Planned'
+        IN_PROGRESS = 2, 'In Progress'
+        COMPLETED = 3, 'Completed'
+        CANCELLED = 4, 'Cancelled'
+
+    STATUS_CHOICES = tuple((member.name, member.label) for member in Status)
 
     vessel = models.ForeignKey(
         Vessel,
@@ -150,14 +187,13 @@ class Voyage(models.Model):
         blank=True,
         verbose_name='Arrival Time'
     )
-    status = models.CharField(
-        max_length=50,
-        choices=STATUS_CHOICES,
+    status = SmallIntegerChoiceField(
+        enum=Status,
         default='PLANNED',
         verbose_name='Status'
     )
-    created_at = models.DateTimeField(auto_now_add=True, verbose_name='Created At')
-    updated_at = models.DateTimeField(auto_now=True, verbose_name='Updated At')
+    created_at = models.DateTimeField(db_default=Now(), editable=False, verbose_name='Created At')
+    updated_at = models.DateTimeField(db_default=Now(), editable=False, verbose_name='Updated At')
 
     class Meta:
         verbose_name = 'Voyage'
@@ -165,23 +201,45 @@ class Voyage(models.Model):
         ordering = ['-departure_time']
 
     def __str__(self):
-        return f"{self.vessel.name} voyage: {self.port_from.name} → {self.port_to.name}"
+        # Uses FK ids only so admin/log rendering never triggers extra queries.
+        return f"Voyage #{self.pk} vessel={self.vessel_id} {self.port_from_id}->{self.port_to_id}"
+
+    @classmethod
+    def with_display(cls, queryset=None):
+        """
+        Annotate voyages with a ``display_name`` label built in SQL.
+
+        The label ("<vessel>: <from> → <to>") comes back as a single string
+        column, so callers that only need it never load the three related
+        objects.
+        """
+        if queryset is None:
+            queryset = cls.objects.all()
+        return queryset.annotate(
+            display_name=Concat(
+                'vessel__name', Value(': '),
+                'port_from__name', Value(' → '),
+                'port_to__name',
+                output_field=models.CharField(),
+            )
+        )
 
 
 class Event(models.Model):
-    EVENT_TYPE_CHOICES = (
-        ('ARRIVAL', 'Arrival'),
-        ('DEPARTURE', 'Departure'),
-        ('ANCHORAGE', 'Anchorage'),
-        ('BERTHING', 'Berthing'),
-        ('CARGO_OPERATION', 'Cargo Operation'),
-        ('INCIDENT', 'Incident'),
-        ('WEATHER_ALERT', 'Weather Alert'),
-        ('HIGH_CONGESTION', 'High Port Congestion'),
-        ('STORM_ENTRY', 'Storm Zone Entry'),
-        ('PIRACY_RISK', 'Piracy Risk Zone Entry'),
-        ('OTHER', 'Other'),
-    )
+    class EventType(models.IntegerChoices):
+        ARRIVAL = 1, 'Arrival'
+        DEPARTURE = 2, 'Departure'
+        ANCHORAGE = 3, 'Anchorage'
+        BERTHING = 4, 'Berthing'
+        CARGO_OPERATION = 5, 'Cargo Operation'
+        INCIDENT = 6, 'Incident'
+        WEATHER_ALERT = 7, 'Weather Alert'
+        HIGH_CONGESTION = 8, 'High Port Congestion'
+        STORM_ENTRY = 9, 'Storm Zone Entry'
+        PIRACY_RISK = 10, 'Piracy Risk Zone Entry'
+        OTHER = 11, 'Other'
+
+    EVENT_TYPE_CHOICES = tuple((member.name, member.label) for member in EventType)
 
     vessel = models.ForeignKey(
         Vessel,
@@ -189,14 +247,23 @@ class Event(models.Model):
         related_name='events',
         verbose_name='Vessel'
     )
-    event_type = models.CharField(
-        max_length=50,
-        choices=EVENT_TYPE_CHOICES,
+    event_type = SmallIntegerChoiceField(
+        enum=EventType,
         verbose_name='Event Type'
     )
     location = models.CharField(max_length=255, verbose_name='Location')
+    port = models.ForeignKey(
+        Port,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='events',
+        verbose_name='Port',
+        help_text='Port the event refers to, for port congestion events'
+    )
     timestamp = models.DateTimeField(
-        auto_now_add=True,
+        db_default=Now(),
+        editable=False,
         verbose_name='Timestamp'
     )
     details = models.TextField(verbose_name='Details', blank=True)
@@ -205,19 +272,34 @@ class Event(models.Model):
         verbose_name = 'Event'
         verbose_name_plural = 'Events'
         ordering = ['-timestamp']
+        indexes = [
+            models.Index(fields=['vessel', '-timestamp'], name='event_vessel_ts_idx'),
+            # "Recent events of this type for these vessels" lookups made by
+            # the event checks before creating new events.
+            models.Index(fields=['vessel', 'event_type', '-timestamp'], name='event_vessel_type_ts_idx'),
+            # The same lookup narrowed to one port, for port congestion events.
+            models.Index(
+                fields=['vessel', 'event_type', 'port', '-timestamp'],
+                name='event_vessel_type_port_ts_idx',
+            ),
+            # The BRIN index on timestamp (PostgreSQL only) is created by
+            # migration 0012 and kept out of the model state, as other
+            # backends cannot build it when a table is rebuilt.
+        ]
 
     def __str__(self):
-        return f"{self.get_event_type_display()} - {self.vessel.name} ({self.timestamp})"
+        return f"{self.get_event_type_display()} - vessel={self.vessel_id} ({self.timestamp})"
 
 
 class Notification(models.Model):
-    NOTIFICATION_TYPE_CHOICES = (
-        ('VOYAGE_UPDATE', 'Voyage Update'),
-        ('EVENT_ALERT', 'Event Alert'),
-        ('POSITION_UPDATE', 'Position Update'),
-        ('SYSTEM_ALERT', 'System Alert'),
-        ('OTHER', 'Other'),
-    )
+    class NotificationType(models.IntegerChoices):
+        VOYAGE_UPDATE = 1, 'Voyage Update'
+        EVENT_ALERT = 2, 'Event Alert'
+        POSITION_UPDATE = 3, 'Position Update'
+        SYSTEM_ALERT = 4, 'System Alert'
+        OTHER = 5, 'Other'
+
+    NOTIFICATION_TYPE_CHOICES = tuple((member.name, member.label) for member in NotificationType)
 
     user = models.ForeignKey(
         User,
@@ -240,9 +322,8 @@ class Notification(models.Model):
         verbose_name='Event'
     )
     message = models.TextField(verbose_name='Message')
-    notification_type = models.CharField(
-        max_length=50,
-        choices=NOTIFICATION_TYPE_CHOICES,
+    notification_type = SmallIntegerChoiceField(
+        enum=NotificationType,
         verbose_name='Notification Type'
     )
     is_read = models.BooleanField(
@@ -250,7 +331,8 @@ class Notification(models.Model):
         verbose_name='Is Read'
     )
     timestamp = models.DateTimeField(
-        auto_now_add=True,
+        db_default=Now(),
+        editable=False,
         verbose_name='Timestamp'
     )
 
@@ -258,21 +340,30 @@ class Notification(models.Model):
         verbose_name = 'Notification'
         verbose_name_plural = 'Notifications'
         ordering = ['-timestamp']
+        # notification_timestamp_brin (PostgreSQL only) is created by
+        # migrations 0012 and 0015 outside the model state.
+        constraints = [
+            # Not created on PostgreSQL, where the table is partitioned by
+            # timestamp and unique constraints must include the partition key;
+            # NotificationService.insert_notifications checks pairs there.
+            models.UniqueConstraint(fields=['user', 'event'], name='notification_user_event_uniq'),
+        ]
 
     def __str__(self):
-        return f"{self.user.username} - {self.get_notification_type_display()}"
+        return f"user={self.user_id} - {self.get_notification_type_display()}"
 
 
 class VesselSubscription(models.Model):
     """
     Model to track user subscriptions to specific vessels for notifications.
     """
-    SUBSCRIPTION_TYPE_CHOICES = (
-        ('ALL_EVENTS', 'All Events'),
-        ('SAFETY_ONLY', 'Safety Events Only'),
-        ('POSITION_UPDATES', 'Position Updates Only'),
-        ('CUSTOM', 'Custom Events'),
-    )
+    class SubscriptionType(models.IntegerChoices):
+        ALL_EVENTS = 1, 'All Events'
+        SAFETY_ONLY = 2, 'Safety Events Only'
+        POSITION_UPDATES = 3, 'Position Updates Only'
+        CUSTOM = 4, 'Custom Events'
+
+    SUBSCRIPTION_TYPE_CHOICES = tuple((member.name, member.label) for member in SubscriptionType)
 
     user = models.ForeignKey(
         User,
@@ -286,9 +377,8 @@ class VesselSubscription(models.Model):
         related_name='subscribers',
         verbose_name='Vessel'
     )
-    subscription_type = models.CharField(
-        max_length=20,
-        choices=SUBSCRIPTION_TYPE_CHOICES,
+    subscription_type = SmallIntegerChoiceField(
+        enum=SubscriptionType,
         default='ALL_EVENTS',
         verbose_name='Subscription Type'
     )
@@ -322,6 +322,7 @@ class PortAnalyticsRefreshSerializer(serializers.Serializer):
     unctad_records_fetched = serializers.IntegerField()
     ports_updated = serializers.IntegerField()
     ports_not_found = serializers.IntegerField()
+    ports_locked = serializers.IntegerField(required=False)
     events_created = serializers.IntegerField()
     errors = serializers.ListField(child=serializers.CharField(), required=False)
     success = serializers.BooleanField()
@@ -2,15 +2,160 @@
 Enhanced AIS Data Service for fetching real-time vessel position data.
 Supports MarineTraffic, AISHub, and other AIS providers with robust error handling.
 """
+import asyncio
+import hashlib
+import json
 import logging
 import random
 import requests
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
+from itertools import islice
 from typing import List, Dict, Any, Optional
+from asgiref.sync import sync_to_async
 from django.conf import settings
+from django.core.cache import cache
+from django.utils.functional import cached_property
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+try:
+    import ijson
+except ImportError:  # pragma: no cover - optional streaming parser
+    ijson = None
 
 logger = logging.getLogger(__name__)
 
+# Live positions go stale quickly; keep them just long enough to absorb
+# bursts of identical requests (page views, IMO lookups, area queries).
+POSITIONS_CACHE_TTL = 60
+MOCK_POSITIONS_CACHE_TTL = 5
+HEALTH_CHECK_CACHE_TTL = 30
+
+# Feed size used to build the IMO lookup index.
+IMO_INDEX_FEED_LIMIT = 1000
+
+# Unfiltered position limits kept warm by refresh_positions_cache(): the API
+# default, the vessel tracking job and the IMO index feed. Refresh every
+# REFRESH_AHEAD_INTERVAL seconds so entries are replaced before they expire.
+REFRESH_AHEAD_LIMITS = (50, 200, IMO_INDEX_FEED_LIMIT)
+REFRESH_AHEAD_INTERVAL = 45
+
+# Provider field names for each standard position attribute.
+MARINETRAFFIC_FIELDS = {
+    'imo': 'IMO', 'mmsi': 'MMSI', 'name': 'SHIPNAME', 'vessel_type': 'TYPE_NAME', 'flag': 'FLAG',
+    'latitude': 'LAT', 'longitude': 'LON', 'speed': 'SPEED', 'heading': 'COURSE', 'timestamp': 'TIMESTAMP',
+}
+AISHUB_FIELDS = {
+    'imo': 'IMO', 'mmsi': 'MMSI', 'name': 'NAME', 'vessel_type': 'TYPE', 'flag': 'COUNTRY',
+    # Speed / Course Over Ground
+    'latitude': 'LATITUDE', 'longitude': 'LONGITUDE', 'speed': 'SOG', 'heading': 'COG', 'timestamp': 'TIME',
+}
+VESSELFINDER_FIELDS = {
+    'imo': 'imo', 'mmsi': 'mmsi', 'name': 'name', 'vessel_type': 'type', 'flag': 'flag',
+    'latitude': 'lat', 'longitude': 'lon', 'speed': 'speed', 'heading': 'heading', 'timestamp': 'timestamp',
+}
+
+# Responses larger than this are parsed incrementally (when ijson is
+# installed) so normalization starts while the body is still arriving.
+STREAMING_THRESHOLD_BYTES = 256 * 1024
+
+# Upper bound on concurrent provider requests for multi-area sweeps.
+AREA_FETCH_MAX_WORKERS = 8
+
+
+def _build_http_session() -> requests.Session:
+    """Shared keep-alive session so provider calls reuse pooled TCP/TLS connections."""
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=10,
+        pool_maxsize=50,
+        max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[502, 503, 504]),
+    )
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    session.headers.update({'Accept-Encoding': 'gzip'})
+    return session
+
+
+_SESSION = _build_http_session()
+
+
+class _InflightCall:
+    """A fetch in progress that other threads can wait on."""
+    
+    __slots__ = ('done', 'result', 'error')
+    
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+_inflight_lock = threading.Lock()
+_inflight: Dict[str, _InflightCall] = {}
+
+
+def _singleflight(key: str, fn):
+    """
+    Run ``fn`` once per ``key`` across concurrent callers in this process.
+    
+    The first caller becomes the leader and runs ``fn``; callers arriving
+    while it is in flight wait for and share its result (or exception).
+    """
+    with _inflight_lock:
+        call = _inflight.get(key)
+        is_leader = call is None
+        if is_leader:
+            call = _InflightCall()
+            _inflight[key] = call
+    
+    if not is_leader:
+        call.done.wait()
+        if call.error is not None:
+            raise call.error
+        return call.result
+    
+    try:
+        call.result = fn()
+        return call.result
+    except Exception as e:
+        call.error = e
+        raise
+    finally:
+        with _inflight_lock:
+            _inflight.pop(key, None)
+        call.done.set()
+
+
+def _decode_json(response: requests.Response) -> Any:
+    """Decode a provider response body, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return json.loads(response.content)
+
+
+def _should_stream(response: requests.Response) -> bool:
+    """Whether a (stream=True) response is large enough to parse incrementally."""
+    if ijson is None:
+        return False
+    try:
+        return int(response.headers.get('Content-Length', 0)) > STREAMING_THRESHOLD_BYTES
+    except ValueError:
+        return False
+
+
+def _iter_json_items(response: requests.Response, prefix: str):
+    """Yield the array items at ``prefix`` from the raw response stream."""
+    response.raw.decode_content = True
+    return ijson.items(response.raw, prefix, use_float=True)
+
 
 class AISDataService:
     """
@@ -18,6 +163,83 @@ class AISDataService:
     Supports multiple AIS providers with fallback to mock data for development.
     """
     
+    # Mock fleet used for development and as the fallback when providers fail.
+    # Built once at import and shared read-only by every instance.
+    MOCK_VESSELS = (
+        {
+            'imo': '9123456',
+            'mmsi': '123456789',
+            'name': 'ATLANTIC STAR',
+            'vessel_type': 'Container Ship',
+            'flag': 'Panama',
+            'base_lat': 40.7128,
+            'base_lon': -74.0060,
+        },
+        {
+            'imo': '9234567',
+            'mmsi': '234567890',
+            'name': 'PACIFIC GLORY',
+            'vessel_type': 'Bulk Carrier',
+            'flag': 'Liberia',
+            'base_lat': 34.0522,
+            'base_lon': -118.2437,
+        },
+        {
+            'imo': '9345678',
+            'mmsi': '345678901',
+            'name': 'NORDIC WIND',
+            'vessel_type': 'Tanker',
+            'flag': 'Marshall Islands',
+            'base_lat': 51.5074,
+            'base_lon': -0.1278,
+        },
+        {
+            'imo': '9456789',
+            'mmsi': '456789012',
+            'name': 'SOUTHERN CROSS',
+            'vessel_type': 'General Cargo',
+            'flag': 'Singapore',
+            'base_lat': -33.8688,
+            'base_lon': 151.2093,
+        },
+        {
+            'imo': '9567890',
+            'mmsi': '567890123',
+            'name': 'ARCTIC EXPLORER',
+            'vessel_type': 'Research Vessel',
+            'flag': 'Norway',
+            'base_lat': 60.1699,
+            'base_lon': 24.9384,
+        },
+        {
+            'imo': '9678901',
+            'mmsi': '678901234',
+            'name': 'GULF TRADER',
+            'vessel_type': 'Container Ship',
+            'flag': 'UAE',
+            'base_lat': 25.2048,
+            'base_lon': 55.2708,
+        },
+        {
+            'imo': '9789012',
+            'mmsi': '789012345',
+            'name': 'MEDITERRANEAN STAR',
+            'vessel_type': 'Cruise Ship',
+            'flag': 'Italy',
+            'base_lat': 41.9028,
+            'base_lon': 12.4964,
+        },
+    )
+    _MOCK_INDEX = {vessel['imo']: vessel for vessel in MOCK_VESSELS}
+    
+    # Provider name -> (fetch method, normalize method). Subclasses can add
+    # providers by extending this mapping and base_urls.
+    _PROVIDERS = {
+        'marinetraffic': ('_fetch_from_marinetraffic', '_normalize_marinetraffic_response'),
+        'aishub': ('_fetch_from_aishub', '_normalize_aishub_response'),
+        'vesselfinder': ('_fetch_from_vesselfinder', '_normalize_vesselfinder_response'),
+    }
+    
     def __init__(self, api_key: str = None, provider: str = 'marinetraffic'):
         """
         Initialize AIS data service.
@@ -33,79 +255,28 @@ class AISDataService:
             'aishub': 'http://data.aishub.net/ws.php',
             'vesselfinder': 'https://api.vesselfinder.com/api',
         }
-        self.mock_vessels = self._generate_mock_vessels()
         
         if not self.api_key:
-            logger.warning(f"No API key configured for {provider}. Using mock data.")
-    
-    def _generate_mock_vessels(self) -> List[Dict[str, Any]]:
-        """Generate enhanced mock vessel data for testing purposes."""
-        mock_data = [
-            {
-                'imo': '9123456',
-                'mmsi': '123456789',
-                'name': 'ATLANTIC STAR',
-                'vessel_type': 'Container Ship',
-                'flag': 'Panama',
-                'base_lat': 40.7128,
-                'base_lon': -74.0060,
-            },
-            {
-                'imo': '9234567',
-                'mmsi': '234567890',
-                'name': 'PACIFIC GLORY',
-                'vessel_type': 'Bulk Carrier',
-                'flag': 'Liberia',
-                'base_lat': 34.0522,
-                'base_lon': -118.2437,
-            },
-            {
-                'imo': '9345678',
-                'mmsi': '345678901',
-                'name': 'NORDIC WIND',
-                'vessel_type': 'Tanker',
-                'flag': 'Marshall Islands',
-                'base_lat': 51.5074,
-                'base_lon': -0.1278,
-            },
-            {
-                'imo': '9456789',
-                'mmsi': '456789012',
-                'name': 'SOUTHERN CROSS',
-                'vessel_type': 'General Cargo',
-                'flag': 'Singapore',
-                'base_lat': -33.8688,
-                'base_lon': 151.2093,
-            },
-            {
-                'imo': '9567890',
-                'mmsi': '567890123',
-                'name': 'ARCTIC EXPLORER',
-                'vessel_type': 'Research Vessel',
-                'flag': 'Norway',
-                'base_lat': 60.1699,
-                'base_lon': 24.9384,
-            },
-            {
-                'imo': '9678901',
-                'mmsi': '678901234',
-                'name': 'GULF TRADER',
-                'vessel_type': 'Container Ship',
-                'flag': 'UAE',
-                'base_lat': 25.2048,
-                'base_lon': 55.2708,
-            },
-            {
-                'imo': '9789012',
-                'mmsi': '789012345',
-                'name': 'MEDITERRANEAN STAR',
-                'vessel_type': 'Cruise Ship',
-                'flag': 'Italy',
-                'base_lat': 41.9028,
-                'base_lon': 12.4964,
-            }
-        ]
-        return mock_data
+            logger.warning("No API key configured for %s. Using mock data.", provider)
+    
+    @cached_property
+    def mock_vessels(self):
+        """Mock fleet, resolved on first use so API-backed instances never touch it."""
+        return self.MOCK_VESSELS
+    
+    @cached_property
+    def _mock_base_microdegrees(self) -> Dict[str, tuple]:
+        """Base (lat, lon) of each mock vessel as integer micro-degrees, keyed by IMO."""
+        return {
+            vessel['imo']: (round(vessel['base_lat'] * 1e6), round(vessel['base_lon'] * 1e6))
+            for vessel in self.mock_vessels
+        }
+    
+    @cached_property
+    def _mock_index(self) -> Dict[str, Dict[str, Any]]:
+        if self.mock_vessels is self.MOCK_VESSELS:
+            return self._MOCK_INDEX
+        return {vessel['imo']: vessel for vessel in self.mock_vessels}
     
     def get_live_vessel_positions(self, limit: int = 50, bbox: Dict[str, float] = None) -> List[Dict[str, Any]]:
         """
@@ -118,33 +289,157 @@ class AISDataService:
         Returns:
             List of vessel position dictionaries with standardized fields
         """
+        use_real_api = bool(self.api_key and self.provider in self.base_urls)
+        cache_key = self._positions_cache_key(limit, bbox)
+        
+        positions = cache.get(cache_key)
+        if positions is not None:
+            return positions
+        
+        # Concurrent misses for the same key share a single upstream fetch.
+        return _singleflight(
+            cache_key,
+            lambda: self._fetch_and_cache_positions(cache_key, limit, bbox, use_real_api),
+        )
+    
+    async def aget_live_vessel_positions(self, limit: int = 50,
+                                         bbox: Dict[str, float] = None) -> List[Dict[str, Any]]:
+        """
+        Async variant of get_live_vessel_positions for async views and workers.
+        
+        The blocking provider request runs in a worker thread, so the event
+        loop stays free while the fetch is in flight. Caching and request
+        coalescing behave exactly as in the sync API.
+        """
+        return await sync_to_async(self.get_live_vessel_positions, thread_sensitive=False)(limit, bbox)
+    
+    async def aget_vessels_in_areas(self, bboxes: List[Dict[str, float]],
+                                    limit: int = 100) -> List[List[Dict[str, Any]]]:
+        """Async variant of get_vessels_in_areas; fetches all areas concurrently."""
+        return list(await asyncio.gather(
+            *(self.aget_live_vessel_positions(limit=limit, bbox=bbox) for bbox in bboxes)
+        ))
+    
+    def _fetch_and_cache_positions(self, cache_key: str, limit: int, bbox: Dict[str, float],
+                                   use_real_api: bool) -> List[Dict[str, Any]]:
+        """
+        Fetch positions and cache them under ``cache_key``.
+        
+        Provider data is kept for POSITIONS_CACHE_TTL. If the provider fails,
+        the mock fleet served in its place is cached only for
+        MOCK_POSITIONS_CACHE_TTL so the next request retries the provider soon.
+        """
+        positions = cache.get(cache_key)
+        if positions is not None:
+            return positions
+        
+        timeout = POSITIONS_CACHE_TTL if use_real_api else MOCK_POSITIONS_CACHE_TTL
         try:
-            if self.api_key and self.provider in self.base_urls:
-                return self._fetch_from_real_api(limit, bbox)
-            else:
-                logger.info("Using mock data for AIS vessel positions")
-                return self._generate_mock_positions(limit, bbox)
+            positions = self._fetch_live_positions(limit, bbox, use_real_api)
         except Exception as e:
-            logger.error(f"Error fetching vessel positions: {str(e)}", exc_info=True)
-            return self._generate_mock_positions(limit, bbox)
+            logger.error("Error fetching vessel positions: %s", e, exc_info=True)
+            positions = self._generate_mock_positions(limit, bbox)
+            timeout = MOCK_POSITIONS_CACHE_TTL
+        
+        cache.set(cache_key, positions, timeout)
+        return positions
+    
+    def _fetch_live_positions(self, limit: int, bbox: Dict[str, float],
+                              use_real_api: bool) -> List[Dict[str, Any]]:
+        """Fetch positions from the provider (or mocks), bypassing the cache. Provider errors propagate."""
+        if use_real_api:
+            return self._fetch_from_real_api(limit, bbox)
+        logger.info("Using mock data for AIS vessel positions")
+        return self._generate_mock_positions(limit, bbox)
+    
+    def _positions_generation_key(self) -> str:
+        return f"ais:{self.provider}:generation"
+    
+    def _positions_generation(self) -> int:
+        return cache.get_or_set(self._positions_generation_key(), 0, None)
+    
+    def _positions_cache_key(self, limit: int, bbox: Dict[str, float] = None) -> str:
+        """
+        Build the cache key for a positions request.
+        
+        The key embeds a per-provider generation number so that
+        invalidate_positions() can drop every (limit, bbox) variant at once.
+        """
+        bbox_hash = hashlib.blake2b(
+            json.dumps(bbox, sort_keys=True).encode(), digest_size=8
+        ).hexdigest()
+        return f"ais:{self.provider}:{self._positions_generation()}:{limit}:{bbox_hash}"
+    
+    def _imo_index(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Return a cached {imo: vessel} index over the provider's full position feed.
+        
+        Built once per positions TTL so repeated IMO lookups are a dict hit
+        rather than a scan of the whole feed.
+        """
+        index = cache.get(self._imo_index_cache_key())
+        if index is None:
+            index = self._cache_imo_index(self.get_live_vessel_positions(limit=IMO_INDEX_FEED_LIMIT))
+        return index
+    
+    def _imo_index_cache_key(self) -> str:
+        return f"ais:{self.provider}:{self._positions_generation()}:imo_index"
+    
+    def _cache_imo_index(self, positions: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        index = {vessel.get('imo'): vessel for vessel in positions}
+        cache.set(self._imo_index_cache_key(), index, POSITIONS_CACHE_TTL)
+        return index
+    
+    def refresh_positions_cache(self) -> Dict[str, Any]:
+        """
+        Refresh-ahead: re-fetch the unfiltered feed and overwrite the cached entries.
+        
+        Meant to run from a scheduled job every REFRESH_AHEAD_INTERVAL seconds
+        so user-facing reads keep hitting a warm cache instead of paying for
+        the upstream fetch when the TTL lapses. One fetch at the largest limit
+        fills every entry in REFRESH_AHEAD_LIMITS plus the IMO index.
+        
+        Provider errors propagate and leave the cached entries untouched, so
+        the job fails and is retried instead of overwriting live data with mocks.
+        
+        Returns:
+            Summary dictionary with the refreshed limits and vessel count
+        """
+        use_real_api = bool(self.api_key and self.provider in self.base_urls)
+        timeout = POSITIONS_CACHE_TTL if use_real_api else MOCK_POSITIONS_CACHE_TTL
+        max_limit = max(REFRESH_AHEAD_LIMITS)
+        
+        positions = self._fetch_live_positions(max_limit, None, use_real_api)
+        cache.set_many(
+            {self._positions_cache_key(limit): positions[:limit] for limit in REFRESH_AHEAD_LIMITS},
+            timeout,
+        )
+        self._cache_imo_index(positions)
+        
+        logger.info("Refreshed cached AIS positions for %s (%d vessels)", self.provider, len(positions))
+        return {
+            'provider': self.provider,
+            'limits': list(REFRESH_AHEAD_LIMITS),
+            'vessel_count': len(positions),
+            'source': 'api' if use_real_api else 'mock',
+        }
+    
+    def invalidate_positions(self) -> None:
+        """Drop all cached positions for this provider (e.g. after an admin push update)."""
+        try:
+            cache.incr(self._positions_generation_key())
+        except ValueError:
+            cache.set(self._positions_generation_key(), 1, None)
+        logger.info("Invalidated cached AIS positions for %s", self.provider)
     
     def _fetch_from_real_api(self, limit: int, bbox: Dict[str, float] = None) -> List[Dict[str, Any]]:
         """
         Fetch data from real AIS API with provider-specific implementations.
         """
-        try:
-            if self.provider == 'marinetraffic':
-                return self._fetch_from_marinetraffic(limit, bbox)
-            elif self.provider == 'aishub':
-                return self._fetch_from_aishub(limit, bbox)
-            elif self.provider == 'vesselfinder':
-                return self._fetch_from_vesselfinder(limit, bbox)
-            else:
-                logger.warning(f"Unknown provider: {self.provider}")
-                return self._generate_mock_positions(limit, bbox)
-        except Exception as e:
-            logger.error(f"API fetch failed for {self.provider}: {str(e)}", exc_info=True)
-            return self._generate_mock_positions(limit, bbox)
+        fetcher_name, _ = self._PROVIDERS.get(self.provider, (None, None))
+        if fetcher_name is None:
+            raise ValueError(f"Unknown AIS provider: {self.provider}")
+        return getattr(self, fetcher_name)(limit, bbox)
     
     def _fetch_from_marinetraffic(self, limit: int, bbox: Dict[str, float] = None) -> List[Dict[str, Any]]:
         """Fetch from MarineTraffic API."""
@@ -163,10 +458,14 @@ class AISDataService:
                 'maxlon': bbox['max_lon'],
             })
         
-        response = requests.get(url, params=params, timeout=30)
-        response.raise_for_status()
-        
-        data = response.json()
+        with _SESSION.get(url, params=params, timeout=30, stream=True) as response:
+            response.raise_for_status()
+            
+            if _should_stream(response):
+                return self._normalize_records(
+                    _iter_json_items(response, 'item'), MARINETRAFFIC_FIELDS, 'MarineTraffic'
+                )
+            data = _decode_json(response)
         return self._normalize_marinetraffic_response(data)
     
     def _fetch_from_aishub(self, limit: int, bbox: Dict[str, float] = None) -> List[Dict[str, Any]]:
@@ -187,10 +486,10 @@ class AISDataService:
                 'lonmax': bbox['max_lon'],
             })
         
-        response = requests.get(self.base_urls['aishub'], params=params, timeout=30)
+        response = _SESSION.get(self.base_urls['aishub'], params=params, timeout=30)
         response.raise_for_status()
         
-        data = response.json()
+        data = _decode_json(response)
         return self._normalize_aishub_response(data)
     
     def _fetch_from_vesselfinder(self, limit: int, bbox: Dict[str, float] = None) -> List[Dict[str, Any]]:
@@ -201,118 +500,122 @@ class AISDataService:
         if bbox:
             params['bbox'] = f"{bbox['min_lon']},{bbox['min_lat']},{bbox['max_lon']},{bbox['max_lat']}"
         
-        response = requests.get(f"{self.base_urls['vesselfinder']}/vessels", 
-                              headers=headers, params=params, timeout=30)
-        response.raise_for_status()
-        
-        data = response.json()
+        with _SESSION.get(f"{self.base_urls['vesselfinder']}/vessels", 
+                          headers=headers, params=params, timeout=30, stream=True) as response:
+            response.raise_for_status()
+            
+            if _should_stream(response):
+                return self._normalize_records(
+                    _iter_json_items(response, 'vessels.item'), VESSELFINDER_FIELDS, 'VesselFinder'
+                )
+            data = _decode_json(response)
         return self._normalize_vesselfinder_response(data)
     
     def _normalize_marinetraffic_response(self, data: List[Dict]) -> List[Dict[str, Any]]:
         """Normalize MarineTraffic API response to standard format."""
-        normalized = []
-        for vessel in data:
-            try:
-                normalized.append({
-                    'imo': vessel.get('IMO', ''),
-                    'mmsi': vessel.get('MMSI', ''),
-                    'name': vessel.get('SHIPNAME', ''),
-                    'vessel_type': vessel.get('TYPE_NAME', ''),
-                    'flag': vessel.get('FLAG', ''),
-                    'latitude': float(vessel.get('LAT', 0)),
-                    'longitude': float(vessel.get('LON', 0)),
-                    'speed': float(vessel.get('SPEED', 0)),
-                    'heading': int(vessel.get('COURSE', 0)),
-                    'timestamp': vessel.get('TIMESTAMP', datetime.now(timezone.utc).isoformat()),
-                })
-            except (ValueError, TypeError) as e:
-                logger.warning(f"Error normalizing MarineTraffic vessel data: {e}")
-                continue
-        return normalized
+        return self._normalize_records(data, MARINETRAFFIC_FIELDS, 'MarineTraffic')
     
     def _normalize_aishub_response(self, data: List[Dict]) -> List[Dict[str, Any]]:
         """Normalize AISHub API response to standard format."""
-        normalized = []
         vessels = data.get('data', []) if isinstance(data, dict) else data
-        
-        for vessel in vessels:
-            try:
-                normalized.append({
-                    'imo': vessel.get('IMO', ''),
-                    'mmsi': vessel.get('MMSI', ''),
-                    'name': vessel.get('NAME', ''),
-                    'vessel_type': vessel.get('TYPE', ''),
-                    'flag': vessel.get('COUNTRY', ''),
-                    'latitude': float(vessel.get('LATITUDE', 0)),
-                    'longitude': float(vessel.get('LONGITUDE', 0)),
-                    'speed': float(vessel.get('SOG', 0)),  # Speed Over Ground
-                    'heading': int(vessel.get('COG', 0)),  # Course Over Ground
-                    'timestamp': vessel.get('TIME', datetime.now(timezone.utc).isoformat()),
-                })
-            except (ValueError, TypeError) as e:
-                logger.warning(f"Error normalizing AISHub vessel data: {e}")
-                continue
-        return normalized
+        return self._normalize_records(vessels, AISHUB_FIELDS, 'AISHub')
     
     def _normalize_vesselfinder_response(self, data: Dict) -> List[Dict[str, Any]]:
         """Normalize VesselFinder API response to standard format."""
-        normalized = []
-        vessels = data.get('vessels', [])
+        return self._normalize_records(data.get('vessels', []), VESSELFINDER_FIELDS, 'VesselFinder')
+    
+    def _normalize_records(self, vessels: List[Dict], fields: Dict[str, str],
+                           provider_name: str) -> List[Dict[str, Any]]:
+        """
+        Map provider records onto the standard schema using a field table.
         
+        Key lookups and numeric coercions are resolved once per batch rather
+        than spelled out per provider, and rows with non-numeric coordinates
+        are skipped with a single summary warning.
+        """
+        imo_key, mmsi_key, name_key, type_key, flag_key = (
+            fields['imo'], fields['mmsi'], fields['name'], fields['vessel_type'], fields['flag']
+        )
+        lat_key, lon_key, speed_key, heading_key, ts_key = (
+            fields['latitude'], fields['longitude'], fields['speed'], fields['heading'], fields['timestamp']
+        )
+        
+        now_iso = datetime.now(timezone.utc).isoformat()
+        normalized = []
+        skipped = 0
         for vessel in vessels:
             try:
                 normalized.append({
-                    'imo': vessel.get('imo', ''),
-                    'mmsi': vessel.get('mmsi', ''),
-                    'name': vessel.get('name', ''),
-                    'vessel_type': vessel.get('type', ''),
-                    'flag': vessel.get('flag', ''),
-                    'latitude': float(vessel.get('lat', 0)),
-                    'longitude': float(vessel.get('lon', 0)),
-                    'speed': float(vessel.get('speed', 0)),
-                    'heading': int(vessel.get('heading', 0)),
-                    'timestamp': vessel.get('timestamp', datetime.now(timezone.utc).isoformat()),
+                    'imo': vessel.get(imo_key, ''),
+                    'mmsi': vessel.get(mmsi_key, ''),
+                    'name': vessel.get(name_key, ''),
+                    'vessel_type': vessel.get(type_key, ''),
+                    'flag': vessel.get(flag_key, ''),
+                    'latitude': float(vessel.get(lat_key, 0)),
+                    'longitude': float(vessel.get(lon_key, 0)),
+                    'speed': float(vessel.get(speed_key, 0)),
+                    'heading': int(vessel.get(heading_key, 0)),
+                    'timestamp': vessel.get(ts_key) or now_iso,
                 })
-            except (ValueError, TypeError) as e:
-                logger.warning(f"Error normalizing VesselFinder vessel data: {e}")
-                continue
+            except (ValueError, TypeError):
+                skipped += 1
+        
+        if skipped:
+            logger.warning("Skipped %d malformed %s vessel records", skipped, provider_name)
         return normalized
     
     def _generate_mock_positions(self, limit: int, bbox: Dict[str, float] = None) -> List[Dict[str, Any]]:
         """Generate mock vessel positions for testing with realistic movement."""
-        positions = []
+        randint = random.randint
+        bases = self._mock_base_microdegrees
         
-        vessels_to_use = self.mock_vessels[:limit]
-        
-        for vessel in vessels_to_use:
-            # Add realistic movement simulation
-            lat_offset = random.uniform(-0.05, 0.05)
-            lon_offset = random.uniform(-0.05, 0.05)
-            
-            lat = vessel['base_lat'] + lat_offset
-            lon = vessel['base_lon'] + lon_offset
-            
-            # Apply bounding box filter if provided
-            if bbox:
-                if not (bbox['min_lat'] <= lat <= bbox['max_lat'] and 
-                       bbox['min_lon'] <= lon <= bbox['max_lon']):
-                    continue
-            
-            position = {
-                'imo': vessel['imo'],
-                'mmsi': vessel['mmsi'],
-                'name': vessel['name'],
-                'vessel_type': vessel['vessel_type'],
-                'flag': vessel['flag'],
-                'latitude': round(lat, 6),
-                'longitude': round(lon, 6),
-                'speed': round(random.uniform(0, 25), 1),
-                'heading': random.randint(0, 359),
-                'timestamp': datetime.now(timezone.utc).isoformat(),
-            }
-            positions.append(position)
+        # Coordinates are drawn as integer micro-degrees (±0.05° jitter), so
+        # the 6-decimal precision needs no per-value round() calls. The bbox
+        # is applied to the raw coordinates before any position dicts are
+        # built, and the limit after filtering, so a bbox query returns up to
+        # ``limit`` matching vessels rather than filtering a first slice.
+        coords = (
+            (vessel,
+             (bases[vessel['imo']][0] + randint(-50000, 50000)) / 1e6,
+             (bases[vessel['imo']][1] + randint(-50000, 50000)) / 1e6)
+            for vessel in (self.mock_vessels if bbox else self.mock_vessels[:limit])
+        )
+        if bbox:
+            min_lat, max_lat = bbox['min_lat'], bbox['max_lat']
+            min_lon, max_lon = bbox['min_lon'], bbox['max_lon']
+            coords = (
+                (vessel, lat, lon) for vessel, lat, lon in coords
+                if min_lat <= lat <= max_lat and min_lon <= lon <= max_lon
+            )
+        coords = list(islice(coords, max(limit, 0)))
         
-        return positions
+        now_iso = datetime.now(timezone.utc).isoformat()
+        return [self._build_mock_position(vessel, lat, lon, now_iso) for vessel, lat, lon in coords]
+    
+    def _generate_mock_position(self, vessel: Dict[str, Any], now_iso: str = None) -> Dict[str, Any]:
+        """Generate a single mock position around a mock vessel's base location."""
+        # Add realistic movement simulation
+        base_lat, base_lon = self._mock_base_microdegrees[vessel['imo']]
+        lat = (base_lat + random.randint(-50000, 50000)) / 1e6
+        lon = (base_lon + random.randint(-50000, 50000)) / 1e6
+        return self._build_mock_position(vessel, lat, lon, now_iso or datetime.now(timezone.utc).isoformat())
+    
+    def _build_mock_position(self, vessel: Dict[str, Any], lat: float, lon: float,
+                             now_iso: str) -> Dict[str, Any]:
+        """Build a position dict for a mock vessel at the given (6-decimal) coordinates."""
+        return {
+            'imo': vessel['imo'],
+            'mmsi': vessel['mmsi'],
+            'name': vessel['name'],
+            'vessel_type': vessel['vessel_type'],
+            'flag': vessel['flag'],
+            'latitude': lat,
+            'longitude': lon,
+            # Tenths of a knot, 0.0-25.0
+            'speed': random.randint(0, 250) / 10,
+            'heading': random.randint(0, 359),
+            'timestamp': now_iso,
+        }
     
     def get_vessel_by_imo(self, imo: str) -> Optional[Dict[str, Any]]:
         """
@@ -330,26 +633,21 @@ class AISDataService:
             else:
                 return self._get_mock_vessel_by_imo(imo)
         except Exception as e:
-            logger.error(f"Error fetching vessel {imo}: {str(e)}", exc_info=True)
+            logger.error("Error fetching vessel %s: %s", imo, e, exc_info=True)
             return self._get_mock_vessel_by_imo(imo)
     
     def _fetch_vessel_by_imo_from_api(self, imo: str) -> Optional[Dict[str, Any]]:
         """Fetch specific vessel from real API by IMO."""
         # For most APIs, we need to fetch all vessels and filter
         # Some APIs support direct IMO lookup
-        all_positions = self.get_live_vessel_positions(limit=1000)
-        for vessel in all_positions:
-            if vessel.get('imo') == imo:
-                return vessel
-        return None
+        return self._imo_index().get(imo)
     
     def _get_mock_vessel_by_imo(self, imo: str) -> Optional[Dict[str, Any]]:
         """Get mock vessel data by IMO."""
-        all_positions = self._generate_mock_positions(len(self.mock_vessels))
-        for vessel in all_positions:
-            if vessel['imo'] == imo:
-                return vessel
-        return None
+        vessel = self._mock_index.get(imo)
+        if vessel is None:
+            return None
+        return self._generate_mock_position(vessel)
     
     def get_vessels_in_area(self, bbox: Dict[str, float], limit: int = 100) -> List[Dict[str, Any]]:
         """
@@ -364,19 +662,62 @@ class AISDataService:
         """
         return self.get_live_vessel_positions(limit=limit, bbox=bbox)
     
-    def validate_api_connection(self) -> Dict[str, Any]:
+    def get_vessels_in_areas(self, bboxes: List[Dict[str, float]], limit: int = 100) -> List[List[Dict[str, Any]]]:
+        """
+        Get vessels for several geographical areas at once.
+        
+        Provider requests for the areas run concurrently, so a multi-region
+        sweep costs roughly one round-trip instead of one per area.
+        
+        Args:
+            bboxes: List of bounding boxes {'min_lat', 'max_lat', 'min_lon', 'max_lon'}
+            limit: Maximum number of vessels to return per area
+            
+        Returns:
+            List of vessel lists, in the same order as ``bboxes``
+        """
+        if not bboxes:
+            return []
+        
+        max_workers = min(AREA_FETCH_MAX_WORKERS, len(bboxes))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(
+                lambda bbox: self.get_live_vessel_positions(limit=limit, bbox=bbox),
+                bboxes,
+            ))
+    
+    def validate_api_connection(self, force_refresh: bool = False) -> Dict[str, Any]:
         """
         Validate API connection and return status information.
         
+        The result is cached per provider for HEALTH_CHECK_CACHE_TTL seconds so
+        polling dashboards do not each trigger a live provider request.
+        
+        Args:
+            force_refresh: Skip the cached status and probe the provider now
+            
         Returns:
             Dictionary with connection status and details
         """
+        cache_key = f"ais:health:{self.provider}"
+        if not force_refresh:
+            status = cache.get(cache_key)
+            if status is not None:
+                return status
+        
+        status = _singleflight(cache_key, self._check_api_connection)
+        cache.set(cache_key, status, HEALTH_CHECK_CACHE_TTL)
+        return status
+    
+    def _check_api_connection(self) -> Dict[str, Any]:
+        """Probe the provider and build the connection status dict."""
         status = {
             'provider': self.provider,
             'api_key_configured': bool(self.api_key),
             'connection_status': 'unknown',
             'error': None,
-            'test_vessel_count': 0
+            'test_vessel_count': 0,
+            'last_checked': datetime.now(timezone.utc).isoformat(),
         }
         
         try:
@@ -385,14 +726,14 @@ class AISDataService:
                 status['error'] = 'No API key configured'
                 return status
             
-            # Test with a small request
-            test_vessels = self.get_live_vessel_positions(limit=1)
+            # Test with a small request, bypassing the positions cache
+            test_vessels = self._fetch_live_positions(1, None, self.provider in self.base_urls)
             status['test_vessel_count'] = len(test_vessels)
             status['connection_status'] = 'connected' if test_vessels else 'no_data'
             
         except Exception as e:
             status['connection_status'] = 'error'
             status['error'] = str(e)
-            logger.error(f"API validation failed: {e}", exc_info=True)
+            logger.error("API validation failed: %s", e, exc_info=True)
         
-        return status
\ No newline at end of file
+        return status
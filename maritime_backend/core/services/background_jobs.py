@@ -7,26 +7,152 @@ Handles periodic updates for:
 - Vessel position updates
 """
 
+import collections
+import itertools
 import logging
 import random
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from django.utils import timezone
-from django.db import transaction
+from django.db import DatabaseError, close_old_connections, connections, transaction
 from django.conf import settings
+from django.core.cache import cache
 
 from core.models import Port, Vessel, Event, Notification
 from core.services.notification_service import run_all_event_checks
 from core.services.safety import trigger_safety_events_from_noaa
+from core.services.ais_data import AISDataService
+
+# Optional service layers, resolved once at import time.
+try:
+    from core.services.port_analytics import PortAnalyticsService, invalidate_port_dashboard
+except ImportError:  # pragma: no cover - analytics is optional
+    PortAnalyticsService = None
+    invalidate_port_dashboard = None
+
+try:
+    from core.services.vessel_tracking import VesselTrackingService
+except ImportError:  # pragma: no cover - tracking is optional
+    VesselTrackingService = None
 
 logger = logging.getLogger(__name__)
 
+# Port columns the congestion fallback reads, and the ones it writes back.
+# Ports whose score and wait time move less than PORT_CONGESTION_TOLERANCE
+# only get their traffic counts written; fully unchanged ports are skipped.
+PORT_CONGESTION_READ_FIELDS = (
+    'id', 'name', 'congestion_score', 'avg_wait_time', 'arrivals_count', 'departures_count',
+)
+# last_updated is stamped in the same UPDATE so the SQLite touch trigger has
+# nothing left to do.
+PORT_CONGESTION_WRITE_FIELDS = (
+    'congestion_score', 'avg_wait_time', 'arrivals_count', 'departures_count', 'last_updated',
+)
+PORT_TRAFFIC_WRITE_FIELDS = ('arrivals_count', 'departures_count', 'last_updated')
+PORT_CONGESTION_TOLERANCE = 0.05
+PORT_UPDATE_CHUNK_SIZE = 2000
+# Error messages kept in a job summary; the rest are only counted.
+REPORTED_ERRORS_LIMIT = 5
+
+# Vessel position batch size. Starts at VESSEL_FETCH_LIMIT and is re-tuned
+# after each run from the observed processing rate so that one batch takes
+# about VESSEL_FETCH_TARGET_SECONDS, within these bounds.
+VESSEL_FETCH_LIMIT_CACHE_KEY = 'bgjob:vessel_fetch_limit'
+MIN_VESSEL_FETCH_LIMIT = 50
+MAX_VESSEL_FETCH_LIMIT = 1000
+
+# Static datasets served when external APIs fail. Vessel records get their
+# timestamp added per call by FallbackDataService.get_fallback_vessel_data().
+_FALLBACK_PORTS = (
+    {
+        'name': 'Port of Dubai',
+        'country': 'UAE',
+        'congestion_score': 6.5,
+        'avg_wait_time': 3.2,
+        'arrivals': 42,
+        'departures': 38
+    },
+    {
+        'name': 'Port of Singapore',
+        'country': 'Singapore',
+        'congestion_score': 8.1,
+        'avg_wait_time': 5.7,
+        'arrivals': 67,
+        'departures': 63
+    },
+    {
+        'name': 'Port of Rotterdam',
+        'country': 'Netherlands',
+        'congestion_score': 4.8,
+        'avg_wait_time': 2.1,
+        'arrivals': 34,
+        'departures': 41
+    },
+    {
+        'name': 'Port of Shanghai',
+        'country': 'China',
+        'congestion_score': 9.2,
+        'avg_wait_time': 7.8,
+        'arrivals': 89,
+        'departures': 82
+    },
+    {
+        'name': 'Port of Los Angeles',
+        'country': 'USA',
+        'congestion_score': 7.3,
+        'avg_wait_time': 4.5,
+        'arrivals': 56,
+        'departures': 52
+    },
+)
+
+_FALLBACK_VESSELS_TEMPLATE = (
+    {
+        'imo': 'IMO9234567',
+        'mmsi': '123456789',
+        'name': 'Ocean Explorer',
+        'vessel_type': 'Container Ship',
+        'flag': 'Panama',
+        'latitude': 25.2048,
+        'longitude': 55.2708,
+        'speed': 12.5,
+        'heading': 45
+    },
+    {
+        'imo': 'IMO9876543',
+        'mmsi': '234567890',
+        'name': 'Maritime Pioneer',
+        'vessel_type': 'Bulk Carrier',
+        'flag': 'Liberia',
+        'latitude': 26.0667,
+        'longitude': 50.5577,
+        'speed': 8.2,
+        'heading': 180
+    },
+    {
+        'imo': 'IMO9345678',
+        'mmsi': '345678901',
+        'name': 'Gulf Trader',
+        'vessel_type': 'Tanker',
+        'flag': 'Marshall Islands',
+        'latitude': 24.4539,
+        'longitude': 54.3773,
+        'speed': 15.1,
+        'heading': 270
+    },
+)
+
 
 class BackgroundJobService:
     """
     Service for managing background jobs and periodic updates.
     """
     
+    _port_analytics_cls = PortAnalyticsService
+    _vessel_tracking_cls = VesselTrackingService
+    
     @staticmethod
     def update_port_congestion() -> Dict[str, Any]:
         """
@@ -35,122 +161,238 @@ class BackgroundJobService:
         """
         logger.info("Starting enhanced port congestion update job...")
         
+        # Try to use the enhanced analytics service first
+        job_summary, analytics_error = BackgroundJobService._try_enhanced_port_update()
+        if job_summary is not None:
+            return job_summary
+        
+        logger.warning(f"Enhanced analytics failed: {analytics_error}, using fallback method")
+        return BackgroundJobService._fallback_port_update(analytics_error)
+    
+    @staticmethod
+    def _try_enhanced_port_update() -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """
+        Run the enhanced analytics refresh.
+        
+        Returns:
+            (job_summary, None) on success, or (None, reason) when the
+            analytics service is unavailable or fails
+        """
+        if BackgroundJobService._port_analytics_cls is None:
+            logger.warning("Enhanced analytics service not available, falling back to basic update")
+            return None, "Analytics service not available"
+        
         try:
-            # Try to use the enhanced analytics service first
-            try:
-                from core.services.port_analytics import PortAnalyticsService
-                
-                analytics_service = PortAnalyticsService()
-                analytics_summary = analytics_service.refresh_all_port_analytics()
-                
-                # Transform analytics summary to match expected job format
-                job_summary = {
-                    'job': 'port_congestion_update',
-                    'timestamp': timezone.now().isoformat(),
-                    'method': 'enhanced_analytics',
-                    'ports_total': analytics_summary.get('unctad_records_fetched', 0),
-                    'ports_updated': analytics_summary.get('ports_updated', 0),
-                    'ports_not_found': analytics_summary.get('ports_not_found', 0),
-                    'events_created': analytics_summary.get('events_created', 0),
-                    'errors_count': len(analytics_summary.get('errors', [])),
-                    'errors': analytics_summary.get('errors', [])[:5],
-                    'success': analytics_summary.get('success', False),
-                    'analytics_summary': analytics_summary
-                }
-                
-                logger.info(f"Enhanced port congestion update completed: {job_summary['ports_updated']} ports updated")
-                return job_summary
-                
-            except ImportError:
-                logger.warning("Enhanced analytics service not available, falling back to basic update")
-                raise Exception("Analytics service not available")
-                
-        except Exception as analytics_error:
-            logger.warning(f"Enhanced analytics failed: {str(analytics_error)}, using fallback method")
+            analytics_service = BackgroundJobService._port_analytics_cls()
+            analytics_summary = analytics_service.refresh_all_port_analytics()
+        except Exception as e:
+            return None, str(e)
+        
+        # Transform analytics summary to match expected job format
+        job_summary = {
+            'job': 'port_congestion_update',
+            'timestamp': timezone.now().isoformat(),
+            'method': 'enhanced_analytics',
+            'ports_total': analytics_summary.get('unctad_records_fetched', 0),
+            'ports_updated': analytics_summary.get('ports_updated', 0),
+            'ports_not_found': analytics_summary.get('ports_not_found', 0),
+            'events_created': analytics_summary.get('events_created', 0),
+            'errors_count': len(analytics_summary.get('errors', [])),
+            'errors': analytics_summary.get('errors', [])[:REPORTED_ERRORS_LIMIT],
+            'success': analytics_summary.get('success', False),
+            'analytics_summary': analytics_summary
+        }
+        
+        logger.info(f"Enhanced port congestion update completed: {job_summary['ports_updated']} ports updated")
+        return job_summary, None
+    
+    @staticmethod
+    def _fallback_port_update(analytics_error: str) -> Dict[str, Any]:
+        """
+        Basic congestion update used when the enhanced analytics path fails.
+        """
+        try:
+            ports_updated = 0
+            ports_total = 0
+            errors = collections.deque(maxlen=REPORTED_ERRORS_LIMIT)
+            errors_count = 0
+            debug_enabled = logger.isEnabledFor(logging.DEBUG)
+            updated_names = []
+            traffic_only_count = 0
             
-            # Fallback to basic congestion update
+            # Read, compute and write in one transaction. Rows locked by a
+            # concurrent run of this job are skipped rather than waited on,
+            # so overlapping runs process disjoint sets of ports.
+            # last_updated is stamped with the run's start time in the same
+            # UPDATE, and ports only count as updated once the transaction
+            # has committed.
+            # Ports are streamed and written back PORT_UPDATE_CHUNK_SIZE rows
+            # at a time so memory stays bounded by the chunk, not the table.
             try:
-                ports_updated = 0
-                errors = []
-                
-                # Get all ports
-                ports = Port.objects.all()
-                
-                for port in ports:
-                    try:
-                        # Simulate fetching real-time congestion data
-                        congestion_data = BackgroundJobService._fetch_port_congestion_data(port)
+                updated_in_transaction = 0
+                traffic_only_in_transaction = 0
+                with transaction.atomic():
+                    ports = (
+                        Port.objects.select_for_update(skip_locked=True)
+                        .only(*PORT_CONGESTION_READ_FIELDS)
+                        .order_by('pk')
+                        .iterator(chunk_size=PORT_UPDATE_CHUNK_SIZE)
+                    )
+                    rng = random.Random()
+                    now = timezone.now()
+                    
+                    while True:
+                        chunk = list(itertools.islice(ports, PORT_UPDATE_CHUNK_SIZE))
+                        if not chunk:
+                            break
+                        ports_total += len(chunk)
+                        changed_ports = []
+                        traffic_only_ports = []
                         
-                        # Update port with new data
-                        port.congestion_score = congestion_data['congestion_score']
-                        port.avg_wait_time = congestion_data['avg_wait_time']
-                        port.arrivals_count = congestion_data['arrivals']
-                        port.departures_count = congestion_data['departures']
-                        port.last_updated = timezone.now()
-                        port.save()
+                        # Simulate fetching real-time congestion data for the chunk
+                        congestion_batch = BackgroundJobService._fetch_port_congestion_data_batch(chunk, rng)
                         
-                        ports_updated += 1
-                        logger.debug(f"Updated congestion data for {port.name}")
+                        for port, congestion_data in zip(chunk, congestion_batch):
+                            try:
+                                congestion_changed = (
+                                    port.congestion_score is None
+                                    or port.avg_wait_time is None
+                                    or abs(congestion_data['congestion_score'] - port.congestion_score) >= PORT_CONGESTION_TOLERANCE
+                                    or abs(congestion_data['avg_wait_time'] - port.avg_wait_time) >= PORT_CONGESTION_TOLERANCE
+                                )
+                                traffic_changed = (
+                                    congestion_data['arrivals'] != port.arrivals_count
+                                    or congestion_data['departures'] != port.departures_count
+                                )
+                                
+                                # Update port with new data
+                                port.arrivals_count = congestion_data['arrivals']
+                                port.departures_count = congestion_data['departures']
+                                port.last_updated = now
+                                if congestion_changed:
+                                    port.congestion_score = congestion_data['congestion_score']
+                                    port.avg_wait_time = congestion_data['avg_wait_time']
+                                    changed_ports.append(port)
+                                elif traffic_changed:
+                                    traffic_only_ports.append(port)
+                                
+                            except Exception as e:
+                                error_msg = f"Failed to update {port.name}: {str(e)}"
+                                errors.append(error_msg)
+                                errors_count += 1
+                                logger.error(error_msg, exc_info=True)
                         
-                    except Exception as e:
-                        error_msg = f"Failed to update {port.name}: {str(e)}"
-                        errors.append(error_msg)
-                        logger.error(error_msg, exc_info=True)
-                
-                summary = {
-                    'job': 'port_congestion_update',
-                    'timestamp': timezone.now().isoformat(),
-                    'method': 'fallback_basic',
-                    'ports_total': ports.count(),
-                    'ports_updated': ports_updated,
-                    'errors_count': len(errors),
-                    'errors': errors[:5],
-                    'success': len(errors) == 0,
-                    'fallback_reason': str(analytics_error)
-                }
+                        if changed_ports:
+                            Port.objects.bulk_update(
+                                changed_ports,
+                                PORT_CONGESTION_WRITE_FIELDS,
+                                batch_size=1000,
+                            )
+                        if traffic_only_ports:
+                            Port.objects.bulk_update(
+                                traffic_only_ports,
+                                PORT_TRAFFIC_WRITE_FIELDS,
+                                batch_size=1000,
+                            )
+                        updated_in_transaction += len(changed_ports) + len(traffic_only_ports)
+                        traffic_only_in_transaction += len(traffic_only_ports)
+                        if debug_enabled:
+                            updated_names.extend(port.name for port in changed_ports + traffic_only_ports)
+                    
+                    # bulk_update sends no post_save, so drop the dashboard cache here
+                    if updated_in_transaction and invalidate_port_dashboard is not None:
+                        transaction.on_commit(invalidate_port_dashboard)
                 
-                logger.info(f"Fallback port congestion update completed: {ports_updated}/{ports.count()} ports updated")
-                return summary
-                
-            except Exception as fallback_error:
-                logger.error(f"Fallback port congestion update also failed: {str(fallback_error)}", exc_info=True)
-                return {
-                    'job': 'port_congestion_update',
-                    'timestamp': timezone.now().isoformat(),
-                    'method': 'failed',
-                    'success': False,
-                    'error': str(fallback_error),
-                    'analytics_error': str(analytics_error)
-                }
+                # Committed: only now do the chunks count as updated
+                ports_updated = updated_in_transaction
+                traffic_only_count = traffic_only_in_transaction
+                if debug_enabled:
+                    logger.debug("Updated congestion data for %d ports (%d traffic only): %s",
+                                 ports_updated, traffic_only_count, updated_names)
+            except DatabaseError as e:
+                error_msg = f"Port congestion transaction failed: {str(e)}"
+                errors.append(error_msg)
+                errors_count += 1
+                logger.error(error_msg, exc_info=True)
+            
+            summary = {
+                'job': 'port_congestion_update',
+                'timestamp': timezone.now().isoformat(),
+                'method': 'fallback_basic',
+                'ports_total': ports_total,
+                'ports_updated': ports_updated,
+                'ports_unchanged': max(ports_total - ports_updated - errors_count, 0),
+                'errors_count': errors_count,
+                'errors': list(errors),
+                'success': errors_count == 0,
+                'fallback_reason': analytics_error
+            }
+            
+            logger.info(f"Fallback port congestion update completed: {ports_updated}/{ports_total} ports updated")
+            return summary
+            
+        except Exception as fallback_error:
+            logger.error(f"Fallback port congestion update also failed: {str(fallback_error)}", exc_info=True)
+            return {
+                'job': 'port_congestion_update',
+                'timestamp': timezone.now().isoformat(),
+                'method': 'failed',
+                'success': False,
+                'error': str(fallback_error),
+                'analytics_error': analytics_error
+            }
     
     @staticmethod
-    def _fetch_port_congestion_data(port: Port) -> Dict[str, Any]:
+    def _fetch_port_congestion_data(port: Port, rng: Optional[random.Random] = None) -> Dict[str, Any]:
         """
         Simulate fetching real-time port congestion data.
         In production, this would make actual API calls.
         """
-        # Simulate API call with some realistic variation
-        base_congestion = port.congestion_score if hasattr(port, 'congestion_score') else 5.0
-        base_wait_time = port.avg_wait_time if hasattr(port, 'avg_wait_time') else 3.0
+        return BackgroundJobService._fetch_port_congestion_data_batch([port], rng)[0]
+    
+    @staticmethod
+    def _fetch_port_congestion_data_batch(ports: List[Port],
+                                          rng: Optional[random.Random] = None) -> List[Dict[str, Any]]:
+        """
+        Simulate congestion data for a batch of ports in one pass.
         
-        # Add some realistic variation (±20%)
-        congestion_variation = random.uniform(-0.2, 0.2)
-        wait_time_variation = random.uniform(-0.2, 0.2)
+        Args:
+            ports: Ports to simulate data for
+            rng: Random generator to draw from; a fresh one per batch by
+                default, so concurrent jobs do not share the module-level
+                generator. Pass a seeded instance for reproducible output.
         
-        new_congestion = max(0.0, min(10.0, base_congestion + (base_congestion * congestion_variation)))
-        new_wait_time = max(0.0, base_wait_time + (base_wait_time * wait_time_variation))
+        Returns one dict per port, in the same order as ``ports``.
+        """
+        rng = rng or random.Random()
+        uniform = rng.uniform
+        randint = rng.randint
+        results = []
         
-        # Simulate arrivals/departures based on congestion
-        base_traffic = int(50 * (new_congestion / 10.0))  # Higher congestion = more traffic
-        arrivals = base_traffic + random.randint(-10, 15)
-        departures = base_traffic + random.randint(-15, 10)
+        for port in ports:
+            # Simulate API call with some realistic variation
+            base_congestion = getattr(port, 'congestion_score', None)
+            base_wait_time = getattr(port, 'avg_wait_time', None)
+            if base_congestion is None:
+                base_congestion = 5.0
+            if base_wait_time is None:
+                base_wait_time = 3.0
+            
+            # Add some realistic variation (±20%)
+            new_congestion = max(0.0, min(10.0, base_congestion * (1 + uniform(-0.2, 0.2))))
+            new_wait_time = max(0.0, base_wait_time * (1 + uniform(-0.2, 0.2)))
+            
+            # Simulate arrivals/departures based on congestion
+            base_traffic = int(5 * new_congestion)  # Higher congestion = more traffic
+            
+            results.append({
+                'congestion_score': round(new_congestion, 1),
+                'avg_wait_time': round(new_wait_time, 1),
+                'arrivals': max(0, base_traffic + randint(-10, 15)),
+                'departures': max(0, base_traffic + randint(-15, 10))
+            })
         
-        return {
-            'congestion_score': round(new_congestion, 1),
-            'avg_wait_time': round(new_wait_time, 1),
-            'arrivals': max(0, arrivals),
-            'departures': max(0, departures)
-        }
+        return results
     
     @staticmethod
     def update_safety_events() -> Dict[str, Any]:
@@ -199,14 +441,26 @@ class BackgroundJobService:
         """
         logger.info("Starting vessel positions update job...")
         
+        if BackgroundJobService._vessel_tracking_cls is None:
+            logger.error("Vessel tracking service not available, skipping vessel positions update")
+            return {
+                'job': 'vessel_positions_update',
+                'timestamp': timezone.now().isoformat(),
+                'success': False,
+                'error': 'Vessel tracking service not available'
+            }
+        
         try:
-            from core.services.vessel_tracking import VesselTrackingService
-            
             # Initialize enhanced vessel tracking service
-            tracking_service = VesselTrackingService()
+            tracking_service = BackgroundJobService._vessel_tracking_cls()
             
             # Fetch and update vessels
-            summary = tracking_service.fetch_and_update_vessels(limit=200)
+            limit = BackgroundJobService._vessel_fetch_limit()
+            started = time.monotonic()
+            summary = tracking_service.fetch_and_update_vessels(limit=limit)
+            next_limit = BackgroundJobService._tune_vessel_fetch_limit(
+                limit, summary['processed_count'], time.monotonic() - started
+            )
             
             # Transform summary to match expected format
             job_summary = {
@@ -217,7 +471,9 @@ class BackgroundJobService:
                 'vessels_created': summary['created_count'],
                 'vessels_skipped': summary['skipped_count'],
                 'errors_count': summary['error_count'],
-                'errors': summary['errors'][:5],  # Limit error details
+                'errors': summary['errors'][:REPORTED_ERRORS_LIMIT],  # Limit error details
+                'limit': limit,
+                'next_limit': next_limit,
                 'success': summary['success']
             }
             
@@ -234,10 +490,71 @@ class BackgroundJobService:
                 'error': str(e)
             }
     
+    @staticmethod
+    def _vessel_fetch_limit() -> int:
+        """Current vessel batch size: the tuned value if any, else the configured default."""
+        default = getattr(settings, 'VESSEL_FETCH_LIMIT', 200)
+        return cache.get(VESSEL_FETCH_LIMIT_CACHE_KEY, default)
+    
+    @staticmethod
+    def _tune_vessel_fetch_limit(limit: int, processed: int, elapsed_seconds: float) -> int:
+        """
+        Size the next vessel batch from this run's throughput.
+        
+        Uses the observed processing rate to pick a batch that completes in
+        about VESSEL_FETCH_TARGET_SECONDS, so a backlog is drained faster
+        when the system keeps up and the batch shrinks when it does not.
+        """
+        if processed <= 0 or elapsed_seconds <= 0:
+            return limit
+        
+        target_seconds = getattr(settings, 'VESSEL_FETCH_TARGET_SECONDS', 20)
+        rate = processed / elapsed_seconds
+        next_limit = max(MIN_VESSEL_FETCH_LIMIT, min(MAX_VESSEL_FETCH_LIMIT, int(rate * target_seconds)))
+        cache.set(VESSEL_FETCH_LIMIT_CACHE_KEY, next_limit, None)
+        return next_limit
+    
+    @staticmethod
+    def refresh_ais_positions_cache() -> Dict[str, Any]:
+        """
+        Refresh the cached AIS position feed ahead of its expiry.
+        
+        Schedule this more often than the positions cache TTL (every 45s for
+        the 60s TTL) so API requests never wait on the upstream provider.
+        """
+        try:
+            refresh = AISDataService().refresh_positions_cache()
+            return {
+                'job': 'ais_positions_refresh',
+                'timestamp': timezone.now().isoformat(),
+                'vessels_total': refresh['vessel_count'],
+                'limits': refresh['limits'],
+                'source': refresh['source'],
+                'success': True
+            }
+            
+        except Exception as e:
+            logger.error(f"Critical error in AIS positions refresh: {str(e)}", exc_info=True)
+            return {
+                'job': 'ais_positions_refresh',
+                'timestamp': timezone.now().isoformat(),
+                'success': False,
+                'error': str(e)
+            }
+    
+    @staticmethod
+    def _run_job_in_thread(job) -> Dict[str, Any]:
+        """Run a job in a worker thread, releasing that thread's DB connections afterwards."""
+        close_old_connections()
+        try:
+            return job()
+        finally:
+            connections.close_all()
+    
     @staticmethod
     def run_all_background_jobs() -> Dict[str, Any]:
         """
-        Run all background jobs in sequence.
+        Run all background jobs concurrently.
         """
         logger.info("Starting all background jobs...")
         start_time = timezone.now()
@@ -248,38 +565,33 @@ class BackgroundJobService:
             'total_success': True
         }
         
-        # Run port congestion update
-        try:
-            port_result = BackgroundJobService.update_port_congestion()
-            jobs_summary['jobs']['port_congestion'] = port_result
-            if not port_result.get('success', False):
-                jobs_summary['total_success'] = False
-        except Exception as e:
-            logger.error(f"Port congestion job failed: {str(e)}", exc_info=True)
-            jobs_summary['jobs']['port_congestion'] = {'success': False, 'error': str(e)}
-            jobs_summary['total_success'] = False
-        
-        # Run safety events update
-        try:
-            safety_result = BackgroundJobService.update_safety_events()
-            jobs_summary['jobs']['safety_events'] = safety_result
-            if not safety_result.get('success', False):
-                jobs_summary['total_success'] = False
-        except Exception as e:
-            logger.error(f"Safety events job failed: {str(e)}", exc_info=True)
-            jobs_summary['jobs']['safety_events'] = {'success': False, 'error': str(e)}
-            jobs_summary['total_success'] = False
+        # The jobs share no writes and mostly wait on external APIs and the
+        # database, so run them concurrently. Each worker uses its own DB
+        # connection (up to 3 extra connections while the jobs run). SQLite
+        # allows a single writer at a time, so it keeps running them in turn.
+        jobs = {
+            'port_congestion': BackgroundJobService.update_port_congestion,
+            'safety_events': BackgroundJobService.update_safety_events,
+            'vessel_positions': BackgroundJobService.update_vessel_positions,
+        }
         
-        # Run vessel positions update
-        try:
-            vessel_result = BackgroundJobService.update_vessel_positions()
-            jobs_summary['jobs']['vessel_positions'] = vessel_result
-            if not vessel_result.get('success', False):
-                jobs_summary['total_success'] = False
-        except Exception as e:
-            logger.error(f"Vessel positions job failed: {str(e)}", exc_info=True)
-            jobs_summary['jobs']['vessel_positions'] = {'success': False, 'error': str(e)}
-            jobs_summary['total_success'] = False
+        max_workers = 1 if connections['default'].vendor == 'sqlite' else len(jobs)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                job_name: executor.submit(BackgroundJobService._run_job_in_thread, job)
+                for job_name, job in jobs.items()
+            }
+            
+            for job_name, future in futures.items():
+                try:
+                    job_result = future.result()
+                    jobs_summary['jobs'][job_name] = job_result
+                    if not job_result.get('success', False):
+                        jobs_summary['total_success'] = False
+                except Exception as e:
+                    logger.error(f"{job_name.replace('_', ' ').capitalize()} job failed: {str(e)}", exc_info=True)
+                    jobs_summary['jobs'][job_name] = {'success': False, 'error': str(e)}
+                    jobs_summary['total_success'] = False
         
         end_time = timezone.now()
         jobs_summary['completed_at'] = end_time.isoformat()
@@ -298,93 +610,21 @@ class FallbackDataService:
     def get_fallback_port_data() -> List[Dict[str, Any]]:
         """
         Return fallback port congestion data when API fails.
+        
+        Each call gets fresh dicts, so callers can annotate the records
+        without changing the shared fallback table.
         """
-        return [
-            {
-                'name': 'Port of Dubai',
-                'country': 'UAE',
-                'congestion_score': 6.5,
-                'avg_wait_time': 3.2,
-                'arrivals': 42,
-                'departures': 38
-            },
-            {
-                'name': 'Port of Singapore',
-                'country': 'Singapore',
-                'congestion_score': 8.1,
-                'avg_wait_time': 5.7,
-                'arrivals': 67,
-                'departures': 63
-            },
-            {
-                'name': 'Port of Rotterdam',
-                'country': 'Netherlands',
-                'congestion_score': 4.8,
-                'avg_wait_time': 2.1,
-                'arrivals': 34,
-                'departures': 41
-            },
-            {
-                'name': 'Port of Shanghai',
-                'country': 'China',
-                'congestion_score': 9.2,
-                'avg_wait_time': 7.8,
-                'arrivals': 89,
-                'departures': 82
-            },
-            {
-                'name': 'Port of Los Angeles',
-                'country': 'USA',
-                'congestion_score': 7.3,
-                'avg_wait_time': 4.5,
-                'arrivals': 56,
-                'departures': 52
-            }
-        ]
+        return [dict(port) for port in _FALLBACK_PORTS]
     
     @staticmethod
     def get_fallback_vessel_data() -> List[Dict[str, Any]]:
         """
         Return fallback vessel data when AIS API fails.
+        
+        Like the port data, each call gets fresh dicts.
         """
-        return [
-            {
-                'imo': 'IMO9234567',
-                'mmsi': '123456789',
-                'name': 'Ocean Explorer',
-                'vessel_type': 'Container Ship',
-                'flag': 'Panama',
-                'latitude': 25.2048,
-                'longitude': 55.2708,
-                'speed': 12.5,
-                'heading': 45,
-                'timestamp': timezone.now().isoformat()
-            },
-            {
-                'imo': 'IMO9876543',
-                'mmsi': '234567890',
-                'name': 'Maritime Pioneer',
-                'vessel_type': 'Bulk Carrier',
-                'flag': 'Liberia',
-                'latitude': 26.0667,
-                'longitude': 50.5577,
-                'speed': 8.2,
-                'heading': 180,
-                'timestamp': timezone.now().isoformat()
-            },
-            {
-                'imo': 'IMO9345678',
-                'mmsi': '345678901',
-                'name': 'Gulf Trader',
-                'vessel_type': 'Tanker',
-                'flag': 'Marshall Islands',
-                'latitude': 24.4539,
-                'longitude': 54.3773,
-                'speed': 15.1,
-                'heading': 270,
-                'timestamp': timezone.now().isoformat()
-            }
-        ]
+        timestamp = timezone.now().isoformat()
+        return [{**vessel, 'timestamp': timestamp} for vessel in _FALLBACK_VESSELS_TEMPLATE]
     
     @staticmethod
     def ensure_minimum_port_data():
@@ -394,21 +634,26 @@ class FallbackDataService:
         if Port.objects.count() == 0:
             logger.info("No port data found, creating fallback data...")
             
-            fallback_ports = FallbackDataService.get_fallback_port_data()
+            fallback_ports = _FALLBACK_PORTS
             
-            for port_data in fallback_ports:
-                Port.objects.get_or_create(
-                    name=port_data['name'],
-                    defaults={
-                        'location': f"{port_data['name']} Port Area",
-                        'country': port_data['country'],
-                        'congestion_score': port_data['congestion_score'],
-                        'avg_wait_time': port_data['avg_wait_time'],
-                        'arrivals_count': port_data['arrivals'],
-                        'departures_count': port_data['departures'],
-                        'last_updated': timezone.now(),  # Use the correct field name
-                    }
-                )
+            # The table is empty, so a single bulk insert replaces the
+            # per-row get_or_create round trips.
+            Port.objects.bulk_create(
+                [
+                    Port(
+                        name=port_data['name'],
+                        location=f"{port_data['name']} Port Area",
+                        country=port_data['country'],
+                        congestion_score=port_data['congestion_score'],
+                        avg_wait_time=port_data['avg_wait_time'],
+                        arrivals_count=port_data['arrivals'],
+                        departures_count=port_data['departures'],
+                    )
+                    for port_data in fallback_ports
+                ],
+                ignore_conflicts=True,
+                batch_size=500,
+            )
             
             logger.info(f"Created {len(fallback_ports)} fallback ports")
     
@@ -420,23 +665,29 @@ class FallbackDataService:
         if Vessel.objects.count() == 0:
             logger.info("No vessel data found, creating fallback data...")
             
-            fallback_vessels = FallbackDataService.get_fallback_vessel_data()
+            fallback_vessels = _FALLBACK_VESSELS_TEMPLATE
             
-            for vessel_data in fallback_vessels:
-                Vessel.objects.get_or_create(
-                    imo_number=vessel_data['imo'],
-                    defaults={
-                        'mmsi': vessel_data['mmsi'],
-                        'name': vessel_data['name'],
-                        'vessel_type': vessel_data['vessel_type'],
-                        'flag': vessel_data['flag'],
-                        'cargo_type': 'General',
-                        'operator': 'Unknown Operator',
-                        'last_position_lat': vessel_data['latitude'],
-                        'last_position_lon': vessel_data['longitude'],
-                        'speed': vessel_data['speed'],
-                        'heading': vessel_data['heading'],
-                    }
-                )
+            # The table is empty, so a single bulk insert replaces the
+            # per-row get_or_create round trips.
+            Vessel.objects.bulk_create(
+                [
+                    Vessel(
+                        imo_number=vessel_data['imo'],
+                        mmsi=vessel_data['mmsi'],
+                        name=vessel_data['name'],
+                        vessel_type=vessel_data['vessel_type'],
+                        flag=vessel_data['flag'],
+                        cargo_type='General',
+                        operator='Unknown Operator',
+                        last_position_lat=vessel_data['latitude'],
+                        last_position_lon=vessel_data['longitude'],
+                        speed=vessel_data['speed'],
+                        heading=vessel_data['heading'],
+                    )
+                    for vessel_data in fallback_vessels
+                ],
+                ignore_conflicts=True,
+                batch_size=500,
+            )
             
             logger.info(f"Created {len(fallback_vessels)} fallback vessels")
\ No newline at end of file
@@ -0,0 +1,118 @@
+"""
+Publishes newly created vessel events to a Kafka topic.
+
+One message is produced per event, keyed by vessel id, so downstream
+consumers (email, push, dashboards) can build their own projections without
+polling the notification table. Publishing is enabled when confluent_kafka is
+installed and KAFKA_BOOTSTRAP_SERVERS is configured; otherwise it is a no-op.
+
+Settings:
+- KAFKA_BOOTSTRAP_SERVERS: broker list, e.g. "kafka-1:9092,kafka-2:9092"
+- KAFKA_EVENT_TOPIC: topic name (default: "vessel.events.v1")
+"""
+
+import json
+import logging
+import threading
+from datetime import datetime
+from typing import Any, Dict, List
+
+from django.conf import settings
+
+from core.models import Event
+
+try:
+    from confluent_kafka import Producer
+except ImportError:  # pragma: no cover - Kafka is optional
+    Producer = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_EVENT_TOPIC = 'vessel.events.v1'
+
+# When the producer's local queue is full, serve delivery callbacks for up to
+# this long to make room, then retry the message once.
+PRODUCE_RETRY_POLL_SECONDS = 1.0
+
+# Upper bound on waiting for queued messages to be delivered after a batch,
+# so short-lived processes do not exit with messages still in the queue.
+FLUSH_TIMEOUT_SECONDS = 5.0
+
+_producer = None
+_producer_lock = threading.Lock()
+
+
+def _get_producer():
+    """Return the shared producer, creating it on first use, or None when publishing is disabled."""
+    global _producer
+
+    bootstrap_servers = getattr(settings, 'KAFKA_BOOTSTRAP_SERVERS', None)
+    if Producer is None or not bootstrap_servers:
+        return None
+
+    if _producer is None:
+        with _producer_lock:
+            if _producer is None:
+                _producer = Producer({'bootstrap.servers': bootstrap_servers})
+    return _producer
+
+
+def _event_payload(event: Event) -> Dict[str, Any]:
+    timestamp = event.timestamp if isinstance(event.timestamp, datetime) else None
+    return {
+        'id': event.id,
+        'vessel_id': event.vessel_id,
+        'event_type': event.event_type,
+        'location': event.location,
+        'details': event.details,
+        'timestamp': timestamp.isoformat() if timestamp else None,
+    }
+
+
+def publish_events(events: List[Event]) -> int:
+    """
+    Publish events to the event topic.
+
+    Messages are queued on the producer and then flushed for at most
+    FLUSH_TIMEOUT_SECONDS; a publishing failure is logged and never
+    interrupts the caller.
+
+    Returns:
+        Number of events queued for delivery
+    """
+    if not events:
+        return 0
+
+    producer = _get_producer()
+    if producer is None:
+        return 0
+
+    topic = getattr(settings, 'KAFKA_EVENT_TOPIC', DEFAULT_EVENT_TOPIC)
+    published = 0
+    try:
+        for event in events:
+            if _produce(producer, topic, event):
+                published += 1
+        undelivered = producer.flush(FLUSH_TIMEOUT_SECONDS)
+        if undelivered:
+            logger.warning(f"{undelivered} event message(s) still queued for {topic} after flush")
+    except Exception as e:
+        logger.error(f"Failed to publish events to {topic}: {str(e)}", exc_info=True)
+
+    return published
+
+
+def _produce(producer, topic: str, event: Event) -> bool:
+    """Queue one event, waiting once for queue space if the producer is full."""
+    message = {'key': str(event.vessel_id), 'value': json.dumps(_event_payload(event))}
+    try:
+        producer.produce(topic, **message)
+        return True
+    except BufferError:
+        producer.poll(PRODUCE_RETRY_POLL_SECONDS)
+    try:
+        producer.produce(topic, **message)
+        return True
+    except BufferError:
+        logger.error(f"Producer queue full; dropped event {event.id} for {topic}")
+        return False
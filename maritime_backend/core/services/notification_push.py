@@ -0,0 +1,75 @@
+"""
+Pushes new notifications to connected clients over a Django Channels layer.
+
+Each user with new notifications gets one ``notify`` message on the
+``user_<id>`` group, carrying all of that user's notifications from the
+batch, so clients no longer need to poll the notification list. Pushing is
+enabled when channels is installed and CHANNEL_LAYERS is configured;
+otherwise it is a no-op.
+"""
+
+import logging
+from collections import defaultdict
+from datetime import datetime
+from typing import List
+
+from core.models import Notification
+
+try:
+    from asgiref.sync import async_to_sync
+    from channels.layers import get_channel_layer
+except ImportError:  # pragma: no cover - Channels is optional
+    get_channel_layer = None
+
+logger = logging.getLogger(__name__)
+
+
+def user_group_name(user_id: int) -> str:
+    """Channel group a user's websocket connections join."""
+    return f"user_{user_id}"
+
+
+def push_notifications(notifications: List[Notification]) -> int:
+    """
+    Send notifications to their users' channel groups.
+
+    A failure to reach the channel layer is logged and never interrupts the
+    caller; the notifications remain available from the database.
+
+    Returns:
+        Number of users a message was sent to
+    """
+    if not notifications or get_channel_layer is None:
+        return 0
+
+    channel_layer = get_channel_layer()
+    if channel_layer is None:
+        return 0
+
+    payloads_by_user = defaultdict(list)
+    for notification in notifications:
+        # timestamp is filled in by the database; it is only a datetime here
+        # when the insert returned it.
+        timestamp = notification.timestamp if isinstance(notification.timestamp, datetime) else None
+        payloads_by_user[notification.user_id].append({
+            'id': notification.id,
+            'timestamp': timestamp.isoformat() if timestamp else None,
+            'vessel_id': notification.vessel_id,
+            'event_id': notification.event_id,
+            'message': notification.message,
+            'notification_type': notification.notification_type,
+        })
+
+    group_send = async_to_sync(channel_layer.group_send)
+    users_notified = 0
+    for user_id, payloads in payloads_by_user.items():
+        try:
+            group_send(user_group_name(user_id), {
+                'type': 'notify',
+                'notifications': payloads,
+            })
+            users_notified += 1
+        except Exception as e:
+            logger.error(f"Failed to push notifications to user {user_id}: {str(e)}", exc_info=True)
+
+    return users_notified
@@ -8,15 +8,125 @@ Handles automatic notification generation for:
 """
 
 import logging
-from typing import List, Dict, Any, Optional
+import math
+from collections import defaultdict
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import List, Dict, Any, Optional, Tuple
+from django.core.cache import cache
 from django.utils import timezone
-from django.db.models import Q
-from django.db import transaction
+from django.db.models import Prefetch, Q, Value, prefetch_related_objects
+from django.db.models.functions import ASin, Cos, Power, Radians, Sin, Sqrt
+from django.db import close_old_connections, connections, transaction
 
 from core.models import User, Vessel, Event, Notification, Port, VesselSubscription
+from core.services.event_stream import publish_events
+from core.services.notification_push import push_notifications
 
 logger = logging.getLogger(__name__)
 
+# Event types that are also delivered to the vessel's subscribers.
+SUBSCRIBER_EVENT_TYPES = ('STORM_ENTRY', 'PIRACY_RISK', 'HIGH_CONGESTION')
+
+# Subscription preference flag matching each event type. Subscribers on
+# ALL_EVENTS are notified regardless of their flags.
+SUBSCRIPTION_EVENT_FLAGS = {
+    'STORM_ENTRY': 'notify_storm_zones',
+    'PIRACY_RISK': 'notify_piracy_zones',
+    'HIGH_CONGESTION': 'notify_congestion',
+    'POSITION_UPDATE': 'notify_position_updates',
+}
+
+DEFAULT_NOTIFY_ROLES = ('ADMIN', 'OPERATOR')
+
+# Notification message templates by event type. Only the template for the
+# event at hand is formatted.
+MESSAGE_TEMPLATES = {
+    'HIGH_CONGESTION': "🚨 {vessel} is approaching a high congestion port: {location}",
+    'STORM_ENTRY': "⛈️ {vessel} has entered a storm zone at {location}",
+    'PIRACY_RISK': "🏴‍☠️ {vessel} has entered a piracy risk zone at {location}",
+    'WEATHER_ALERT': "🌪️ Weather alert for {vessel} at {location}",
+    'INCIDENT': "⚠️ Incident reported for {vessel} at {location}",
+}
+DEFAULT_MESSAGE_TEMPLATE = "📢 {event_type} alert for {vessel}: {details}"
+
+SUBSCRIPTION_MESSAGE_TEMPLATES = {
+    'STORM_ENTRY': "🌩️ Your subscribed vessel {vessel} has entered a storm zone at {location}. Monitor weather conditions closely.",
+    'PIRACY_RISK': "🚨 Your subscribed vessel {vessel} has entered a piracy risk zone at {location}. Enhanced security measures recommended.",
+    'HIGH_CONGESTION': "🚢 Your subscribed vessel {vessel} is approaching a high congestion port: {location}. Expect potential delays.",
+    'POSITION_UPDATE': "📍 Position update for your subscribed vessel {vessel} at {location}.",
+}
+DEFAULT_SUBSCRIPTION_MESSAGE_TEMPLATE = "📢 Update for your subscribed vessel {vessel}: {details}"
+
+# Rows per INSERT when writing notifications and events, keeping statements
+# well under the database's bind-parameter limit on large fan-outs.
+NOTIFICATION_BULK_BATCH_SIZE = 500
+EVENT_BULK_BATCH_SIZE = 500
+
+# Batches larger than this skip bulk_create's per-object preparation and are
+# written with a raw multi-row INSERT ... RETURNING, a page at a time.
+RAW_EVENT_INSERT_THRESHOLD = 5000
+RAW_EVENT_INSERT_PAGE_SIZE = 1000
+RAW_EVENT_INSERT_FIELDS = ('vessel', 'event_type', 'location', 'port', 'details', 'timestamp')
+
+# Rows fetched per round-trip when streaming candidate vessels.
+VESSEL_SCAN_CHUNK_SIZE = 2000
+
+# Role -> user ids lookups are cached briefly; the generation key lets a
+# user save/delete drop every role set at once.
+ROLE_USER_IDS_CACHE_TTL = 30  # seconds
+ROLE_USER_IDS_GENERATION_KEY = 'notifications:role_user_ids:generation'
+
+EARTH_RADIUS_KM = 6371.0
+KM_PER_DEGREE = 111.0  # 1 degree of latitude ≈ 111 km
+
+
+def _role_user_ids_generation() -> int:
+    return cache.get_or_set(ROLE_USER_IDS_GENERATION_KEY, 0, None)
+
+
+def user_ids_for_roles(roles: Tuple[str, ...]) -> Tuple[int, ...]:
+    """
+    Ids of the users holding any of the given roles.
+    
+    Cached per role set for ROLE_USER_IDS_CACHE_TTL seconds, so role changes
+    and deleted users made in other processes are picked up within that
+    window even when no signal reaches this one.
+    """
+    cache_key = f"notifications:role_user_ids:{_role_user_ids_generation()}:{','.join(roles)}"
+    user_ids = cache.get(cache_key)
+    if user_ids is None:
+        user_ids = tuple(User.objects.filter(role__in=roles).values_list('id', flat=True))
+        cache.set(cache_key, user_ids, ROLE_USER_IDS_CACHE_TTL)
+    return user_ids
+
+
+def invalidate_role_user_ids() -> None:
+    """Drop every cached role -> user ids lookup (e.g. after a user is saved or deleted)."""
+    try:
+        cache.incr(ROLE_USER_IDS_GENERATION_KEY)
+    except ValueError:
+        cache.set(ROLE_USER_IDS_GENERATION_KEY, 1, None)
+
+
+def _haversine_km(center_lat: float, center_lon: float):
+    """
+    Database expression for the great-circle distance in km between a
+    vessel's last position and the given point.
+    """
+    lat = Radians('last_position_lat')
+    lon = Radians('last_position_lon')
+    center_lat_rad = math.radians(center_lat)
+    center_lon_rad = math.radians(center_lon)
+    
+    a = (
+        Power(Sin((lat - Value(center_lat_rad)) / 2), 2)
+        + Value(math.cos(center_lat_rad)) * Cos(lat)
+        * Power(Sin((lon - Value(center_lon_rad)) / 2), 2)
+    )
+    return Value(2 * EARTH_RADIUS_KM) * ASin(Sqrt(a))
+
 
 class NotificationService:
     """
@@ -61,43 +171,110 @@ class NotificationService:
         Returns:
             Number of notifications created
         """
-        notifications_created = 0
+        return NotificationService.notify_users_for_events([event], user_roles, specific_users)
+    
+    @staticmethod
+    def notify_users_for_events(
+        events: List[Event],
+        user_roles: List[str] = None,
+        specific_users: List[User] = None
+    ) -> int:
+        """
+        Create notifications for a batch of events.
+        
+        Role users and vessel subscriptions are loaded once for the whole
+        batch and every notification is written in a single bulk insert.
+        
+        Args:
+            events: The events that triggered the notifications
+            user_roles: List of user roles to notify (default: ['ADMIN', 'OPERATOR'])
+            specific_users: Specific users to notify (overrides role-based selection)
+        
+        Returns:
+            Number of notifications created
+        """
+        if not events:
+            return 0
+        
+        # The messages name each event's vessel; load any vessels the events
+        # do not already carry in one query instead of one per event
+        prefetch_related_objects(events, Prefetch('vessel', queryset=Vessel.objects.only('id', 'name')))
         
         # First, notify subscribed users for vessel-specific events
-        if event.event_type in ['STORM_ENTRY', 'PIRACY_RISK', 'HIGH_CONGESTION']:
-            notifications_created += NotificationService._notify_subscribed_users(event)
+        notifications = NotificationService._build_subscription_notifications(events)
         
         # Then, notify users based on roles (existing functionality)
         if specific_users:
-            users = specific_users
+            user_ids = [user.id for user in specific_users]
         else:
             if user_roles is None:
-                user_roles = ['ADMIN', 'OPERATOR']
-            users = User.objects.filter(role__in=user_roles)
-        
-        if users.exists():
-            # Generate appropriate message based on event type
-            message = NotificationService._generate_message(event)
-            
-            # Bulk create notifications for role-based users
-            role_notifications = [
-                Notification(
-                    user=user,
-                    vessel=event.vessel,
-                    event=event,
-                    message=message,
-                    notification_type='EVENT_ALERT',
-                    is_read=False
+                user_roles = DEFAULT_NOTIFY_ROLES
+            user_ids = user_ids_for_roles(tuple(sorted(user_roles)))
+        
+        if user_ids:
+            for event in events:
+                # Generate appropriate message based on event type
+                message = NotificationService._generate_message(event)
+                notifications.extend(
+                    Notification(
+                        user_id=user_id,
+                        vessel_id=event.vessel_id,
+                        event=event,
+                        message=message,
+                        notification_type='EVENT_ALERT',
+                        is_read=False
+                    )
+                    for user_id in user_ids
                 )
-                for user in users
-            ]
-            
-            created_notifications = Notification.objects.bulk_create(role_notifications)
-            notifications_created += len(created_notifications)
         
-        logger.info(f"Created {notifications_created} notifications for event {event.id}")
+        # A user can be both a subscriber and a role user for the same event;
+        # keep one notification per (user, event), preferring the
+        # subscription message built first
+        unique_notifications = {}
+        for notification in notifications:
+            unique_notifications.setdefault((notification.user_id, notification.event_id), notification)
+        
+        created_notifications = NotificationService.insert_notifications(list(unique_notifications.values()))
+        notifications_created = len(created_notifications)
+        # Push to connected clients only once the rows are committed
+        transaction.on_commit(partial(push_notifications, created_notifications))
+        
+        logger.info(f"Created {notifications_created} notifications for {len(events)} event(s)")
         return notifications_created
     
+    @staticmethod
+    def insert_notifications(notifications: List[Notification]) -> List[Notification]:
+        """
+        Write new notifications, skipping any (user, event) pair that already
+        has one.
+        
+        The unique constraint on (user, event) only exists off PostgreSQL,
+        where core_notification is not partitioned, so pairs are also
+        checked here. The events are locked first, which makes concurrent
+        runs notifying the same events wait for each other's inserts.
+        
+        No ignore_conflicts: pairs are already filtered under the lock, and
+        a plain bulk_create sets the primary keys of the rows it writes.
+        
+        Returns:
+            The notifications that were written, with primary keys set
+        """
+        event_ids = {notification.event_id for notification in notifications if notification.event_id is not None}
+        with transaction.atomic():
+            if event_ids:
+                list(Event.objects.select_for_update().filter(id__in=event_ids).values_list('id', flat=True))
+                existing_pairs = set(
+                    Notification.objects.filter(event_id__in=event_ids).values_list('user_id', 'event_id')
+                )
+                notifications = [
+                    notification for notification in notifications
+                    if (notification.user_id, notification.event_id) not in existing_pairs
+                ]
+            return Notification.objects.bulk_create(
+                notifications,
+                batch_size=NOTIFICATION_BULK_BATCH_SIZE,
+            )
+    
     @staticmethod
     def _notify_subscribed_users(event: Event) -> int:
         """
@@ -109,55 +286,70 @@ class NotificationService:
         Returns:
             Number of subscription-based notifications created
         """
-        # Get active subscriptions for this vessel
-        subscriptions = VesselSubscription.objects.filter(
-            vessel=event.vessel,
-            is_active=True
-        )
-        
-        # Filter subscriptions based on event type and user preferences
-        relevant_subscriptions = []
-        for subscription in subscriptions:
-            should_notify = False
-            
-            if event.event_type == 'STORM_ENTRY' and subscription.notify_storm_zones:
-                should_notify = True
-            elif event.event_type == 'PIRACY_RISK' and subscription.notify_piracy_zones:
-                should_notify = True
-            elif event.event_type == 'HIGH_CONGESTION' and subscription.notify_congestion:
-                should_notify = True
-            elif event.event_type == 'POSITION_UPDATE' and subscription.notify_position_updates:
-                should_notify = True
-            elif subscription.subscription_type == 'ALL_EVENTS':
-                should_notify = True
-            
-            if should_notify:
-                relevant_subscriptions.append(subscription)
-        
-        if not relevant_subscriptions:
+        subscription_notifications = NotificationService._build_subscription_notifications([event])
+        if not subscription_notifications:
             return 0
         
-        # Generate personalized message
-        message = NotificationService._generate_subscription_message(event)
-        
-        # Create notifications for subscribed users
-        subscription_notifications = [
-            Notification(
-                user=subscription.user,
-                vessel=event.vessel,
-                event=event,
-                message=message,
-                notification_type='EVENT_ALERT',
-                is_read=False
-            )
-            for subscription in relevant_subscriptions
-        ]
-        
-        created_notifications = Notification.objects.bulk_create(subscription_notifications)
+        created_notifications = NotificationService.insert_notifications(subscription_notifications)
+        transaction.on_commit(partial(push_notifications, created_notifications))
         logger.info(f"Created {len(created_notifications)} subscription-based notifications for event {event.id}")
         
         return len(created_notifications)
     
+    @staticmethod
+    def _build_subscription_notifications(events: List[Event]) -> List[Notification]:
+        """
+        Build (unsaved) notifications for the subscribers of each event's vessel.
+        
+        Active subscriptions for every vessel in the batch are fetched in one
+        query and matched to each event by subscription type and the
+        preference flag for the event type.
+        """
+        events = [event for event in events if event.event_type in SUBSCRIBER_EVENT_TYPES]
+        if not events:
+            return []
+        
+        flags = {SUBSCRIPTION_EVENT_FLAGS[event.event_type] for event in events}
+        subscription_filter = Q(subscription_type='ALL_EVENTS')
+        for flag in flags:
+            subscription_filter |= Q(**{flag: True})
+        
+        subscriptions_by_vessel = defaultdict(list)
+        subscriptions = VesselSubscription.objects.filter(
+            subscription_filter,
+            vessel_id__in={event.vessel_id for event in events},
+            is_active=True,
+        ).only('vessel_id', 'user_id', 'subscription_type', *flags)
+        for subscription in subscriptions:
+            subscriptions_by_vessel[subscription.vessel_id].append(subscription)
+        
+        notifications = []
+        for event in events:
+            flag = SUBSCRIPTION_EVENT_FLAGS[event.event_type]
+            user_ids = [
+                subscription.user_id
+                for subscription in subscriptions_by_vessel.get(event.vessel_id, ())
+                if subscription.subscription_type == 'ALL_EVENTS' or getattr(subscription, flag)
+            ]
+            if not user_ids:
+                continue
+            
+            # Generate personalized message
+            message = NotificationService._generate_subscription_message(event)
+            notifications.extend(
+                Notification(
+                    user_id=user_id,
+                    vessel_id=event.vessel_id,
+                    event=event,
+                    message=message,
+                    notification_type='EVENT_ALERT',
+                    is_read=False
+                )
+                for user_id in user_ids
+            )
+        
+        return notifications
+    
     @staticmethod
     def _generate_subscription_message(event: Event) -> str:
         """
@@ -169,18 +361,14 @@ class NotificationService:
         Returns:
             Personalized notification message
         """
-        vessel_name = event.vessel.name
-        
-        subscription_message_templates = {
-            'STORM_ENTRY': f"🌩️ Your subscribed vessel {vessel_name} has entered a storm zone at {event.location}. Monitor weather conditions closely.",
-            'PIRACY_RISK': f"🚨 Your subscribed vessel {vessel_name} has entered a piracy risk zone at {event.location}. Enhanced security measures recommended.",
-            'HIGH_CONGESTION': f"🚢 Your subscribed vessel {vessel_name} is approaching a high congestion port: {event.location}. Expect potential delays.",
-            'POSITION_UPDATE': f"📍 Position update for your subscribed vessel {vessel_name} at {event.location}.",
-        }
-        
-        return subscription_message_templates.get(
+        template = SUBSCRIPTION_MESSAGE_TEMPLATES.get(
             event.event_type,
-            f"📢 Update for your subscribed vessel {vessel_name}: {event.details}"
+            DEFAULT_SUBSCRIPTION_MESSAGE_TEMPLATE
+        )
+        return template.format(
+            vessel=event.vessel.name,
+            location=event.location,
+            details=event.details
         )
     
     @staticmethod
@@ -188,21 +376,14 @@ class NotificationService:
         """
         Generate appropriate notification message based on event type.
         """
-        vessel_name = event.vessel.name
-        event_type = event.get_event_type_display()
-        
-        message_templates = {
-            'HIGH_CONGESTION': f"🚨 {vessel_name} is approaching a high congestion port: {event.location}",
-            'STORM_ENTRY': f"⛈️ {vessel_name} has entered a storm zone at {event.location}",
-            'PIRACY_RISK': f"🏴‍☠️ {vessel_name} has entered a piracy risk zone at {event.location}",
-            'WEATHER_ALERT': f"🌪️ Weather alert for {vessel_name} at {event.location}",
-            'INCIDENT': f"⚠️ Incident reported for {vessel_name} at {event.location}",
-        }
-        
-        return message_templates.get(
-            event.event_type,
-            f"📢 {event_type} alert for {vessel_name}: {event.details}"
-        )
+        template = MESSAGE_TEMPLATES.get(event.event_type)
+        if template is None:
+            return DEFAULT_MESSAGE_TEMPLATE.format(
+                event_type=event.get_event_type_display(),
+                vessel=event.vessel.name,
+                details=event.details
+            )
+        return template.format(vessel=event.vessel.name, location=event.location)
 
 
 class EventTriggerService:
@@ -219,17 +400,19 @@ class EventTriggerService:
             Summary of events and notifications created
         """
         high_congestion_threshold = 7.0  # Configurable threshold
+        recent_cutoff = timezone.now() - timezone.timedelta(hours=6)
         
         # Find ports with high congestion
-        congested_ports = Port.objects.filter(
-            congestion_score__gte=high_congestion_threshold
+        congested_ports = list(
+            Port.objects.filter(
+                congestion_score__gte=high_congestion_threshold
+            ).only('id', 'name', 'country', 'congestion_score', 'avg_wait_time')
         )
         
-        events_created = 0
-        notifications_created = 0
+        created_events = []
         
-        for port in congested_ports:
-            # Find vessels that might be approaching this port
+        if congested_ports:
+            # Find vessels that might be approaching these ports
             # This is a simplified approach - in reality you'd use more sophisticated logic
             nearby_vessels = Vessel.objects.filter(
                 last_position_lat__isnull=False,
@@ -237,33 +420,50 @@ class EventTriggerService:
                 # Add proximity logic here based on your requirements
             )
             
-            for vessel in nearby_vessels:
-                # Check if we already have a recent congestion event for this vessel/port
-                recent_event = Event.objects.filter(
-                    vessel=vessel,
-                    event_type='HIGH_CONGESTION',
-                    location__icontains=port.name,
-                    timestamp__gte=timezone.now() - timezone.timedelta(hours=6)
-                ).exists()
-                
-                if not recent_event:
-                    # Create high congestion event
-                    event = Event.objects.create(
-                        vessel=vessel,
-                        event_type='HIGH_CONGESTION',
-                        location=f"{port.name}, {port.country}",
-                        details=f"Port congestion score: {port.congestion_score:.1f}, "
-                               f"Average wait time: {port.avg_wait_time:.1f} hours"
-                    )
-                    events_created += 1
-                    
-                    # Create notifications
-                    notifications_count = NotificationService.notify_users_for_event(event)
-                    notifications_created += notifications_count
+            # Vessels that already have a recent congestion event, per port
+            recently_notified = defaultdict(set)
+            for vessel_id, port_id in Event.objects.filter(
+                vessel__in=nearby_vessels,
+                event_type='HIGH_CONGESTION',
+                port__in=congested_ports,
+                timestamp__gte=recent_cutoff
+            ).values_list('vessel_id', 'port_id'):
+                recently_notified[port_id].add(vessel_id)
+            
+            # The candidate vessels are the same for every port, so stream
+            # them once and pair each with every congested port; only the
+            # columns the event and its notification messages use are loaded
+            candidate_vessels = nearby_vessels.only(
+                'id', 'name', 'last_position_lat', 'last_position_lon'
+            ).iterator(chunk_size=VESSEL_SCAN_CHUNK_SIZE)
+            
+            for vessel in candidate_vessels:
+                for port in congested_ports:
+                    if vessel.id not in recently_notified[port.id]:
+                        # Create high congestion event
+                        created_events.append(Event(
+                            vessel=vessel,
+                            event_type='HIGH_CONGESTION',
+                            location=f"{port.name}, {port.country}",
+                            port=port,
+                            details=f"Port congestion score: {port.congestion_score:.1f}, "
+                                   f"Average wait time: {port.avg_wait_time:.1f} hours"
+                        ))
+        
+        EventTriggerService.insert_events(created_events)
+        # Publish only once the events are committed
+        transaction.on_commit(partial(publish_events, created_events))
+        if created_events:
+            # Bulk inserts send no post_save, so drop the dashboard cache here
+            from core.services.port_analytics import invalidate_port_dashboard
+            transaction.on_commit(invalidate_port_dashboard)
+        
+        # Create notifications for every new event at once
+        notifications_created = NotificationService.notify_users_for_events(created_events)
         
         return {
-            'congested_ports': congested_ports.count(),
-            'events_created': events_created,
+            'congested_ports': len(congested_ports),
+            'events_created': len(created_events),
             'notifications_created': notifications_created
         }
     
@@ -278,48 +478,56 @@ class EventTriggerService:
         Returns:
             Summary of events and notifications created
         """
-        events_created = 0
-        notifications_created = 0
+        created_events = []
+        # Vessels given an event by an earlier zone in this run; the events
+        # are only written once every zone has been checked.
+        pending_vessel_ids = set()
+        recent_cutoff = timezone.now() - timezone.timedelta(hours=3)
         
         for zone in storm_zones:
             # Find vessels in this storm zone
             # This is simplified - you'd use proper geospatial queries in production
-            vessels_in_zone = EventTriggerService._find_vessels_in_zone(
+            vessels_in_zone = EventTriggerService.find_vessels_in_zone(
                 zone.get('coordinates', []),
                 zone.get('center_lat'),
                 zone.get('center_lon'),
                 zone.get('radius', 50)  # km
             )
             
-            for vessel in vessels_in_zone:
-                # Check if we already have a recent storm event for this vessel
-                recent_event = Event.objects.filter(
-                    vessel=vessel,
+            # Vessels that already have a recent storm event
+            recently_notified = set(
+                Event.objects.filter(
+                    vessel_id__in=[vessel.id for vessel in vessels_in_zone],
                     event_type='STORM_ENTRY',
-                    timestamp__gte=timezone.now() - timezone.timedelta(hours=3)
-                ).exists()
-                
-                if not recent_event:
-                    event = Event.objects.create(
+                    timestamp__gte=recent_cutoff
+                ).values_list('vessel_id', flat=True)
+            )
+            
+            for vessel in vessels_in_zone:
+                if vessel.id not in recently_notified and vessel.id not in pending_vessel_ids:
+                    created_events.append(Event(
                         vessel=vessel,
                         event_type='STORM_ENTRY',
                         location=f"Storm Zone - Lat: {vessel.last_position_lat:.3f}, "
                                f"Lon: {vessel.last_position_lon:.3f}",
                         details=f"Vessel entered storm zone. Severity: {zone.get('severity', 'Unknown')}, "
                                f"Wind speed: {zone.get('wind_speed', 'Unknown')} km/h"
-                    )
-                    events_created += 1
-                    
-                    # Create notifications with higher priority for storm events
-                    notifications_count = NotificationService.notify_users_for_event(
-                        event, 
-                        user_roles=['ADMIN', 'OPERATOR', 'ANALYST']
-                    )
-                    notifications_created += notifications_count
+                    ))
+                    pending_vessel_ids.add(vessel.id)
+        
+        EventTriggerService.insert_events(created_events)
+        # Publish only once the events are committed
+        transaction.on_commit(partial(publish_events, created_events))
+        
+        # Create notifications with higher priority for storm events
+        notifications_created = NotificationService.notify_users_for_events(
+            created_events,
+            user_roles=['ADMIN', 'OPERATOR', 'ANALYST']
+        )
         
         return {
             'storm_zones_checked': len(storm_zones),
-            'events_created': events_created,
+            'events_created': len(created_events),
             'notifications_created': notifications_created
         }
     
@@ -334,49 +542,57 @@ class EventTriggerService:
         Returns:
             Summary of events and notifications created
         """
-        events_created = 0
-        notifications_created = 0
+        created_events = []
+        # Vessels given an event by an earlier zone in this run; the events
+        # are only written once every zone has been checked.
+        pending_vessel_ids = set()
+        recent_cutoff = timezone.now() - timezone.timedelta(hours=6)
         
         for zone in piracy_zones:
             # Find vessels in this piracy risk zone
-            vessels_in_zone = EventTriggerService._find_vessels_in_zone(
+            vessels_in_zone = EventTriggerService.find_vessels_in_zone(
                 zone.get('coordinates', []),
                 zone.get('center_lat'),
                 zone.get('center_lon'),
                 zone.get('radius', 100)  # km
             )
             
-            for vessel in vessels_in_zone:
-                # Check if we already have a recent piracy risk event for this vessel
-                recent_event = Event.objects.filter(
-                    vessel=vessel,
+            # Vessels that already have a recent piracy risk event
+            recently_notified = set(
+                Event.objects.filter(
+                    vessel_id__in=[vessel.id for vessel in vessels_in_zone],
                     event_type='PIRACY_RISK',
-                    timestamp__gte=timezone.now() - timezone.timedelta(hours=6)
-                ).exists()
-                
-                if not recent_event:
-                    event = Event.objects.create(
+                    timestamp__gte=recent_cutoff
+                ).values_list('vessel_id', flat=True)
+            )
+            
+            for vessel in vessels_in_zone:
+                if vessel.id not in recently_notified and vessel.id not in pending_vessel_ids:
+                    created_events.append(Event(
                         vessel=vessel,
                         event_type='PIRACY_RISK',
                         location=f"Piracy Risk Zone - Lat: {vessel.last_position_lat:.3f}, "
                                f"Lon: {vessel.last_position_lon:.3f}",
                         details=f"Vessel entered piracy risk zone. Risk level: {zone.get('risk_level', 'Unknown')}, "
                                f"Last incident: {zone.get('last_incident', 'Unknown')}"
-                    )
-                    events_created += 1
-                    
-                    # Create notifications for piracy risk
-                    notifications_count = NotificationService.notify_users_for_event(event)
-                    notifications_created += notifications_count
+                    ))
+                    pending_vessel_ids.add(vessel.id)
+        
+        EventTriggerService.insert_events(created_events)
+        # Publish only once the events are committed
+        transaction.on_commit(partial(publish_events, created_events))
+        
+        # Create notifications for piracy risk
+        notifications_created = NotificationService.notify_users_for_events(created_events)
         
         return {
             'piracy_zones_checked': len(piracy_zones),
-            'events_created': events_created,
+            'events_created': len(created_events),
             'notifications_created': notifications_created
         }
     
     @staticmethod
-    def _find_vessels_in_zone(
+    def find_vessels_in_zone(
         coordinates: List[List[float]], 
         center_lat: Optional[float], 
         center_lon: Optional[float], 
@@ -385,23 +601,100 @@ class EventTriggerService:
         """
         Find vessels within a specified zone.
         
-        This is a simplified implementation using bounding box.
-        In production, you'd use proper geospatial queries.
+        The bounding box around the zone keeps the lat/lon range filters
+        index-friendly; the great-circle distance is then computed in the
+        same query so vessels in the corners of the box are excluded.
         """
         if center_lat is None or center_lon is None:
             return []
         
-        # Convert radius from km to approximate degrees (rough approximation)
-        radius_deg = radius_km / 111.0  # 1 degree ≈ 111 km
-        
-        return list(Vessel.objects.filter(
-            last_position_lat__isnull=False,
-            last_position_lon__isnull=False,
-            last_position_lat__gte=center_lat - radius_deg,
-            last_position_lat__lte=center_lat + radius_deg,
-            last_position_lon__gte=center_lon - radius_deg,
-            last_position_lon__lte=center_lon + radius_deg,
-        ))
+        # Convert radius from km to degrees; a degree of longitude shrinks
+        # with latitude, so widen the longitude range to still cover the circle
+        lat_delta = radius_km / KM_PER_DEGREE
+        lon_delta = lat_delta / max(math.cos(math.radians(center_lat)), 0.01)
+        
+        return list(
+            Vessel.objects.filter(
+                last_position_lat__isnull=False,
+                last_position_lon__isnull=False,
+                last_position_lat__gte=center_lat - lat_delta,
+                last_position_lat__lte=center_lat + lat_delta,
+                last_position_lon__gte=center_lon - lon_delta,
+                last_position_lon__lte=center_lon + lon_delta,
+            )
+            .annotate(distance_km=_haversine_km(center_lat, center_lon))
+            .filter(distance_km__lte=radius_km)
+            # Only the columns the zone checks use for events and messages
+            .only('id', 'name', 'last_position_lat', 'last_position_lon')
+            # Skip the default ordering by name so the box can be read
+            # straight off vessel_pos_idx without a sort on an unindexed column
+            .order_by('id')
+        )
+    
+    @staticmethod
+    def insert_events(events: List[Event]) -> None:
+        """
+        Write new events, filling in their primary keys.
+        
+        Shared by every event producer (zone checks, port analytics, NOAA
+        safety alerts) so large batches all take the raw INSERT path.
+        """
+        connection = connections[Event.objects.db]
+        if (
+            len(events) <= RAW_EVENT_INSERT_THRESHOLD
+            or not connection.features.can_return_rows_from_bulk_insert
+        ):
+            Event.objects.bulk_create(events, batch_size=EVENT_BULK_BATCH_SIZE)
+            return
+        EventTriggerService._bulk_insert_events_raw(events, connection)
+    
+    @staticmethod
+    def _bulk_insert_events_raw(events: List[Event], connection) -> None:
+        """
+        Insert events with a raw multi-row INSERT ... RETURNING per page.
+        
+        Values are still prepared by the model fields (choice codes,
+        datetimes), but the per-object work bulk_create does for every row
+        is skipped. Events without a timestamp get the time of the insert.
+        """
+        fields = [Event._meta.get_field(name) for name in RAW_EVENT_INSERT_FIELDS]
+        quote_name = connection.ops.quote_name
+        columns = ', '.join(quote_name(field.column) for field in fields)
+        row_placeholder = '(' + ', '.join(['%s'] * len(fields)) + ')'
+        sql_prefix = f"INSERT INTO {quote_name(Event._meta.db_table)} ({columns}) VALUES "
+        sql_suffix = f" RETURNING {quote_name(Event._meta.pk.column)}"
+        now = timezone.now()
+        
+        with connection.cursor() as cursor:
+            for start in range(0, len(events), RAW_EVENT_INSERT_PAGE_SIZE):
+                page = events[start:start + RAW_EVENT_INSERT_PAGE_SIZE]
+                params = []
+                for event in page:
+                    if not isinstance(event.timestamp, datetime):
+                        event.timestamp = now
+                    params.extend(
+                        field.get_db_prep_save(getattr(event, field.attname), connection)
+                        for field in fields
+                    )
+                
+                cursor.execute(
+                    sql_prefix + ', '.join([row_placeholder] * len(page)) + sql_suffix,
+                    params,
+                )
+                for event, (pk,) in zip(page, cursor.fetchall()):
+                    event.pk = pk
+                    event._state.adding = False
+                    event._state.db = connection.alias
+
+
+def _run_check_in_thread(check, *args) -> Dict[str, Any]:
+    """Run an event check in a worker thread, releasing that thread's DB connections afterwards."""
+    close_old_connections()
+    try:
+        with transaction.atomic():
+            return check(*args)
+    finally:
+        connections.close_all()
 
 
 def run_all_event_checks() -> Dict[str, Any]:
@@ -410,6 +703,7 @@ def run_all_event_checks() -> Dict[str, Any]:
     This function can be called by a scheduled task or API endpoint.
     """
     logger.info("Starting comprehensive event checks...")
+    invalidate_role_user_ids()
     
     # Sample data for storm and piracy zones (in production, this would come from external APIs)
     sample_storm_zones = [
@@ -434,15 +728,34 @@ def run_all_event_checks() -> Dict[str, Any]:
         }
     ]
     
-    with transaction.atomic():
-        # Check port congestion
-        congestion_summary = EventTriggerService.check_port_congestion()
-        
-        # Check storm zones
-        storm_summary = EventTriggerService.check_storm_zones(sample_storm_zones)
-        
-        # Check piracy zones
-        piracy_summary = EventTriggerService.check_piracy_zones(sample_piracy_zones)
+    checks = {
+        'port_congestion': (EventTriggerService.check_port_congestion, ()),
+        'storm_zones': (EventTriggerService.check_storm_zones, (sample_storm_zones,)),
+        'piracy_zones': (EventTriggerService.check_piracy_zones, (sample_piracy_zones,)),
+    }
+    
+    # The checks write disjoint events, so each runs in its own transaction
+    # and, where the database allows concurrent writers, in its own thread
+    # with its own connection. SQLite allows a single writer at a time, and
+    # a caller's open transaction must see every write, so those cases run
+    # the checks in turn on the current connection.
+    connection = connections['default']
+    if connection.vendor == 'sqlite' or connection.in_atomic_block:
+        summaries = {}
+        for check_name, (check, args) in checks.items():
+            with transaction.atomic():
+                summaries[check_name] = check(*args)
+    else:
+        with ThreadPoolExecutor(max_workers=len(checks)) as executor:
+            futures = {
+                check_name: executor.submit(_run_check_in_thread, check, *args)
+                for check_name, (check, args) in checks.items()
+            }
+            summaries = {check_name: future.result() for check_name, future in futures.items()}
+    
+    congestion_summary = summaries['port_congestion']
+    storm_summary = summaries['storm_zones']
+    piracy_summary = summaries['piracy_zones']
     
     total_summary = {
         'timestamp': timezone.now().isoformat(),
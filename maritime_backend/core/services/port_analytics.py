@@ -8,23 +8,187 @@ Integrates UNCTAD-style port trade statistics and provides:
 - Performance metrics calculation
 """
 
+import json
 import logging
 import random
+from bisect import bisect_right
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
 from datetime import datetime, timedelta
 from typing import Dict, Any, Iterable, List, Optional, Tuple
+from asgiref.sync import sync_to_async
 from django.conf import settings
+from django.core.cache import cache
 from django.utils import timezone
-from django.db import transaction
-from django.db.models import Avg, Count, Q, F
+from django.db import connections, transaction
+from django.db.models import Avg, Count, Q, F, Sum
 from statistics import mean, median
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+try:
+    import ijson
+except ImportError:  # pragma: no cover - optional streaming parser
+    ijson = None
 
 from core.models import Port, Vessel, Event, Voyage
-from core.services.notification_service import NotificationService
+from core.services.event_stream import publish_events
+from core.services.notification_service import EventTriggerService
 
 logger = logging.getLogger(__name__)
 
+# Port columns written by an analytics refresh. last_updated is stamped in
+# the same UPDATE so the SQLite touch trigger has nothing left to do.
+PORT_ANALYTICS_FIELDS = [
+    'congestion_score', 'avg_wait_time', 'arrivals_count', 'departures_count',
+    'unlocode', 'latitude', 'longitude', 'last_updated',
+]
+PORT_BULK_BATCH_SIZE = 500
+
+# Port columns the dashboard reads
+DASHBOARD_PORT_FIELDS = (
+    'name', 'country', 'congestion_score', 'avg_wait_time', 'arrivals_count', 'departures_count',
+)
+
+# Congestion levels in ascending order; each starts at its threshold score
+CONGESTION_LEVELS = ('low', 'moderate', 'high', 'critical')
+
+# Dashboard payload cache; dropped whenever ports or congestion events change
+PORT_DASHBOARD_CACHE_KEY = 'port_dashboard:v1'
+PORT_DASHBOARD_CACHE_TTL = 45  # seconds
+
+# Ports and base figures the mock UNCTAD data is generated around
+MOCK_UNCTAD_PORTS = (
+    {
+        'port_name': 'Port of Dubai',
+        'country': 'UAE',
+        'unlocode': 'AEDXB',
+        'latitude': 25.01,
+        'longitude': 55.06,
+        'base_throughput': 15000000,
+        'base_arrivals': 8000,
+    },
+    {
+        'port_name': 'Port of Singapore',
+        'country': 'Singapore',
+        'unlocode': 'SGSIN',
+        'latitude': 1.26,
+        'longitude': 103.84,
+        'base_throughput': 37000000,
+        'base_arrivals': 12000,
+    },
+    {
+        'port_name': 'Port of Rotterdam',
+        'country': 'Netherlands',
+        'unlocode': 'NLRTM',
+        'latitude': 51.95,
+        'longitude': 4.14,
+        'base_throughput': 14500000,
+        'base_arrivals': 9500,
+    },
+    {
+        'port_name': 'Port of Shanghai',
+        'country': 'China',
+        'unlocode': 'CNSHA',
+        'latitude': 31.23,
+        'longitude': 121.49,
+        'base_throughput': 47000000,
+        'base_arrivals': 15000,
+    },
+    {
+        'port_name': 'Port of Los Angeles',
+        'country': 'USA',
+        'unlocode': 'USLAX',
+        'latitude': 33.73,
+        'longitude': -118.26,
+        'base_throughput': 9300000,
+        'base_arrivals': 7200,
+    },
+)
+
+
+def _build_http_session() -> requests.Session:
+    """Shared keep-alive session so UNCTAD calls reuse pooled TCP/TLS connections."""
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=10,
+        pool_maxsize=20,
+        max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[502, 503, 504]),
+    )
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    session.headers.update({'Accept-Encoding': 'gzip'})
+    return session
+
+
+_SESSION = _build_http_session()
+
+# Responses larger than this are parsed incrementally (when ijson is
+# installed) so records are normalized while the body is still arriving.
+STREAMING_THRESHOLD_BYTES = 256 * 1024
+
+# Upper bound on concurrent UNCTAD page requests; below the session pool size
+UNCTAD_FETCH_MAX_WORKERS = 8
+
+# Paths of the record arrays in the UNCTAD response envelopes we accept
+UNCTAD_RECORD_PREFIXES = ('data.item', 'ports.item', 'results.item', 'item')
+
+
+def _decode_json(response: requests.Response) -> Any:
+    """Decode an UNCTAD response body, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return json.loads(response.content)
+
+
+def _should_stream(response: requests.Response) -> bool:
+    """Whether a (stream=True) response is large enough to parse incrementally."""
+    if ijson is None:
+        return False
+    try:
+        return int(response.headers.get('Content-Length', 0)) > STREAMING_THRESHOLD_BYTES
+    except ValueError:
+        return False
+
+
+def _iter_unctad_records(response: requests.Response):
+    """
+    Yield UNCTAD records from the raw response stream.
+    
+    The record array is the first one found at any of
+    UNCTAD_RECORD_PREFIXES, so every envelope the buffered path accepts
+    except a bare single record can be streamed.
+    """
+    response.raw.decode_content = True
+    record_prefix = None
+    builder = None
+    
+    for prefix, event, value in ijson.parse(response.raw, use_float=True):
+        if builder is None:
+            if (event == 'start_map' and prefix in UNCTAD_RECORD_PREFIXES
+                    and record_prefix in (None, prefix)):
+                record_prefix = prefix
+                builder = ijson.ObjectBuilder()
+                builder.event(event, value)
+            continue
+        
+        builder.event(event, value)
+        if event == 'end_map' and prefix == record_prefix:
+            yield builder.value
+            builder = None
+
+
+def invalidate_port_dashboard() -> None:
+    """Drop the cached port dashboard so the next request recomputes it."""
+    cache.delete(PORT_DASHBOARD_CACHE_KEY)
+
 
 class PortAnalyticsService:
     """
@@ -44,6 +208,43 @@ class PortAnalyticsService:
             'high': 7.0,
             'critical': 9.0
         }
+        # Level lookup for bisect: a score below the first bound is 'low'
+        self._level_bounds = tuple(
+            self.congestion_thresholds[level] for level in CONGESTION_LEVELS[1:]
+        )
+        # Dashboard distribution buckets, most congested first
+        self._level_filters = self._build_level_filters()
+    
+    def _build_level_filters(self) -> Dict[str, Q]:
+        """
+        Build the congestion_score filter matching each level.
+        
+        Returns:
+            Q objects keyed by level, from 'critical' down to 'low'
+        """
+        lower_bounds = (None,) + self._level_bounds
+        upper_bounds = self._level_bounds + (None,)
+        filters = {}
+        for level, lower, upper in zip(CONGESTION_LEVELS, lower_bounds, upper_bounds):
+            level_filter = Q()
+            if lower is not None:
+                level_filter &= Q(congestion_score__gte=lower)
+            if upper is not None:
+                level_filter &= Q(congestion_score__lt=upper)
+            filters[level] = level_filter
+        return dict(reversed(filters.items()))
+    
+    def get_congestion_level(self, score: float) -> str:
+        """
+        Map a congestion score to its level name.
+        
+        Args:
+            score: Congestion score (0-10 scale)
+            
+        Returns:
+            'low', 'moderate', 'high' or 'critical'
+        """
+        return CONGESTION_LEVELS[bisect_right(self._level_bounds, score)]
     
     def fetch_unctad_port_statistics(self, params: Dict[str, Any] = None) -> List[Dict[str, Any]]:
         """
@@ -60,26 +261,7 @@ class PortAnalyticsService:
             return self._generate_mock_unctad_data()
         
         try:
-            headers = {
-                'Authorization': f'Bearer {self.api_key}',
-                'Content-Type': 'application/json'
-            }
-            
-            query_params = params or {}
-            query_params.setdefault('format', 'json')
-            query_params.setdefault('year', datetime.now().year)
-            
-            response = requests.get(
-                f"{self.unctad_url}/ports/statistics",
-                headers=headers,
-                params=query_params,
-                timeout=30
-            )
-            response.raise_for_status()
-            
-            data = response.json()
-            return self._normalize_unctad_response(data)
-            
+            return self._fetch_unctad_page(params)
         except requests.RequestException as e:
             logger.error(f"UNCTAD API request failed: {str(e)}", exc_info=True)
             return self._generate_mock_unctad_data()
@@ -87,6 +269,83 @@ class PortAnalyticsService:
             logger.error(f"Error processing UNCTAD data: {str(e)}", exc_info=True)
             return self._generate_mock_unctad_data()
     
+    def fetch_unctad_port_statistics_pages(self, params_list: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Fetch several UNCTAD result pages (years, countries, months) at once.
+        
+        The requests run concurrently over the pooled session, so the sweep
+        costs roughly the slowest page instead of the sum of all pages.
+        Pages that fail are logged and skipped; mock data is only used when
+        no page could be fetched.
+        
+        Args:
+            params_list: Query parameters for each page
+            
+        Returns:
+            Port statistics records of all pages, in page order
+        """
+        if not self.api_key or not params_list:
+            if not self.api_key:
+                logger.warning("No UNCTAD API key configured, using mock data")
+            return self._generate_mock_unctad_data()
+        
+        def fetch_page(params):
+            try:
+                return self._fetch_unctad_page(params)
+            except Exception as e:
+                logger.error(f"UNCTAD page request failed for {params}: {str(e)}", exc_info=True)
+                return None
+        
+        max_workers = min(UNCTAD_FETCH_MAX_WORKERS, len(params_list))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            pages = list(executor.map(fetch_page, params_list))
+        
+        fetched = [page for page in pages if page is not None]
+        if not fetched:
+            return self._generate_mock_unctad_data()
+        return [record for page in fetched for record in page]
+    
+    async def afetch_unctad_port_statistics_pages(self, params_list: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Async variant of fetch_unctad_port_statistics_pages for async views and workers.
+        
+        The page requests run in a worker thread pool, so the event loop
+        stays free while they are in flight.
+        """
+        return await sync_to_async(
+            self.fetch_unctad_port_statistics_pages, thread_sensitive=False
+        )(params_list)
+    
+    def _fetch_unctad_page(self, params: Dict[str, Any] = None) -> List[Dict[str, Any]]:
+        """
+        Request and normalize one page of UNCTAD statistics.
+        
+        Raises:
+            requests.RequestException: When the request fails
+        """
+        headers = {
+            'Authorization': f'Bearer {self.api_key}',
+            'Content-Type': 'application/json'
+        }
+        
+        query_params = dict(params or {})
+        query_params.setdefault('format', 'json')
+        query_params.setdefault('year', datetime.now().year)
+        
+        with _SESSION.get(
+            f"{self.unctad_url}/ports/statistics",
+            headers=headers,
+            params=query_params,
+            timeout=30,
+            stream=True
+        ) as response:
+            response.raise_for_status()
+            
+            if _should_stream(response):
+                return self._normalize_records(_iter_unctad_records(response))
+            data = _decode_json(response)
+        return self._normalize_unctad_response(data)
+    
     def _normalize_unctad_response(self, data: Dict[str, Any]) -> List[Dict[str, Any]]:
         """
         Normalize UNCTAD API response to standard format.
@@ -110,6 +369,22 @@ class PortAnalyticsService:
         else:
             records = data if isinstance(data, list) else []
         
+        return self._normalize_records(records)
+    
+    def _normalize_records(self, records: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Normalize UNCTAD records to the standard format, skipping invalid ones.
+        
+        Args:
+            records: Raw UNCTAD records; may be a lazy stream
+            
+        Returns:
+            Normalized port statistics data
+        """
+        # One clock read for the defaults of the whole batch
+        now = datetime.now()
+        default_year, default_month = now.year, now.month
+        
         normalized = []
         for record in records:
             try:
@@ -117,6 +392,8 @@ class PortAnalyticsService:
                     'port_name': record.get('port_name') or record.get('name'),
                     'country': record.get('country') or record.get('country_name'),
                     'unlocode': record.get('unlocode') or record.get('port_code'),
+                    'latitude': self._optional_float(record.get('latitude', record.get('lat'))),
+                    'longitude': self._optional_float(record.get('longitude', record.get('lon'))),
                     'total_throughput': float(record.get('total_throughput', 0)),
                     'container_throughput': float(record.get('container_throughput', 0)),
                     'vessel_arrivals': int(record.get('vessel_arrivals', 0)),
@@ -124,8 +401,8 @@ class PortAnalyticsService:
                     'avg_waiting_time': float(record.get('avg_waiting_time', 0)),
                     'berth_occupancy_rate': float(record.get('berth_occupancy_rate', 0)),
                     'cargo_dwell_time': float(record.get('cargo_dwell_time', 0)),
-                    'year': int(record.get('year', datetime.now().year)),
-                    'month': int(record.get('month', datetime.now().month)),
+                    'year': int(record.get('year', default_year)),
+                    'month': int(record.get('month', default_month)),
                 }
                 normalized.append(normalized_record)
             except (ValueError, TypeError) as e:
@@ -134,75 +411,50 @@ class PortAnalyticsService:
         
         return normalized
     
-    def _generate_mock_unctad_data(self) -> List[Dict[str, Any]]:
+    @staticmethod
+    def _optional_float(value: Any) -> Optional[float]:
+        """Convert a value to float, keeping missing values as None."""
+        return None if value in (None, '') else float(value)
+    
+    def _generate_mock_unctad_data(self, rng: Optional[random.Random] = None) -> List[Dict[str, Any]]:
         """
         Generate realistic mock UNCTAD-style port statistics for development.
         
+        Args:
+            rng: Random generator to draw from; a fresh one per call by
+                default, so concurrent refreshes do not share the
+                module-level generator. Pass a seeded instance for
+                reproducible output.
+        
         Returns:
             Mock port statistics data
         """
-        mock_ports = [
-            {
-                'port_name': 'Port of Dubai',
-                'country': 'UAE',
-                'unlocode': 'AEDXB',
-                'base_throughput': 15000000,
-                'base_arrivals': 8000,
-            },
-            {
-                'port_name': 'Port of Singapore',
-                'country': 'Singapore',
-                'unlocode': 'SGSIN',
-                'base_throughput': 37000000,
-                'base_arrivals': 12000,
-            },
-            {
-                'port_name': 'Port of Rotterdam',
-                'country': 'Netherlands',
-                'unlocode': 'NLRTM',
-                'base_throughput': 14500000,
-                'base_arrivals': 9500,
-            },
-            {
-                'port_name': 'Port of Shanghai',
-                'country': 'China',
-                'unlocode': 'CNSHA',
-                'base_throughput': 47000000,
-                'base_arrivals': 15000,
-            },
-            {
-                'port_name': 'Port of Los Angeles',
-                'country': 'USA',
-                'unlocode': 'USLAX',
-                'base_throughput': 9300000,
-                'base_arrivals': 7200,
-            }
-        ]
+        rng = rng or random.Random()
+        uniform = rng.uniform
+        now = datetime.now()
+        current_year = now.year
+        current_month = now.month
         
         mock_data = []
-        current_year = datetime.now().year
-        current_month = datetime.now().month
-        
-        for port in mock_ports:
+        for port in MOCK_UNCTAD_PORTS:
             # Add realistic variation to base statistics
-            throughput_variation = random.uniform(0.8, 1.2)
-            arrivals_variation = random.uniform(0.85, 1.15)
-            
-            total_throughput = int(port['base_throughput'] * throughput_variation)
-            vessel_arrivals = int(port['base_arrivals'] * arrivals_variation)
-            vessel_departures = int(vessel_arrivals * random.uniform(0.95, 1.05))
+            total_throughput = int(port['base_throughput'] * uniform(0.8, 1.2))
+            vessel_arrivals = int(port['base_arrivals'] * uniform(0.85, 1.15))
+            vessel_departures = int(vessel_arrivals * uniform(0.95, 1.05))
             
             # Calculate derived metrics
-            berth_occupancy = min(95.0, max(40.0, random.uniform(60, 90)))
-            avg_waiting_time = self._calculate_waiting_time_from_occupancy(berth_occupancy)
-            cargo_dwell_time = random.uniform(3.5, 8.5)  # Days
+            berth_occupancy = min(95.0, max(40.0, uniform(60, 90)))
+            avg_waiting_time = self._calculate_waiting_time_from_occupancy(berth_occupancy, rng)
+            cargo_dwell_time = uniform(3.5, 8.5)  # Days
             
             mock_data.append({
                 'port_name': port['port_name'],
                 'country': port['country'],
                 'unlocode': port['unlocode'],
+                'latitude': port['latitude'],
+                'longitude': port['longitude'],
                 'total_throughput': total_throughput,
-                'container_throughput': int(total_throughput * random.uniform(0.6, 0.9)),
+                'container_throughput': int(total_throughput * uniform(0.6, 0.9)),
                 'vessel_arrivals': vessel_arrivals,
                 'vessel_departures': vessel_departures,
                 'avg_waiting_time': round(avg_waiting_time, 1),
@@ -214,13 +466,15 @@ class PortAnalyticsService:
         
         return mock_data
     
-    def _calculate_waiting_time_from_occupancy(self, occupancy_rate: float) -> float:
+    def _calculate_waiting_time_from_occupancy(self, occupancy_rate: float,
+                                               rng: Optional[random.Random] = None) -> float:
         """
         Calculate average waiting time based on berth occupancy rate.
         Uses queuing theory approximation.
         
         Args:
             occupancy_rate: Berth occupancy percentage (0-100)
+            rng: Random generator for the saturated-berth case
             
         Returns:
             Average waiting time in hours
@@ -234,7 +488,7 @@ class PortAnalyticsService:
         
         if rho >= 0.95:
             # Very high occupancy leads to exponential waiting times
-            waiting_time = service_time * random.uniform(8, 15)
+            waiting_time = service_time * (rng or random).uniform(8, 15)
         else:
             waiting_time = service_time * (rho / (1 - rho))
         
@@ -250,48 +504,68 @@ class PortAnalyticsService:
         Returns:
             Congestion score (0-10 scale)
         """
-        factors = {}
+        return self.calculate_congestion_scores_batch([port_data])[0]
+    
+    def calculate_congestion_scores_batch(self, records: List[Dict[str, Any]]) -> List[float]:
+        """
+        Calculate congestion scores for a batch of port statistics records.
         
-        # Factor 1: Berth occupancy rate (40% weight)
-        occupancy = port_data.get('berth_occupancy_rate', 50.0)
-        factors['occupancy'] = min(10.0, (occupancy / 10.0)) * 0.4
+        Factors and weights:
+        - Berth occupancy rate (40%)
+        - Average waiting time (30%): 0-2 hours = 0-3 points,
+          2-8 hours = 3-7 points, 8+ hours = 7-10 points
+        - Cargo dwell time (20%): 0-3 days = 0-2 points,
+          3-7 days = 2-6 points, 7+ days = 6-10 points
+        - Traffic imbalance between arrivals and departures (10%)
         
-        # Factor 2: Average waiting time (30% weight)
-        waiting_time = port_data.get('avg_waiting_time', 2.0)
-        # Normalize: 0-2 hours = 0-3 points, 2-8 hours = 3-7 points, 8+ hours = 7-10 points
-        if waiting_time <= 2:
-            wait_score = (waiting_time / 2.0) * 3.0
-        elif waiting_time <= 8:
-            wait_score = 3.0 + ((waiting_time - 2.0) / 6.0) * 4.0
-        else:
-            wait_score = 7.0 + min(3.0, (waiting_time - 8.0) / 4.0 * 3.0)
-        factors['waiting'] = wait_score * 0.3
-        
-        # Factor 3: Cargo dwell time (20% weight)
-        dwell_time = port_data.get('cargo_dwell_time', 5.0)
-        # Normalize: 0-3 days = 0-2 points, 3-7 days = 2-6 points, 7+ days = 6-10 points
-        if dwell_time <= 3:
-            dwell_score = (dwell_time / 3.0) * 2.0
-        elif dwell_time <= 7:
-            dwell_score = 2.0 + ((dwell_time - 3.0) / 4.0) * 4.0
-        else:
-            dwell_score = 6.0 + min(4.0, (dwell_time - 7.0) / 3.0 * 4.0)
-        factors['dwell'] = dwell_score * 0.2
-        
-        # Factor 4: Traffic imbalance (10% weight)
-        arrivals = port_data.get('vessel_arrivals', 100)
-        departures = port_data.get('vessel_departures', 100)
-        if arrivals > 0:
-            imbalance = abs(arrivals - departures) / arrivals
-            factors['imbalance'] = min(10.0, imbalance * 20) * 0.1
-        else:
-            factors['imbalance'] = 0.0
+        Args:
+            records: Port statistics data
+            
+        Returns:
+            Congestion scores (0-10 scale), in the same order as records
+        """
+        debug = logger.isEnabledFor(logging.DEBUG)
+        scores = []
         
-        # Calculate final score
-        total_score = sum(factors.values())
+        for port_data in records:
+            get = port_data.get
+            occupancy = get('berth_occupancy_rate', 50.0)
+            waiting_time = get('avg_waiting_time', 2.0)
+            dwell_time = get('cargo_dwell_time', 5.0)
+            arrivals = get('vessel_arrivals', 100)
+            departures = get('vessel_departures', 100)
+            
+            occupancy_factor = min(10.0, occupancy / 10.0) * 0.4
+            
+            if waiting_time <= 2:
+                wait_score = (waiting_time / 2.0) * 3.0
+            elif waiting_time <= 8:
+                wait_score = 3.0 + ((waiting_time - 2.0) / 6.0) * 4.0
+            else:
+                wait_score = 7.0 + min(3.0, (waiting_time - 8.0) / 4.0 * 3.0)
+            
+            if dwell_time <= 3:
+                dwell_score = (dwell_time / 3.0) * 2.0
+            elif dwell_time <= 7:
+                dwell_score = 2.0 + ((dwell_time - 3.0) / 4.0) * 4.0
+            else:
+                dwell_score = 6.0 + min(4.0, (dwell_time - 7.0) / 3.0 * 4.0)
+            
+            if arrivals > 0:
+                imbalance_factor = min(10.0, (abs(arrivals - departures) / arrivals) * 20) * 0.1
+            else:
+                imbalance_factor = 0.0
+            
+            total_score = sum((occupancy_factor, wait_score * 0.3, dwell_score * 0.2, imbalance_factor))
+            if debug:
+                logger.debug(
+                    f"Congestion factors for {get('port_name')}: occupancy={occupancy_factor:.2f}, "
+                    f"waiting={wait_score * 0.3:.2f}, dwell={dwell_score * 0.2:.2f}, "
+                    f"imbalance={imbalance_factor:.2f}, Total: {total_score:.2f}"
+                )
+            scores.append(round(min(10.0, max(0.0, total_score)), 1))
         
-        logger.debug(f"Congestion factors: {factors}, Total: {total_score:.2f}")
-        return round(min(10.0, max(0.0, total_score)), 1)
+        return scores
     
     def update_port_analytics(self, port_data: Dict[str, Any]) -> Optional[Port]:
         """
@@ -303,42 +577,136 @@ class PortAnalyticsService:
         Returns:
             Updated Port instance or None if not found
         """
-        port_name = port_data.get('port_name')
-        country = port_data.get('country')
-        
-        if not port_name or not country:
-            logger.warning(f"Missing port name or country in data: {port_data}")
+        port = self._fetch_ports_for_records([port_data])[0]
+        if port is None:
+            self._log_unmatched_record(port_data)
             return None
         
-        try:
-            port = Port.objects.get(name=port_name, country=country)
-        except Port.DoesNotExist:
-            logger.debug(f"Port not found: {port_name}, {country}")
-            return None
+        previous_congestion = self._apply_port_data(port, port_data)
+        port.save()
         
-        # Store previous values for comparison
-        previous_congestion = port.congestion_score
+        # Check for congestion level changes and trigger events
+        self._check_congestion_alerts(port, previous_congestion, port.congestion_score)
+        
+        logger.info(f"Updated port analytics for {port.name}: congestion={port.congestion_score}")
+        return port
+    
+    def _apply_port_data(self, port: Port, port_data: Dict[str, Any],
+                         congestion_score: Optional[float] = None) -> float:
+        """
+        Assign freshly calculated analytics to a port without saving it.
         
-        # Calculate new metrics
-        congestion_score = self.calculate_congestion_score(port_data)
-        avg_wait_time = port_data.get('avg_waiting_time', port.avg_wait_time)
-        arrivals = port_data.get('vessel_arrivals', port.arrivals_count)
-        departures = port_data.get('vessel_departures', port.departures_count)
+        Args:
+            port: Port instance
+            port_data: Normalized port statistics data
+            congestion_score: Score already calculated for port_data, if any
+            
+        Returns:
+            Congestion score the port had before the update
+        """
+        previous_congestion = port.congestion_score
         
-        # Update port
+        if congestion_score is None:
+            congestion_score = self.calculate_congestion_score(port_data)
         port.congestion_score = congestion_score
-        port.avg_wait_time = avg_wait_time
-        port.arrivals_count = arrivals
-        port.departures_count = departures
-        port.save()
+        port.avg_wait_time = port_data.get('avg_waiting_time', port.avg_wait_time)
+        port.arrivals_count = port_data.get('vessel_arrivals', port.arrivals_count)
+        port.departures_count = port_data.get('vessel_departures', port.departures_count)
+        if port_data.get('unlocode') and not port.unlocode:
+            port.unlocode = port_data['unlocode']
+        if port_data.get('latitude') is not None and port_data.get('longitude') is not None:
+            port.latitude = port_data['latitude']
+            port.longitude = port_data['longitude']
         
-        # Check for congestion level changes and trigger events
-        self._check_congestion_alerts(port, previous_congestion, congestion_score)
+        return previous_congestion
+    
+    def _fetch_ports_for_records(self, records: List[Dict[str, Any]],
+                                 lock: bool = False) -> List[Optional[Port]]:
+        """
+        Load the ports referenced by a batch of statistics records.
         
-        logger.info(f"Updated port analytics for {port.name}: congestion={congestion_score}")
-        return port
+        Records are matched on UN/LOCODE first, then on (name, country) for
+        records whose code is missing or not yet stored on a port; each
+        lookup is a single query. A port referenced by several records is
+        returned as the same instance.
+        
+        Args:
+            records: Normalized port statistics data
+            lock: Lock the ports with SELECT ... FOR UPDATE SKIP LOCKED, so
+                ports being updated by a concurrent refresh come back as
+                None instead of blocking. Must be called in a transaction.
+            
+        Returns:
+            The matching port for each record (None when not found), in the
+            same order as records
+        """
+        queryset = Port.objects.select_for_update(skip_locked=True) if lock else Port.objects.all()
+        
+        codes = {record['unlocode'] for record in records if record.get('unlocode')}
+        ports_by_code = queryset.in_bulk(codes, field_name='unlocode') if codes else {}
+        ports_by_pk = {port.pk: port for port in ports_by_code.values()}
+        
+        keys = {
+            (record.get('port_name'), record.get('country'))
+            for record in records
+            if record.get('unlocode') not in ports_by_code
+            and record.get('port_name') and record.get('country')
+        }
+        ports_by_key = {}
+        if keys:
+            names = {name for name, _ in keys}
+            countries = {country for _, country in keys}
+            for port in queryset.filter(name__in=names, country__in=countries):
+                if (port.name, port.country) in keys:
+                    ports_by_key[(port.name, port.country)] = ports_by_pk.setdefault(port.pk, port)
+        
+        return [
+            ports_by_code.get(record.get('unlocode'))
+            or ports_by_key.get((record.get('port_name'), record.get('country')))
+            for record in records
+        ]
+    
+    def _find_locked_ports(self, records: List[Dict[str, Any]],
+                           matched_ports: List[Optional[Port]]) -> List[bool]:
+        """
+        Tell which unmatched records refer to a port skipped because it was locked.
+        
+        Only needed where SKIP LOCKED is supported; the unmatched records
+        are looked up again without locking.
+        
+        Args:
+            records: Normalized port statistics data
+            matched_ports: Result of a locking _fetch_ports_for_records call
+            
+        Returns:
+            For each record, whether its port exists but was locked
+        """
+        locked = [False] * len(records)
+        connection = connections[Port.objects.db]
+        if not connection.features.has_select_for_update_skip_locked:
+            return locked
+        
+        unmatched = [index for index, port in enumerate(matched_ports) if port is None]
+        if not unmatched:
+            return locked
+        
+        existing = self._fetch_ports_for_records([records[index] for index in unmatched])
+        for index, port in zip(unmatched, existing):
+            locked[index] = port is not None
+        return locked
+    
+    @staticmethod
+    def _log_unmatched_record(port_data: Dict[str, Any]) -> None:
+        """Log why a statistics record did not match any port."""
+        port_name = port_data.get('port_name')
+        country = port_data.get('country')
+        if not port_data.get('unlocode') and (not port_name or not country):
+            logger.warning(f"Missing port name or country in data: {port_data}")
+        else:
+            logger.debug(f"Port not found: {port_data.get('unlocode') or ''} {port_name}, {country}")
     
-    def _check_congestion_alerts(self, port: Port, previous_score: float, current_score: float):
+    def _check_congestion_alerts(self, port: Port, previous_score: float, current_score: float,
+                                 now: Optional[datetime] = None) -> int:
         """
         Check if congestion level changes warrant alerts.
         
@@ -346,29 +714,24 @@ class PortAnalyticsService:
             port: Port instance
             previous_score: Previous congestion score
             current_score: Current congestion score
+            now: Reference time shared by a batch of checks (default: now)
+            
+        Returns:
+            Number of congestion events created
         """
-        # Define congestion level thresholds
-        def get_congestion_level(score):
-            if score >= self.congestion_thresholds['critical']:
-                return 'critical'
-            elif score >= self.congestion_thresholds['high']:
-                return 'high'
-            elif score >= self.congestion_thresholds['moderate']:
-                return 'moderate'
-            else:
-                return 'low'
-        
-        previous_level = get_congestion_level(previous_score)
-        current_level = get_congestion_level(current_score)
+        previous_level = self.get_congestion_level(previous_score)
+        current_level = self.get_congestion_level(current_score)
         
         # Trigger alert if congestion level increased significantly
         if (current_level != previous_level and 
             current_score > previous_score and 
             current_score >= self.congestion_thresholds['high']):
             
-            self._create_congestion_event(port, current_score, current_level)
+            return self._create_congestion_event(port, current_score, current_level, now)
+        return 0
     
-    def _create_congestion_event(self, port: Port, congestion_score: float, level: str):
+    def _create_congestion_event(self, port: Port, congestion_score: float, level: str,
+                                 now: Optional[datetime] = None) -> int:
         """
         Create congestion event and trigger notifications.
         
@@ -376,130 +739,195 @@ class PortAnalyticsService:
             port: Port instance
             congestion_score: Current congestion score
             level: Congestion level (high, critical)
+            now: Reference time for the recent-event window (default: now)
+            
+        Returns:
+            Number of events created
         """
         # Find vessels approaching this port (simplified logic)
         approaching_vessels = self._find_vessels_approaching_port(port)
+        if not approaching_vessels:
+            return 0
+        
+        # Vessels that already have a recent congestion event for this port,
+        # looked up for all candidates in one query
+        recently_notified = set(
+            Event.objects.filter(
+                vessel_id__in=[vessel.id for vessel in approaching_vessels],
+                event_type='HIGH_CONGESTION',
+                port_id=port.id,
+                timestamp__gte=(now or timezone.now()) - timedelta(hours=6)
+            ).values_list('vessel_id', flat=True)
+        )
         
-        for vessel in approaching_vessels:
-            # Check if we already have a recent congestion event
-            recent_event = Event.objects.filter(
+        details = (
+            f"Port congestion level: {level.upper()} (score: {congestion_score}). "
+            f"Average wait time: {port.avg_wait_time:.1f} hours. "
+            f"Arrivals: {port.arrivals_count}, Departures: {port.departures_count}"
+        )
+        created_events = [
+            Event(
                 vessel=vessel,
                 event_type='HIGH_CONGESTION',
-                location__icontains=port.name,
-                timestamp__gte=timezone.now() - timedelta(hours=6)
-            ).exists()
-            
-            if not recent_event:
-                event = Event.objects.create(
-                    vessel=vessel,
-                    event_type='HIGH_CONGESTION',
-                    location=f"{port.name}, {port.country}",
-                    details=f"Port congestion level: {level.upper()} (score: {congestion_score}). "
-                           f"Average wait time: {port.avg_wait_time:.1f} hours. "
-                           f"Arrivals: {port.arrivals_count}, Departures: {port.departures_count}"
-                )
-                
-                # Trigger notifications
-                NotificationService.notify_users_for_event(event)
-                logger.info(f"Created congestion event for {vessel.name} at {port.name}")
+                location=f"{port.name}, {port.country}",
+                port=port,
+                details=details
+            )
+            for vessel in approaching_vessels
+            if vessel.id not in recently_notified
+        ]
+        if not created_events:
+            return 0
+        
+        EventTriggerService.insert_events(created_events)
+        # Publish and drop the dashboard cache only once the events are committed
+        transaction.on_commit(partial(publish_events, created_events))
+        transaction.on_commit(invalidate_port_dashboard)
+        
+        # Notify users from a task queued after commit, so the fan-out stays
+        # out of the refresh transaction and never fires for rolled-back events.
+        # Without Celery the task runs inline here; robust=True logs a failure
+        # left after its retries instead of raising it into a caller whose
+        # data is already committed. Django names the callback in that log by
+        # __qualname__, hence a named function rather than a partial.
+        from core.tasks import dispatch_task, notify_events_task
+        event_ids = [event.pk for event in created_events]
+        
+        def dispatch_notifications():
+            dispatch_task(notify_events_task, event_ids)
+        
+        transaction.on_commit(dispatch_notifications, robust=True)
+        
+        for event in created_events:
+            logger.info(f"Created congestion event for {event.vessel.name} at {port.name}")
+        
+        return len(created_events)
     
     def _find_vessels_approaching_port(self, port: Port, radius_km: float = 100) -> List[Vessel]:
         """
         Find vessels that might be approaching the given port.
         Simplified implementation using proximity.
         
+        Uses the same bounding-box prefilter and great-circle distance
+        check as the zone event checks.
+        
         Args:
             port: Port instance
             radius_km: Search radius in kilometers
             
         Returns:
-            List of vessels potentially approaching the port
+            List of vessels within radius_km of the port, or an empty list
+            when the port has no coordinates
         """
-        # This is a simplified implementation
-        # In production, you'd use proper geospatial queries and route prediction
-        
-        # For now, return a few random vessels for demonstration
-        vessels = list(Vessel.objects.filter(
-            last_position_lat__isnull=False,
-            last_position_lon__isnull=False
-        )[:3])  # Limit to 3 for testing
+        if port.latitude is None or port.longitude is None:
+            logger.debug(f"No coordinates for {port.name}; cannot find approaching vessels")
+            return []
         
-        return vessels
+        return EventTriggerService.find_vessels_in_zone([], port.latitude, port.longitude, radius_km)
     
     def get_port_dashboard_data(self) -> Dict[str, Any]:
         """
         Get comprehensive port dashboard analytics.
         
+        The payload is cached for PORT_DASHBOARD_CACHE_TTL seconds and
+        invalidated when ports or congestion events change, so concurrent
+        dashboard viewers share one set of aggregate queries. Fallback data
+        is never cached.
+        
         Returns:
             Dashboard data with port statistics and trends
         """
+        dashboard_data = cache.get(PORT_DASHBOARD_CACHE_KEY)
+        if dashboard_data is not None:
+            return dashboard_data
+        
         try:
-            ports = Port.objects.all()
-            
-            if not ports.exists():
-                return self._get_fallback_dashboard_data()
-            
-            # Calculate aggregate statistics
-            total_ports = ports.count()
-            avg_congestion = ports.aggregate(avg=Avg('congestion_score'))['avg'] or 0
-            avg_wait_time = ports.aggregate(avg=Avg('avg_wait_time'))['avg'] or 0
-            total_arrivals = ports.aggregate(total=Count('arrivals_count'))['total'] or 0
-            total_departures = ports.aggregate(total=Count('departures_count'))['total'] or 0
-            
-            # Congestion level distribution
-            congestion_distribution = {
-                'critical': ports.filter(congestion_score__gte=self.congestion_thresholds['critical']).count(),
-                'high': ports.filter(
-                    congestion_score__gte=self.congestion_thresholds['high'],
-                    congestion_score__lt=self.congestion_thresholds['critical']
-                ).count(),
-                'moderate': ports.filter(
-                    congestion_score__gte=self.congestion_thresholds['moderate'],
-                    congestion_score__lt=self.congestion_thresholds['high']
-                ).count(),
-                'low': ports.filter(congestion_score__lt=self.congestion_thresholds['moderate']).count(),
-            }
-            
-            # Top congested ports
-            top_congested = list(ports.order_by('-congestion_score')[:10].values(
-                'name', 'country', 'congestion_score', 'avg_wait_time', 'arrivals_count', 'departures_count'
-            ))
-            
-            # Recent congestion events
-            recent_events = Event.objects.filter(
-                event_type='HIGH_CONGESTION',
-                timestamp__gte=timezone.now() - timedelta(days=7)
-            ).select_related('vessel').order_by('-timestamp')[:20]
-            
-            recent_events_data = [
-                {
-                    'vessel_name': event.vessel.name,
-                    'vessel_imo': event.vessel.imo_number,
-                    'location': event.location,
-                    'timestamp': event.timestamp.isoformat(),
-                    'details': event.details
-                }
-                for event in recent_events
-            ]
-            
-            return {
-                'summary': {
-                    'total_ports': total_ports,
-                    'average_congestion_score': round(avg_congestion, 2),
-                    'average_wait_time': round(avg_wait_time, 2),
-                    'total_arrivals': total_arrivals,
-                    'total_departures': total_departures,
-                },
-                'congestion_distribution': congestion_distribution,
-                'top_congested_ports': top_congested,
-                'recent_events': recent_events_data,
-                'thresholds': self.congestion_thresholds,
-                'last_updated': timezone.now().isoformat()
-            }
-            
+            dashboard_data = self._compute_dashboard_data()
         except Exception as e:
             logger.error(f"Error generating dashboard data: {str(e)}", exc_info=True)
             return self._get_fallback_dashboard_data()
+        
+        if dashboard_data is None:
+            return self._get_fallback_dashboard_data()
+        
+        cache.set(PORT_DASHBOARD_CACHE_KEY, dashboard_data, PORT_DASHBOARD_CACHE_TTL)
+        return dashboard_data
+    
+    def _compute_dashboard_data(self) -> Optional[Dict[str, Any]]:
+        """
+        Run the dashboard queries.
+        
+        Returns:
+            Dashboard data, or None when there are no ports
+        """
+        now = timezone.now()
+        
+        # Only the metric columns; nothing below needs a full Port row
+        ports = Port.objects.only(*DASHBOARD_PORT_FIELDS).order_by()
+        
+        # All summary metrics and the congestion distribution in one scan,
+        # which also tells whether there are any ports at all
+        stats = ports.aggregate(
+            total_ports=Count('id'),
+            avg_congestion=Avg('congestion_score'),
+            avg_wait_time=Avg('avg_wait_time'),
+            total_arrivals=Sum('arrivals_count'),
+            total_departures=Sum('departures_count'),
+            **{
+                level: Count('id', filter=level_filter)
+                for level, level_filter in self._level_filters.items()
+            },
+        )
+        
+        total_ports = stats['total_ports']
+        if total_ports == 0:
+            return None
+        avg_congestion = stats['avg_congestion'] or 0
+        avg_wait_time = stats['avg_wait_time'] or 0
+        total_arrivals = stats['total_arrivals'] or 0
+        total_departures = stats['total_departures'] or 0
+        
+        # Congestion level distribution
+        congestion_distribution = {level: stats[level] for level in self._level_filters}
+        
+        # Top congested ports
+        top_congested = list(
+            ports.order_by('-congestion_score')[:10].values(*DASHBOARD_PORT_FIELDS)
+        )
+        
+        # Recent congestion events, read as plain rows without building models
+        recent_events = Event.objects.filter(
+            event_type='HIGH_CONGESTION',
+            timestamp__gte=now - timedelta(days=7)
+        ).order_by('-timestamp').values(
+            'vessel__name', 'vessel__imo_number', 'location', 'timestamp', 'details'
+        )[:20]
+        
+        recent_events_data = [
+            {
+                'vessel_name': event['vessel__name'],
+                'vessel_imo': event['vessel__imo_number'],
+                'location': event['location'],
+                'timestamp': event['timestamp'].isoformat(),
+                'details': event['details']
+            }
+            for event in recent_events
+        ]
+        
+        return {
+            'summary': {
+                'total_ports': total_ports,
+                'average_congestion_score': round(avg_congestion, 2),
+                'average_wait_time': round(avg_wait_time, 2),
+                'total_arrivals': total_arrivals,
+                'total_departures': total_departures,
+            },
+            'congestion_distribution': congestion_distribution,
+            'top_congested_ports': top_congested,
+            'recent_events': recent_events_data,
+            'thresholds': self.congestion_thresholds,
+            'last_updated': now.isoformat()
+        }
     
     def _get_fallback_dashboard_data(self) -> Dict[str, Any]:
         """
@@ -546,40 +974,82 @@ class PortAnalyticsService:
             'note': 'Fallback data - database unavailable'
         }
     
-    def refresh_all_port_analytics(self) -> Dict[str, Any]:
+    def refresh_all_port_analytics(self, params_list: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
         """
         Refresh analytics for all ports using UNCTAD data.
         
+        Args:
+            params_list: Query parameters of several UNCTAD pages to fetch
+                concurrently; a single default request when omitted
+        
         Returns:
             Summary of refresh operation
         """
         logger.info("Starting comprehensive port analytics refresh")
+        started_at = timezone.now()
         
         try:
             # Fetch UNCTAD data
-            unctad_data = self.fetch_unctad_port_statistics()
+            if params_list:
+                unctad_data = self.fetch_unctad_port_statistics_pages(params_list)
+            else:
+                unctad_data = self.fetch_unctad_port_statistics()
             
             summary = {
-                'started_at': timezone.now().isoformat(),
+                'started_at': started_at.isoformat(),
                 'unctad_records_fetched': len(unctad_data),
                 'ports_updated': 0,
                 'ports_not_found': 0,
+                'ports_locked': 0,
                 'events_created': 0,
                 'errors': []
             }
             
             with transaction.atomic():
-                for port_data in unctad_data:
+                # Batched lookups load every referenced port and one bulk UPDATE
+                # writes them back, instead of a get() and save() per record
+                # Ports locked by a concurrent refresh are skipped, not waited on
+                matched_ports = self._fetch_ports_for_records(unctad_data, lock=True)
+                locked_ports = self._find_locked_ports(unctad_data, matched_ports)
+                scores = self.calculate_congestion_scores_batch(unctad_data)
+                changed_ports = {}
+                previous_scores = {}
+                
+                for index, (port_data, port, congestion_score) in enumerate(
+                    zip(unctad_data, matched_ports, scores)
+                ):
                     try:
-                        port = self.update_port_analytics(port_data)
-                        if port:
-                            summary['ports_updated'] += 1
-                        else:
+                        if port is None:
+                            if locked_ports[index]:
+                                logger.info(f"Skipping {port_data.get('port_name')}: "
+                                            f"being updated by another refresh")
+                                summary['ports_locked'] += 1
+                                continue
+                            self._log_unmatched_record(port_data)
                             summary['ports_not_found'] += 1
+                            continue
+                        
+                        previous_score = self._apply_port_data(port, port_data, congestion_score)
+                        port.last_updated = started_at
+                        previous_scores.setdefault(port.pk, previous_score)
+                        changed_ports[port.pk] = port
+                        summary['ports_updated'] += 1
                     except Exception as e:
                         error_msg = f"Error updating port {port_data.get('port_name', 'unknown')}: {str(e)}"
                         summary['errors'].append(error_msg)
                         logger.error(error_msg)
+                
+                Port.objects.bulk_update(
+                    changed_ports.values(), PORT_ANALYTICS_FIELDS, batch_size=PORT_BULK_BATCH_SIZE
+                )
+                
+                transaction.on_commit(invalidate_port_dashboard)
+                
+                for port in changed_ports.values():
+                    summary['events_created'] += self._check_congestion_alerts(
+                        port, previous_scores[port.pk], port.congestion_score, started_at
+                    )
+                    logger.info(f"Updated port analytics for {port.name}: congestion={port.congestion_score}")
             
             summary['completed_at'] = timezone.now().isoformat()
             summary['success'] = len(summary['errors']) == 0
@@ -590,13 +1060,19 @@ class PortAnalyticsService:
         except Exception as e:
             logger.error(f"Critical error in port analytics refresh: {str(e)}", exc_info=True)
             return {
-                'started_at': timezone.now().isoformat(),
+                'started_at': started_at.isoformat(),
                 'success': False,
                 'error': str(e)
             }
 
 
-# Legacy functions for backward compatibility
+# Legacy functions for backward compatibility. They share one service
+# instance rather than building a new one (and re-reading settings) per call.
+@lru_cache(maxsize=1)
+def _default_service() -> PortAnalyticsService:
+    return PortAnalyticsService()
+
+
 def _get_unctad_config() -> str:
     """Legacy function - use PortAnalyticsService instead."""
     logger.warning("Using deprecated _get_unctad_config function")
@@ -606,14 +1082,10 @@ def _get_unctad_config() -> str:
 def fetch_unctad_port_stats(params: Dict[str, Any] = None) -> Iterable[Dict[str, Any]]:
     """Legacy function - use PortAnalyticsService instead."""
     logger.warning("Using deprecated fetch_unctad_port_stats function")
-    service = PortAnalyticsService()
-    return service.fetch_unctad_port_statistics(params)
+    return _default_service().fetch_unctad_port_statistics(params)
 
 
 def refresh_port_congestion(params: Dict[str, Any] = None) -> Dict[str, Any]:
     """Legacy function - use PortAnalyticsService instead."""
     logger.warning("Using deprecated refresh_port_congestion function")
-    service = PortAnalyticsService()
-    return service.refresh_all_port_analytics()
-
-
+    return _default_service().refresh_all_port_analytics([params] if params else None)
@@ -7,18 +7,52 @@ Responsibilities:
 - Create corresponding safety Events and Notifications
 """
 
+import hashlib
+import json
 import logging
+import math
+import re
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from typing import Dict, Any, Iterable, List, Optional, Tuple
 
 import requests
 from django.conf import settings
+from django.core.cache import cache
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from django.utils import timezone
 from django.db.models import Q
 
-from core.models import Vessel, Event, Notification, User
+from core.models import Vessel, Event, Notification
+from core.services.notification_service import (
+    EARTH_RADIUS_KM,
+    KM_PER_DEGREE,
+    EventTriggerService,
+    NotificationService,
+    user_ids_for_roles,
+)
 
 logger = logging.getLogger(__name__)
 
+# Risk zones whose bounding boxes go into one vessel query; keeps the OR'd
+# filter well inside SQLite's expression depth limit.
+ZONE_QUERY_BATCH_SIZE = 200
+
+# Hazard codes that mark a record as a storm, in any letter case.
+_HAZARD_RE = re.compile(r"STORM|CYCLONE|HURRICANE", re.I)
+
+# NOAA forecasts update roughly every ten minutes, so scheduler ticks within
+# this window reuse the previous response.
+NOAA_CACHE_TTL = 300  # seconds
+
+# Concurrent NOAA requests when several subregions are fetched in one run.
+NOAA_FETCH_MAX_WORKERS = 8
+
+# Roles notified of every safety event (sorted, as the role cache key).
+SAFETY_ALERT_ROLES = ("ADMIN", "OPERATOR")
+
 
 # ---------------------------------------------------------------------------
 # Configuration helpers
@@ -31,6 +65,8 @@ def _get_noaa_config() -> Tuple[str, Optional[str]]:
     Expected settings (optional but recommended):
     - NOAA_WEATHER_URL: Base URL for NOAA weather/safety endpoint
     - NOAA_API_KEY: API token or key (if required)
+    - NOAA_REGION_PARAMS: Query params per subregion fetched on scheduled
+      runs (see trigger_safety_events_from_noaa)
     """
     base_url = getattr(
         settings,
@@ -47,12 +83,41 @@ def _get_noaa_config() -> Tuple[str, Optional[str]]:
 # Fetching NOAA data
 # ---------------------------------------------------------------------------
 
-def fetch_noaa_weather(params: Dict[str, Any] | None = None) -> Iterable[Dict[str, Any]]:
+def _build_http_session() -> requests.Session:
+    """Shared keep-alive session so NOAA calls reuse pooled TCP/TLS connections."""
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=10,
+        pool_maxsize=50,
+        max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[502, 503, 504]),
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update({"Accept-Encoding": "gzip"})
+    return session
+
+
+_SESSION = _build_http_session()
+
+
+def _noaa_cache_key(base_url: str, query_params: Dict[str, Any]) -> str:
+    digest = hashlib.sha256(
+        json.dumps([base_url, query_params], sort_keys=True, default=str).encode()
+    ).hexdigest()
+    return f"noaa:{digest}"
+
+
+def fetch_noaa_weather(
+    params: Dict[str, Any] | None = None, force_refresh: bool = False
+) -> Iterable[Dict[str, Any]]:
     """
     Fetch raw weather/safety data from NOAA.
 
     This is intentionally generic; you can adapt param names and the
     endpoint format to your exact NOAA integration.
+
+    Successful responses are cached for NOAA_CACHE_TTL seconds per query;
+    pass ``force_refresh=True`` to bypass the cache and refetch.
     """
     base_url, api_key = _get_noaa_config()
     query_params = params.copy() if params else {}
@@ -61,8 +126,14 @@ def fetch_noaa_weather(params: Dict[str, Any] | None = None) -> Iterable[Dict[st
     if api_key:
         query_params.setdefault("api_key", api_key)
 
+    cache_key = _noaa_cache_key(base_url, query_params)
+    if not force_refresh:
+        records = cache.get(cache_key)
+        if records is not None:
+            return records
+
     try:
-        response = requests.get(base_url, params=query_params, timeout=20)
+        response = _SESSION.get(base_url, params=query_params, timeout=20)
         response.raise_for_status()
     except requests.RequestException as exc:
         logger.error("Failed to fetch NOAA weather data: %s", exc, exc_info=True)
@@ -75,25 +146,54 @@ def fetch_noaa_weather(params: Dict[str, Any] | None = None) -> Iterable[Dict[st
         return []
 
     # Accept either a list or dict with 'features' / 'results'.
-    if isinstance(data, dict):
-        if "features" in data:
-            # Many NOAA APIs are GeoJSON-like with 'features'.
-            return data["features"] or []
-        if "results" in data:
-            return data["results"] or []
+    if isinstance(data, dict) and "features" in data:
+        # Many NOAA APIs are GeoJSON-like with 'features'.
+        records = data["features"] or []
+    elif isinstance(data, dict) and "results" in data:
+        records = data["results"] or []
+    elif isinstance(data, list):
+        records = data
+    else:
+        logger.warning("Unexpected NOAA response format: %s", type(data))
+        return []
+
+    cache.set(cache_key, records, NOAA_CACHE_TTL)
+    return records
 
-    if isinstance(data, list):
-        return data
 
-    logger.warning("Unexpected NOAA response format: %s", type(data))
-    return []
+def fetch_noaa_weather_regions(
+    params_list: List[Dict[str, Any]], force_refresh: bool = False
+) -> List[Dict[str, Any]]:
+    """
+    Fetch several NOAA subregions at once.
+
+    The requests run concurrently over the pooled session, so the sweep
+    costs roughly the slowest region instead of the sum of all of them.
+    Records are returned in region order; a region that fails contributes
+    no records (fetch_noaa_weather logs the failure).
+    """
+    if not params_list:
+        return []
+
+    fetch_region = partial(fetch_noaa_weather, force_refresh=force_refresh)
+    max_workers = min(NOAA_FETCH_MAX_WORKERS, len(params_list))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        regions = list(executor.map(fetch_region, params_list))
+    return [record for records in regions for record in records]
 
 
 # ---------------------------------------------------------------------------
 # Risk detection
 # ---------------------------------------------------------------------------
 
-def _extract_weather_point(record: Dict[str, Any]) -> Dict[str, Any]:
+def _to_float(value: Any) -> Optional[float]:
+    try:
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _extract_weather_point(record: Dict[str, Any], storms_only: bool = False) -> Optional[Dict[str, Any]]:
     """
     Normalize a NOAA record into a simpler structure:
     {
@@ -104,18 +204,32 @@ def _extract_weather_point(record: Dict[str, Any]) -> Dict[str, Any]:
         'storm': bool,
         'description': str,
     }
+
+    With ``storms_only``, records that are not storms/high-risk return None
+    before their position and description are read.
     """
     # Support GeoJSON feature style: { "geometry": {"coordinates": [lon, lat]}, "properties": {...}}
-    geometry = record.get("geometry") or {}
     properties = record.get("properties") or record
 
+    wind_speed_val = _to_float(properties.get("windSpeed") or properties.get("wind_speed"))
+    wave_height_val = _to_float(properties.get("waveHeight") or properties.get("wave_height"))
+    hazard = properties.get("hazard") or properties.get("phenomenon") or ""
+
+    # Simple storm/high‑risk detection heuristics, falling back to
+    # thresholds if there is no explicit storm code.
+    is_storm = (
+        _HAZARD_RE.search(hazard) is not None
+        or (wind_speed_val is not None and wind_speed_val >= 25)
+        or (wave_height_val is not None and wave_height_val >= 4)
+    )
+    if storms_only and not is_storm:
+        return None
+
+    geometry = record.get("geometry") or {}
     coords = geometry.get("coordinates") or []
     lon = coords[0] if len(coords) >= 1 else properties.get("lon") or properties.get("longitude")
     lat = coords[1] if len(coords) >= 2 else properties.get("lat") or properties.get("latitude")
 
-    wind_speed = properties.get("windSpeed") or properties.get("wind_speed")
-    wave_height = properties.get("waveHeight") or properties.get("wave_height")
-    hazard = (properties.get("hazard") or properties.get("phenomenon") or "").upper()
     description = (
         properties.get("description")
         or properties.get("summary")
@@ -123,26 +237,6 @@ def _extract_weather_point(record: Dict[str, Any]) -> Dict[str, Any]:
         or "Weather alert"
     )
 
-    # Simple storm/high‑risk detection heuristics.
-    is_storm = "STORM" in hazard or "CYCLONE" in hazard or "HURRICANE" in hazard
-
-    try:
-        wind_speed_val = float(wind_speed) if wind_speed is not None else None
-    except (TypeError, ValueError):
-        wind_speed_val = None
-
-    try:
-        wave_height_val = float(wave_height) if wave_height is not None else None
-    except (TypeError, ValueError):
-        wave_height_val = None
-
-    # Threshold-based risk detection if no explicit storm code.
-    if not is_storm:
-        if (wind_speed_val is not None and wind_speed_val >= 25) or (
-            wave_height_val is not None and wave_height_val >= 4
-        ):
-            is_storm = True
-
     return {
         "lat": float(lat) if lat is not None else None,
         "lon": float(lon) if lon is not None else None,
@@ -157,120 +251,173 @@ def detect_high_risk_zones(records: Iterable[Dict[str, Any]]) -> List[Dict[str,
     """
     From a collection of NOAA records, return only those representing
     storms or high‑risk conditions.
+
+    Calm records are discarded as soon as their hazard and wind/wave
+    readings are checked, which is most of a large forecast grid.
     """
-    high_risk: List[Dict[str, Any]] = []
+    return [
+        point
+        for point in map(partial(_extract_weather_point, storms_only=True), records)
+        if point is not None
+    ]
 
-    for raw in records:
-        point = _extract_weather_point(raw)
-        if point["storm"]:
-            high_risk.append(point)
 
-    return high_risk
+def _distance_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Great-circle distance in km between two points."""
+    lat1, lon1, lat2, lon2 = map(math.radians, (lat1, lon1, lat2, lon2))
+    a = (
+        math.sin((lat2 - lat1) / 2) ** 2
+        + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
 
 
-def _find_nearby_vessels(lat: float, lon: float, max_delta: float = 2.0) -> Iterable[Vessel]:
+def _find_vessels_near_zones(
+    points: List[Dict[str, Any]], max_delta: float = 2.0
+) -> Dict[int, List[Vessel]]:
     """
-    Very simple bounding‑box based proximity search for vessels.
-    This is not geospatially exact but good enough for a first pass.
+    Vessels within ``max_delta`` degrees (as great-circle distance) of each
+    risk zone, keyed by the zone's index in ``points``.
+
+    The bounding boxes of a batch of zones are OR'd into a single query that
+    vessel_pos_idx can serve; each returned vessel is then matched to the
+    zones whose radius it actually falls within. Zones without coordinates
+    have no vessels.
     """
-    if lat is None or lon is None:
-        return Vessel.objects.none()
-
-    return Vessel.objects.filter(
-        last_position_lat__isnull=False,
-        last_position_lon__isnull=False,
-        last_position_lat__gte=lat - max_delta,
-        last_position_lat__lte=lat + max_delta,
-        last_position_lon__gte=lon - max_delta,
-        last_position_lon__lte=lon + max_delta,
-    )
+    radius_km = max_delta * KM_PER_DEGREE
+    zones = [
+        (index, point["lat"], point["lon"])
+        for index, point in enumerate(points)
+        if point["lat"] is not None and point["lon"] is not None
+    ]
+
+    nearby: Dict[int, List[Vessel]] = defaultdict(list)
+    for start in range(0, len(zones), ZONE_QUERY_BATCH_SIZE):
+        batch = zones[start:start + ZONE_QUERY_BATCH_SIZE]
+
+        boxes = Q()
+        for _, lat, lon in batch:
+            # A degree of longitude shrinks with latitude, so widen the
+            # longitude range to still cover the circle
+            lon_delta = max_delta / max(math.cos(math.radians(lat)), 0.01)
+            boxes |= Q(
+                last_position_lat__gte=lat - max_delta,
+                last_position_lat__lte=lat + max_delta,
+                last_position_lon__gte=lon - lon_delta,
+                last_position_lon__lte=lon + lon_delta,
+            )
+
+        vessels = (
+            Vessel.objects.filter(
+                boxes,
+                last_position_lat__isnull=False,
+                last_position_lon__isnull=False,
+            )
+            .only("id", "name", "last_position_lat", "last_position_lon")
+            .order_by("id")
+        )
+        for vessel in vessels:
+            vessel_lat = vessel.last_position_lat
+            vessel_lon = vessel.last_position_lon
+            for index, lat, lon in batch:
+                if (
+                    abs(vessel_lat - lat) <= max_delta
+                    and _distance_km(lat, lon, vessel_lat, vessel_lon) <= radius_km
+                ):
+                    nearby[index].append(vessel)
+
+    return nearby
 
 
 # ---------------------------------------------------------------------------
 # Event + Notification creation
 # ---------------------------------------------------------------------------
 
-def _create_weather_event_for_vessel(vessel: Vessel, description: str, lat: float, lon: float) -> Event:
+def _build_weather_event(vessel: Vessel, description: str, lat: float, lon: float) -> Event:
     """
-    Create a WEATHER_ALERT event tied to a specific vessel.
+    Build an unsaved WEATHER_ALERT event tied to a specific vessel.
     """
     location_str = f"Lat {lat:.3f}, Lon {lon:.3f}" if lat is not None and lon is not None else "Unknown"
-    event = Event.objects.create(
+    return Event(
         vessel=vessel,
         event_type="WEATHER_ALERT",
         location=location_str,
         details=description,
     )
-    return event
 
 
-def _notify_users_for_event(event: Event) -> None:
+def _build_notifications_for_events(events: List[Event], recipient_ids: Iterable[int]) -> List[Notification]:
     """
-    Create notifications for relevant users when a safety event is triggered.
+    Build unsaved notifications for relevant users for saved safety events.
 
     Current strategy:
-    - Notify all ADMIN and OPERATOR users.
+    - Notify all ADMIN and OPERATOR users (``recipient_ids``).
     You can refine this to role-based or subscription-based rules.
     """
-    users = User.objects.filter(role__in=["ADMIN", "OPERATOR"])
-    if not users.exists():
-        return
-
-    message = f"Safety alert for {event.vessel.name}: {event.details}"
-    notifications = [
-        Notification(
-            user=u,
-            vessel=event.vessel,
-            event=event,
-            message=message,
-            notification_type="EVENT_ALERT",
+    notifications: List[Notification] = []
+    for event in events:
+        message = f"Safety alert for {event.vessel.name}: {event.details}"
+        notifications.extend(
+            Notification(
+                user_id=user_id,
+                vessel_id=event.vessel_id,
+                event=event,
+                message=message,
+                notification_type="EVENT_ALERT",
+            )
+            for user_id in recipient_ids
         )
-        for u in users
-    ]
-    Notification.objects.bulk_create(notifications)
+    return notifications
 
 
-def trigger_safety_events_from_noaa(params: Dict[str, Any] | None = None) -> Dict[str, Any]:
+def trigger_safety_events_from_noaa(
+    params: Dict[str, Any] | None = None,
+    params_list: List[Dict[str, Any]] | None = None,
+    force_refresh: bool = False,
+) -> Dict[str, Any]:
     """
     High-level service:
-    - Fetch NOAA weather/safety data
+    - Fetch NOAA weather/safety data, for one query (``params``) or for
+      several subregions concurrently (``params_list``, defaulting to the
+      NOAA_REGION_PARAMS setting when neither is given); responses cached
+      within the last NOAA_CACHE_TTL seconds are reused unless
+      ``force_refresh`` is set
     - Detect storms / high‑risk zones
     - For each risk zone, link to nearby vessels
     - Create WEATHER_ALERT events and corresponding notifications
 
     Returns a summary dict with counts.
     """
-    raw_records = list(fetch_noaa_weather(params=params))
-    high_risk_points = detect_high_risk_zones(raw_records)
-
-    events_created = 0
-    notifications_created = 0
-    zones_without_vessels = 0
+    if params_list is None and params is None:
+        params_list = getattr(settings, "NOAA_REGION_PARAMS", None)
 
-    for point in high_risk_points:
-        lat = point["lat"]
-        lon = point["lon"]
-        description = point["description"]
+    if params_list:
+        raw_records = fetch_noaa_weather_regions(params_list, force_refresh=force_refresh)
+    else:
+        raw_records = list(fetch_noaa_weather(params=params, force_refresh=force_refresh))
+    high_risk_points = detect_high_risk_zones(raw_records)
 
-        nearby_vessels = list(_find_nearby_vessels(lat, lon))
-        if not nearby_vessels:
-            zones_without_vessels += 1
-            continue
+    vessels_by_zone = _find_vessels_near_zones(high_risk_points)
+    zones_without_vessels = len(high_risk_points) - len(vessels_by_zone)
 
-        for vessel in nearby_vessels:
-            event = _create_weather_event_for_vessel(vessel, description, lat, lon)
-            events_created += 1
+    events = [
+        _build_weather_event(vessel, point["description"], point["lat"], point["lon"])
+        for index, point in enumerate(high_risk_points)
+        for vessel in vessels_by_zone.get(index, ())
+    ]
 
-            # Notify users and count how many notifications were created.
-            before_count = Notification.objects.count()
-            _notify_users_for_event(event)
-            after_count = Notification.objects.count()
-            notifications_created += max(after_count - before_count, 0)
+    notifications_created = 0
+    if events:
+        # One multi-row insert for the events of every zone, then one for
+        # their notifications
+        EventTriggerService.insert_events(events)
+        notifications = _build_notifications_for_events(events, user_ids_for_roles(SAFETY_ALERT_ROLES))
+        notifications_created = len(NotificationService.insert_notifications(notifications))
 
     summary = {
         "fetched": len(raw_records),
         "high_risk_zones": len(high_risk_points),
-        "events_created": events_created,
+        "events_created": len(events),
         "notifications_created": notifications_created,
         "zones_without_vessels": zones_without_vessels,
     }
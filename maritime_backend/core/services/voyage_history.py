@@ -92,7 +92,6 @@ class VoyageHistoryService:
                     vessel.speed = speed
                 if heading is not None:
                     vessel.heading = heading
-                vessel.last_update = timestamp
                 vessel.save()
                 
                 # Log the action
@@ -0,0 +1,137 @@
+"""
+Signal handlers for the core app.
+
+Keeps database-side "last modified" triggers in place so that
+``Vessel.last_update``, ``Port.last_updated`` and ``Voyage.updated_at`` are
+stamped by the database on every UPDATE, including ``bulk_update`` and
+``QuerySet.update`` calls that never run model ``save()``, and drops cached
+lookups when the rows behind them change.
+"""
+
+import logging
+
+from django.db import connections, transaction
+from django.db.models.signals import post_delete, post_migrate, post_save
+
+logger = logging.getLogger(__name__)
+
+
+# (table, column) pairs refreshed with the current time on every UPDATE.
+TOUCH_TRIGGER_COLUMNS = (
+    ('core_vessel', 'last_update'),
+    ('core_port', 'last_updated'),
+    ('core_voyage', 'updated_at'),
+)
+
+
+def _touch_trigger_sql(vendor: str, table: str, column: str):
+    """Return the statements that (re)create the touch trigger for a column."""
+    trigger = f"{table}_touch_{column}"
+
+    if vendor == 'postgresql':
+        return [
+            f"""
+            CREATE OR REPLACE FUNCTION {trigger}() RETURNS trigger AS $$
+            BEGIN
+                NEW.{column} = NOW();
+                RETURN NEW;
+            END;
+            $$ LANGUAGE plpgsql
+            """,
+            f"DROP TRIGGER IF EXISTS {trigger} ON {table}",
+            f"""
+            CREATE TRIGGER {trigger} BEFORE UPDATE ON {table}
+            FOR EACH ROW EXECUTE FUNCTION {trigger}()
+            """,
+        ]
+
+    if vendor == 'sqlite':
+        # SQLite triggers cannot assign to NEW, so re-stamp the row after the
+        # update, but only when the statement left the column alone: the bulk
+        # update paths stamp it themselves and so skip the second write.
+        # Recursive triggers are off by default, so this does not loop.
+        return [
+            f"DROP TRIGGER IF EXISTS {trigger}",
+            f"""
+            CREATE TRIGGER {trigger} AFTER UPDATE ON {table}
+            FOR EACH ROW WHEN NEW.{column} IS OLD.{column} BEGIN
+                UPDATE {table} SET {column} = STRFTIME('%Y-%m-%d %H:%M:%f', 'now')
+                WHERE id = NEW.id;
+            END
+            """,
+        ]
+
+    return []
+
+
+def ensure_touch_triggers(sender, using='default', **kwargs):
+    """
+    Install the touch triggers after migrations run.
+
+    Runs on every ``migrate`` because SQLite drops triggers whenever a
+    migration rebuilds the underlying table.
+    """
+    connection = connections[using]
+    existing_tables = set(connection.introspection.table_names())
+
+    with connection.cursor() as cursor:
+        for table, column in TOUCH_TRIGGER_COLUMNS:
+            if table not in existing_tables:
+                continue
+            statements = _touch_trigger_sql(connection.vendor, table, column)
+            if not statements:
+                logger.warning(
+                    "No touch trigger available for %s; %s.%s will not be refreshed on update",
+                    connection.vendor, table, column,
+                )
+                continue
+            for statement in statements:
+                cursor.execute(statement)
+
+
+def clear_role_user_cache(sender, **kwargs):
+    """Forget the cached role -> user ids lookup used for event notifications."""
+    from core.services.notification_service import invalidate_role_user_ids
+
+    invalidate_role_user_ids()
+
+
+def clear_port_dashboard_cache(sender, instance=None, **kwargs):
+    """Drop the cached port dashboard once a port or congestion event change commits."""
+    if sender.__name__ == 'Event' and instance.event_type != 'HIGH_CONGESTION':
+        return
+
+    from core.services.port_analytics import invalidate_port_dashboard
+
+    transaction.on_commit(invalidate_port_dashboard)
+
+
+def connect_signals(app_config):
+    post_migrate.connect(
+        ensure_touch_triggers,
+        sender=app_config,
+        dispatch_uid='core.ensure_touch_triggers',
+    )
+    user_model = app_config.get_model('User')
+    post_save.connect(
+        clear_role_user_cache,
+        sender=user_model,
+        dispatch_uid='core.clear_role_user_cache.save',
+    )
+    post_delete.connect(
+        clear_role_user_cache,
+        sender=user_model,
+        dispatch_uid='core.clear_role_user_cache.delete',
+    )
+    for model_name in ('Port', 'Event'):
+        model = app_config.get_model(model_name)
+        post_save.connect(
+            clear_port_dashboard_cache,
+            sender=model,
+            dispatch_uid=f'core.clear_port_dashboard_cache.{model_name.lower()}.save',
+        )
+        post_delete.connect(
+            clear_port_dashboard_cache,
+            sender=model,
+            dispatch_uid=f'core.clear_port_dashboard_cache.{model_name.lower()}.delete',
+        )
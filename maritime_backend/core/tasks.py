@@ -0,0 +1,135 @@
+"""
+Task entry points for the periodic background jobs and deferred work.
+
+Each periodic task runs one BackgroundJobService job and treats an unsuccessful
+summary as a failure to retry with exponential backoff and jitter, so a
+transient NOAA/AIS outage does not turn every scheduled run into a
+synchronized burst of retries.
+
+When Celery is installed and CELERY_BROKER_URL is configured the tasks are
+registered as shared tasks and the retries happen in the queue (late acks,
+rejected on worker loss). Otherwise they are plain callables that retry
+in-process, which is what cron or a management command gets.
+"""
+
+import logging
+import random
+import time
+from typing import Any, Callable, Dict, List
+
+from django.conf import settings
+
+from core.models import Event
+from core.services.background_jobs import BackgroundJobService
+from core.services.notification_service import NotificationService
+
+try:
+    from celery import shared_task
+except ImportError:  # pragma: no cover - Celery is optional
+    shared_task = None
+
+logger = logging.getLogger(__name__)
+
+MAX_RETRIES = 5
+RETRY_BACKOFF_MAX = 600  # seconds
+
+
+class JobFailed(Exception):
+    """Raised when a background job reports an unsuccessful summary."""
+
+
+def _run_job(job_name: str, job: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+    summary = job()
+    if not summary.get('success', False):
+        raise JobFailed(f"{job_name} failed: {summary.get('error') or summary.get('errors')}")
+    return summary
+
+
+def _backoff_delay(attempt: int) -> float:
+    """Full-jitter exponential backoff: uniform in [0, min(cap, 2**attempt)]."""
+    return random.uniform(0, min(RETRY_BACKOFF_MAX, 2 ** attempt))
+
+
+def _celery_configured() -> bool:
+    """Whether tasks go through Celery: it is installed and a broker is configured."""
+    return shared_task is not None and bool(getattr(settings, 'CELERY_BROKER_URL', None))
+
+
+def _task(func):
+    """Register ``func`` as a retrying Celery task, or wrap it with in-process retries."""
+    if _celery_configured():
+        return shared_task(
+            autoretry_for=(JobFailed,),
+            retry_backoff=True,
+            retry_backoff_max=RETRY_BACKOFF_MAX,
+            retry_jitter=True,
+            max_retries=MAX_RETRIES,
+            acks_late=True,
+            reject_on_worker_lost=True,
+        )(func)
+
+    def run_with_retries(*args, **kwargs):
+        for attempt in range(MAX_RETRIES + 1):
+            try:
+                return func(*args, **kwargs)
+            except JobFailed as e:
+                if attempt == MAX_RETRIES:
+                    raise
+                delay = _backoff_delay(attempt + 1)
+                logger.warning(f"{e}; retrying in {delay:.1f}s (attempt {attempt + 1}/{MAX_RETRIES})")
+                time.sleep(delay)
+
+    run_with_retries.__name__ = func.__name__
+    run_with_retries.__doc__ = func.__doc__
+    return run_with_retries
+
+
+def dispatch_task(task, *args) -> None:
+    """
+    Queue ``task`` on Celery when a broker is configured, otherwise run it in-process.
+    
+    In-process failures propagate to the caller; register on_commit
+    dispatches with ``robust=True`` so they are logged instead.
+    """
+    if _celery_configured() and hasattr(task, 'delay'):
+        task.delay(*args)
+    else:
+        task(*args)
+
+
+@_task
+def update_port_congestion_task() -> Dict[str, Any]:
+    """Refresh port congestion data."""
+    return _run_job('update_port_congestion', BackgroundJobService.update_port_congestion)
+
+
+@_task
+def update_safety_events_task() -> Dict[str, Any]:
+    """Run safety event checks and NOAA weather alerts."""
+    return _run_job('update_safety_events', BackgroundJobService.update_safety_events)
+
+
+@_task
+def update_vessel_positions_task() -> Dict[str, Any]:
+    """Refresh vessel positions from AIS data."""
+    return _run_job('update_vessel_positions', BackgroundJobService.update_vessel_positions)
+
+
+@_task
+def refresh_ais_positions_task() -> Dict[str, Any]:
+    """Refresh the cached AIS position feed ahead of its expiry."""
+    return _run_job('refresh_ais_positions_cache', BackgroundJobService.refresh_ais_positions_cache)
+
+
+@_task
+def notify_events_task(event_ids: List[int]) -> Dict[str, Any]:
+    """Create and push notifications for events committed by an earlier transaction."""
+    def notify():
+        events = list(Event.objects.filter(pk__in=event_ids))
+        return {
+            'success': True,
+            'events': len(events),
+            'notifications_created': NotificationService.notify_users_for_events(events),
+        }
+    
+    return _run_job('notify_events', notify)
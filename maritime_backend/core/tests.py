@@ -1,3 +1,127 @@
-from django.test import TestCase
+from django.core.exceptions import ValidationError
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TestCase, TransactionTestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from core.models import User, Vessel, VesselSubscription
+
+
+class SmallIntegerChoiceFieldTests(TestCase):
+    """Choice codes are stored as small integers and read back as codes."""
+
+    def setUp(self):
+        self.field = User._meta.get_field('role')
+
+    def test_round_trip(self):
+        user = User.objects.create_user(username='admin', password='x', role='ADMIN')
+
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT role FROM core_user WHERE id = %s', [user.pk])
+            self.assertEqual(cursor.fetchone()[0], User.Role.ADMIN.value)
+
+        self.assertEqual(User.objects.get(pk=user.pk).role, 'ADMIN')
+        self.assertTrue(User.objects.filter(role='ADMIN', pk=user.pk).exists())
+
+    def test_to_python(self):
+        self.assertEqual(self.field.to_python(User.Role.ANALYST.value), 'ANALYST')
+        self.assertEqual(self.field.to_python('ANALYST'), 'ANALYST')
+        self.assertIsNone(self.field.to_python(None))
+
+    def test_unknown_code_is_rejected(self):
+        with self.assertRaises(ValueError):
+            self.field.get_prep_value('BOGUS')
+        with self.assertRaises(ValidationError):
+            self.field.to_python(99)
+
+    def test_deconstruct_uses_literal_codes(self):
+        name, path, args, kwargs = self.field.deconstruct()
+        self.assertNotIn('enum', kwargs)
+        self.assertEqual(kwargs['codes'], {'ADMIN': 1, 'OPERATOR': 2, 'ANALYST': 3})
+
+
+class ChoiceColumnMigrationTests(TransactionTestCase):
+    """Migration 0011 encodes the old string columns and decodes them back."""
+
+    migrate_from = [('core', '0010_db_side_timestamps')]
+    migrate_to = [('core', '0011_small_integer_choice_columns')]
+
+    def setUp(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate(self.migrate_from)
+        old_apps = executor.loader.project_state(self.migrate_from).apps
+
+        OldUser = old_apps.get_model('core', 'User')
+        OldVessel = old_apps.get_model('core', 'Vessel')
+        OldSubscription = old_apps.get_model('core', 'VesselSubscription')
+
+        self.admin = OldUser.objects.create(username='admin', password='x', role='ADMIN')
+        self.legacy = OldUser.objects.create(username='legacy', password='x', role='SUPERUSER')
+        vessel = OldVessel.objects.create(
+            imo_number='IMO1234567', name='Test', vessel_type='Cargo',
+            flag='PA', cargo_type='General', operator='Test',
+        )
+        self.subscription = OldSubscription.objects.create(
+            user=self.admin, vessel=vessel, subscription_type='BOGUS',
+        )
+
+    def tearDown(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate(executor.loader.graph.leaf_nodes())
+
+    def _raw_value(self, table, column, pk):
+        with connection.cursor() as cursor:
+            cursor.execute(f'SELECT {column} FROM {table} WHERE id = %s', [pk])
+            return cursor.fetchone()[0]
+
+    def test_encode_maps_known_and_unknown_codes(self):
+        MigrationExecutor(connection).migrate(self.migrate_to)
+
+        self.assertEqual(int(self._raw_value('core_user', 'role', self.admin.pk)), User.Role.ADMIN.value)
+        self.assertEqual(int(self._raw_value('core_user', 'role', self.legacy.pk)), User.Role.OPERATOR.value)
+        self.assertEqual(
+            int(self._raw_value('core_vesselsubscription', 'subscription_type', self.subscription.pk)),
+            VesselSubscription.SubscriptionType.ALL_EVENTS.value,
+        )
+
+    def test_decode_restores_codes(self):
+        MigrationExecutor(connection).migrate(self.migrate_to)
+        MigrationExecutor(connection).migrate(self.migrate_from)
+
+        self.assertEqual(self._raw_value('core_user', 'role', self.admin.pk), 'ADMIN')
+        self.assertEqual(self._raw_value('core_user', 'role', self.legacy.pk), 'OPERATOR')
+        self.assertEqual(
+            self._raw_value('core_vesselsubscription', 'subscription_type', self.subscription.pk),
+            'ALL_EVENTS',
+        )
+
+
+class SubscribeVesselApiTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='operator', password='x')
+        self.vessel = Vessel.objects.create(
+            imo_number='IMO7654321', name='Test', vessel_type='Cargo',
+            flag='PA', cargo_type='General', operator='Test',
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_unknown_subscription_type_is_rejected(self):
+        response = self.client.post(
+            reverse('subscribe_vessel'),
+            {'vessel_id': self.vessel.pk, 'subscription_type': 'BOGUS'},
+            format='json',
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(VesselSubscription.objects.exists())
+
+    def test_subscription_type_is_stored(self):
+        response = self.client.post(
+            reverse('subscribe_vessel'),
+            {'vessel_id': self.vessel.pk, 'subscription_type': 'SAFETY_ONLY'},
+            format='json',
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(VesselSubscription.objects.get().subscription_type, 'SAFETY_ONLY')
@@ -1,5 +1,7 @@
 from django.http import HttpResponse
 from django.utils import timezone
+from django.db import transaction
+from django.db.models import Prefetch
 
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
@@ -210,12 +212,23 @@ class VesselSubscriptionListView(generics.ListAPIView):
     """
     serializer_class = VesselSubscriptionListSerializer
     permission_classes = [IsAuthenticated]
+    # Above this many subscriptions, one narrow batched vessel lookup is
+    # cheaper than widening every joined row with all vessel columns.
+    prefetch_vessels_threshold = 5000
     
     def get_queryset(self):
-        return VesselSubscription.objects.filter(
+        queryset = VesselSubscription.objects.filter(
             user=self.request.user,
             is_active=True
-        ).select_related('vessel').order_by('-created_at')
+        ).order_by('-created_at')
+        
+        if queryset.count() > self.prefetch_vessels_threshold:
+            return queryset.prefetch_related(Prefetch(
+                'vessel',
+                queryset=Vessel.objects.only('id', 'name', 'imo_number', 'vessel_type', 'flag')
+            ))
+        
+        return queryset.select_related('vessel')
 
 
 class VesselSubscriptionDetailView(generics.RetrieveUpdateDestroyAPIView):
@@ -260,7 +273,8 @@ def subscribe_vessel_api(request):
         "vessel_id": 123,
         "notify_storm_zones": true,
         "notify_piracy_zones": true,
-        "notify_congestion": true
+        "notify_congestion": true,
+        "subscription_type": "ALL_EVENTS"
     }
     """
     try:
@@ -279,6 +293,14 @@ def subscribe_vessel_api(request):
                 status=status.HTTP_404_NOT_FOUND
             )
         
+        subscription_type = request.data.get('subscription_type', 'ALL_EVENTS')
+        valid_subscription_types = [code for code, _ in VesselSubscription.SUBSCRIPTION_TYPE_CHOICES]
+        if subscription_type not in valid_subscription_types:
+            return Response(
+                {'error': f"Invalid subscription_type. Must be one of: {', '.join(valid_subscription_types)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
         # Create or update subscription
         subscription, created = VesselSubscription.objects.update_or_create(
             user=request.user,
@@ -288,7 +310,7 @@ def subscribe_vessel_api(request):
                 'notify_piracy_zones': request.data.get('notify_piracy_zones', True),
                 'notify_congestion': request.data.get('notify_congestion', True),
                 'notify_position_updates': request.data.get('notify_position_updates', False),
-                'subscription_type': request.data.get('subscription_type', 'ALL_EVENTS'),
+                'subscription_type': subscription_type,
                 'is_active': True,
             }
         )
@@ -916,20 +938,21 @@ def record_vessel_position_api(request):
         if accuracy is not None:
             accuracy = float(accuracy)
         
-        # Record position
+        # Record position, voyage association and audit log in one transaction
         service = VoyageHistoryService()
-        position = service.record_position(
-            vessel=vessel,
-            latitude=latitude,
-            longitude=longitude,
-            timestamp=timestamp,
-            speed=speed,
-            heading=heading,
-            source=source,
-            accuracy=accuracy,
-            user=request.user,
-            ip_address=request.META.get('REMOTE_ADDR')
-        )
+        with transaction.atomic():
+            position = service.record_position(
+                vessel=vessel,
+                latitude=latitude,
+                longitude=longitude,
+                timestamp=timestamp,
+                speed=speed,
+                heading=heading,
+                source=source,
+                accuracy=accuracy,
+                user=request.user,
+                ip_address=request.META.get('REMOTE_ADDR')
+            )
         
         return Response({
             'message': 'Position recorded successfully',